@@ -14,8 +14,15 @@ import time
 import logging
 import traceback
 import uuid
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import threading
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 from enum import Enum
 
 # -------- env loading --------
@@ -25,13 +32,28 @@ load_dotenv(dotenv_path=os.getenv("ENV_FILE", ".env"))
 # -------- reddit / http --------
 import praw
 import prawcore
+from praw.models import Comment, Submission
 
 # -------- LLM --------
 from groq import Groq
 from openai import OpenAI  # For x.ai Grok API (OpenAI-compatible)
 
 # -------- discord optional --------
-import urllib.request
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# -------- fast JSON optional --------
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# -------- multi-phrase matching optional --------
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 
 # -------------------------------
@@ -49,32 +71,183 @@ class Verdict(Enum):
 # -------------------------------
 
 TRACKING_FILE = "reported_comments.json"
+TRACKING_LOG = "reported_comments.jsonl"  # Append-only adds/updates, folded into TRACKING_FILE on compaction
 BENIGN_TRACKING_FILE = "benign_analyzed.json"
+BENIGN_TRACKING_LOG = "benign_analyzed.jsonl"  # Append-only, folded into BENIGN_TRACKING_FILE on compaction
+BENIGN_COMPACT_EVERY = 100  # Appends between compactions of the benign log
 BENIGN_TRACKING_MAX_AGE_HOURS = 48  # Auto-cleanup entries older than this
 PIPELINE_STATS_FILE = "pipeline_stats.json"
 PENDING_REVIEWS_FILE = "pending_reviews.json"  # Track Discord messages awaiting mod review
+OPENAI_MOD_CACHE_FILE = "openai_moderation_cache.json"  # Cached OpenAI Moderation scores
+PERSPECTIVE_CACHE_FILE = "perspective_cache.json"  # Cached Perspective API scores
+SEEN_IDS_FILE = "seen_comment_ids.json"  # Recently processed comment IDs (dedupe across stream restarts)
+SEEN_IDS_LOG = "seen_comment_ids.jsonl"  # Append-only, folded into SEEN_IDS_FILE on compaction
+SEEN_IDS_MAX = 100000  # ~several days of comments on a busy subreddit
+SEEN_IDS_COMPACT_EVERY = 5000  # Appends between compactions of the seen-IDs log
+
+_iso_now_cache = (0, "")
+
+
+def _iso_now() -> str:
+    """Current UTC time as ISO-8601 (second precision), formatted at most once per second"""
+    global _iso_now_cache
+    now = int(time.time())
+    cached_second, cached_str = _iso_now_cache
+    if now != cached_second:
+        cached_str = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _iso_now_cache = (now, cached_str)
+    return cached_str
+
+
+def _iso_to_epoch(timestamp: str) -> float:
+    """Parse a "%Y-%m-%dT%H:%M:%SZ" UTC timestamp to epoch seconds (raises ValueError if malformed)"""
+    # fromisoformat is C-implemented and much faster than strptime; it only accepts "Z" from 3.11
+    if timestamp.endswith("Z"):
+        timestamp = timestamp[:-1]
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _reported_epoch(entry: Dict) -> Optional[float]:
+    """
+    Epoch seconds when a tracked comment was reported. Uses the stored
+    reported_at_epoch; only older entries without it have reported_at parsed.
+    """
+    epoch = entry.get("reported_at_epoch")
+    if epoch is not None:
+        return epoch
+    reported_at = entry.get("reported_at", "")
+    return _iso_to_epoch(reported_at) if reported_at else None
+
+
+def _checked_epoch(entry: Dict) -> Optional[float]:
+    """
+    Epoch seconds when a tracked comment's outcome was recorded. Uses the stored
+    checked_at_epoch; only older entries without it have checked_at parsed.
+    """
+    epoch = entry.get("checked_at_epoch")
+    if epoch is not None:
+        return epoch
+    checked_at = entry.get("checked_at", "")
+    return _iso_to_epoch(checked_at) if checked_at else None
+
+
+def json_bytes(payload: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when installed, else stdlib json)"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload).encode("utf-8")
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes/str (orjson when installed, else stdlib json)"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def write_json_file(path: str, payload: Any, indent: bool = True) -> None:
+    """
+    Write JSON to a temp file and swap it in, so a crash can't truncate path.
+    indent=False writes compact JSON (machine-only caches).
+    """
+    if not indent:
+        data = json_bytes(payload)
+    elif orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(payload, indent=2).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def append_jsonl(path: str, records: List[Dict], sync: bool = False) -> None:
+    """Append records as JSON lines in one write (fsync'd if sync)"""
+    data = b"".join(json_bytes(r) + b"\n" for r in records)
+    with open(path, "a+b") as f:
+        # Start on a fresh line if a crash left the last record half-written
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# Guards TRACKING_FILE/TRACKING_LOG between the stream and background threads
+_tracking_lock = threading.RLock()
+_tracked_ids: Optional[set] = None  # comment_ids in the store, loaded on first use
+
+# Fields the outcome checks change on a tracked entry
+_OUTCOME_FIELDS = ("outcome", "removed_by", "checked_at", "checked_at_epoch")
+
 
 def load_tracked_comments() -> List[Dict]:
-    """Load tracked comments from JSON file"""
+    """Load tracked comments from JSON file, replaying any appended log records"""
     try:
-        with open(TRACKING_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(TRACKING_FILE, "rb") as f:
+            comments = json_loads(f.read())
     except FileNotFoundError:
-        return []
+        comments = []
     except json.JSONDecodeError:
         logging.warning(f"Could not parse {TRACKING_FILE}, starting fresh")
-        return []
+        comments = []
+    
+    # Each log line is either a new entry or a partial update for an existing comment_id
+    try:
+        with open(TRACKING_LOG, "rb") as f:
+            by_id = {c.get("comment_id"): c for c in comments}
+            for line in f:
+                try:
+                    record = json_loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from a crash mid-write
+                entry = by_id.get(record.get("comment_id"))
+                if entry is not None:
+                    entry.update(record)
+                else:
+                    comments.append(record)
+                    by_id[record.get("comment_id")] = record
+    except FileNotFoundError:
+        pass
+    return comments
 
 def save_tracked_comments(comments: List[Dict]) -> None:
-    """Save tracked comments to JSON file"""
-    with open(TRACKING_FILE, "w", encoding="utf-8") as f:
-        json.dump(comments, f, indent=2)
+    """
+    Rewrite the tracking file with the full list and drop the append log
+    (compaction).
+    """
+    global _tracked_ids
+    with _tracking_lock:
+        write_json_file(TRACKING_FILE, comments)
+        try:
+            os.remove(TRACKING_LOG)
+        except FileNotFoundError:
+            pass
+        _tracked_ids = {c.get("comment_id") for c in comments}
+
+def _append_tracking_log(records: List[Dict]) -> None:
+    """Append records to the tracking log with a single fsync (caller holds _tracking_lock)"""
+    append_jsonl(TRACKING_LOG, records, sync=True)
+
+def update_tracked_comments(updates: Dict[str, Dict]) -> None:
+    """
+    Record field updates (keyed by comment_id) for tracked comments.
+    Appends them to the log instead of rewriting the whole file, so a sweep
+    checkpoint costs O(batch) and never clobbers reports the stream thread
+    added meanwhile.
+    """
+    if not updates:
+        return
+    with _tracking_lock:
+        _append_tracking_log([{**changes, "comment_id": cid} for cid, changes in updates.items()])
 
 def load_pipeline_stats() -> Dict:
     """Load persisted pipeline stats from JSON file"""
     try:
-        with open(PIPELINE_STATS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(PIPELINE_STATS_FILE, "rb") as f:
+            return json_loads(f.read())
     except FileNotFoundError:
         return {}
     except json.JSONDecodeError:
@@ -83,24 +256,63 @@ def load_pipeline_stats() -> Dict:
 
 def save_pipeline_stats(stats: Dict) -> None:
     """Save pipeline stats to JSON file"""
-    with open(PIPELINE_STATS_FILE, "w", encoding="utf-8") as f:
-        json.dump(stats, f, indent=2)
+    write_json_file(PIPELINE_STATS_FILE, stats)
+
+_benign_lock = threading.Lock()
+_benign_entries: "Optional[OrderedDict[str, Dict]]" = None  # comment_id -> entry, oldest first; loaded on first use
+_benign_appends = 0  # Log appends since the last compaction
+
 
 def load_benign_analyzed() -> List[Dict]:
-    """Load benign analyzed comments from JSON file"""
+    """Load benign analyzed comments from the JSON file plus any appended log lines"""
     try:
-        with open(BENIGN_TRACKING_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(BENIGN_TRACKING_FILE, "rb") as f:
+            comments = json_loads(f.read())
     except FileNotFoundError:
-        return []
+        comments = []
     except json.JSONDecodeError:
         logging.warning(f"Could not parse {BENIGN_TRACKING_FILE}, starting fresh")
-        return []
+        comments = []
+    try:
+        with open(BENIGN_TRACKING_LOG, "rb") as f:
+            for line in f:
+                try:
+                    comments.append(json_loads(line))
+                except json.JSONDecodeError:
+                    continue  # Torn last line from a crash mid-write
+    except FileNotFoundError:
+        pass
+    return comments
 
 def save_benign_analyzed(comments: List[Dict]) -> None:
-    """Save benign analyzed comments to JSON file"""
-    with open(BENIGN_TRACKING_FILE, "w", encoding="utf-8") as f:
-        json.dump(comments, f, indent=2)
+    """Save benign analyzed comments to JSON file and clear the append log"""
+    write_json_file(BENIGN_TRACKING_FILE, comments)
+    try:
+        os.remove(BENIGN_TRACKING_LOG)
+    except FileNotFoundError:
+        pass
+
+def _prune_benign(entries: "OrderedDict[str, Dict]", now: float) -> None:
+    """
+    Drop entries older than BENIGN_TRACKING_MAX_AGE_HOURS. Entries are in
+    insertion (= time) order, so this only touches the ones that expire.
+    """
+    cutoff = now - (BENIGN_TRACKING_MAX_AGE_HOURS * 3600)
+    while entries:
+        oldest = next(iter(entries.values()))
+        if oldest.get("timestamp", 0) > cutoff:
+            break
+        entries.popitem(last=False)
+
+def compact_benign_analyzed() -> None:
+    """Rewrite the benign tracking file from memory (prunes old entries, drops the log)"""
+    global _benign_appends
+    with _benign_lock:
+        if _benign_entries is None:
+            return
+        _prune_benign(_benign_entries, time.time())
+        save_benign_analyzed(list(_benign_entries.values()))
+        _benign_appends = 0
 
 def track_benign_analyzed(comment_id: str, permalink: str, text: str,
                           llm_reason: str, detoxify_score: float,
@@ -111,19 +323,22 @@ def track_benign_analyzed(comment_id: str, permalink: str, text: str,
                           context_info: Dict[str, str] = None) -> None:
     """
     Track comments that were sent to LLM but came back BENIGN.
-    Auto-cleans entries older than BENIGN_TRACKING_MAX_AGE_HOURS.
+    Entries are appended to BENIGN_TRACKING_LOG; every BENIGN_COMPACT_EVERY
+    appends the file is rewritten without entries older than
+    BENIGN_TRACKING_MAX_AGE_HOURS.
     """
-    comments = load_benign_analyzed()
+    global _benign_entries, _benign_appends
     now = time.time()
-    cutoff = now - (BENIGN_TRACKING_MAX_AGE_HOURS * 3600)
     
-    # Clean old entries
-    comments = [c for c in comments if c.get("timestamp", 0) > cutoff]
-    
-    # Don't add duplicates
-    if any(c.get("comment_id") == comment_id for c in comments):
-        save_benign_analyzed(comments)  # Still save to persist cleanup
-        return
+    with _benign_lock:
+        if _benign_entries is None:
+            _benign_entries = OrderedDict()
+            for c in sorted(load_benign_analyzed(), key=lambda c: c.get("timestamp", 0)):
+                _benign_entries.setdefault(c.get("comment_id"), c)
+        
+        # Don't add duplicates
+        if comment_id in _benign_entries:
+            return
     
     # Extract OpenAI and Perspective scores from all_ml_scores
     openai_scores = {}
@@ -138,7 +353,7 @@ def track_benign_analyzed(comment_id: str, permalink: str, text: str,
     # Extract context info
     context_info = context_info or {}
     
-    comments.append({
+    entry = {
         "comment_id": comment_id,
         "permalink": permalink,
         "text": text[:500],
@@ -155,11 +370,17 @@ def track_benign_analyzed(comment_id: str, permalink: str, text: str,
         "is_parent_op": context_info.get("is_parent_op", False),
         "grandparent_context": context_info.get("grandparent_context", "")[:300],
         "grandparent_author": context_info.get("grandparent_author", ""),
-        "analyzed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "analyzed_at": _iso_now(),
         "timestamp": now
-    })
+    }
     
-    save_benign_analyzed(comments)
+    with _benign_lock:
+        _benign_entries[comment_id] = entry
+        append_jsonl(BENIGN_TRACKING_LOG, [entry])
+        _benign_appends += 1
+        compact = _benign_appends >= BENIGN_COMPACT_EVERY
+    if compact:
+        compact_benign_analyzed()
     logging.debug(f"Tracking benign analyzed comment: {comment_id}")
 
 def track_reported_comment(comment_id: str, permalink: str, text: str, 
@@ -169,12 +390,6 @@ def track_reported_comment(comment_id: str, permalink: str, text: str,
                            context_info: Dict[str, str] = None,
                            prefilter_trigger: str = "") -> None:
     """Add a newly reported comment to tracking"""
-    comments = load_tracked_comments()
-    
-    # Don't add duplicates
-    if any(c.get("comment_id") == comment_id for c in comments):
-        return
-    
     # Extract OpenAI and Perspective scores from all_ml_scores
     openai_scores = {}
     perspective_scores = {}
@@ -198,7 +413,7 @@ def track_reported_comment(comment_id: str, permalink: str, text: str,
     # Extract context info
     context_info = context_info or {}
     
-    comments.append({
+    entry = {
         "comment_id": comment_id,
         "permalink": permalink,
         "text": text[:500],  # Truncate long comments
@@ -215,12 +430,23 @@ def track_reported_comment(comment_id: str, permalink: str, text: str,
         "is_parent_op": context_info.get("is_parent_op", False),
         "grandparent_context": context_info.get("grandparent_context", "")[:300],
         "grandparent_author": context_info.get("grandparent_author", ""),
-        "reported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "reported_at": _iso_now(),
+        "reported_at_epoch": int(time.time()),
         "outcome": "pending",
         "checked_at": ""
-    })
+    }
     
-    save_tracked_comments(comments)
+    global _tracked_ids
+    with _tracking_lock:
+        if _tracked_ids is None:
+            _tracked_ids = {c.get("comment_id") for c in load_tracked_comments()}
+        
+        # Don't add duplicates
+        if comment_id in _tracked_ids:
+            return
+        
+        _append_tracking_log([entry])
+        _tracked_ids.add(comment_id)
     logging.debug(f"Tracking reported comment: {comment_id}")
 
 def check_reported_outcomes(reddit: praw.Reddit, min_age_hours: int = 24) -> Dict[str, int]:
@@ -236,107 +462,100 @@ def check_reported_outcomes(reddit: praw.Reddit, min_age_hours: int = 24) -> Dic
     comments = load_tracked_comments()
     now = time.time()
     stats = {"checked": 0, "removed": 0, "approved": 0, "still_pending": 0, "errors": 0}
+    checked_at = _iso_now()  # One timestamp for the whole sweep
+    checked_at_epoch = int(now)
     
+    # Collect pending entries that are old enough, keyed by fullname
+    to_check: Dict[str, List[Dict]] = {}
     for entry in comments:
         if entry.get("outcome") != "pending":
             continue
         
         # Check if comment is old enough
-        reported_at = entry.get("reported_at", "")
-        if reported_at:
-            try:
-                reported_time = time.mktime(time.strptime(reported_at, "%Y-%m-%dT%H:%M:%SZ"))
-                age_hours = (now - reported_time) / 3600
-                if age_hours < min_age_hours:
-                    stats["still_pending"] += 1
-                    continue
-            except ValueError:
-                pass
+        try:
+            reported_time = _reported_epoch(entry)
+            if reported_time is not None and (now - reported_time) / 3600 < min_age_hours:
+                stats["still_pending"] += 1
+                continue
+        except ValueError:
+            pass
         
-        # Check comment status via Reddit API
         comment_id = entry.get("comment_id", "")
         if not comment_id:
             continue
-            
-        try:
-            # Remove t1_ prefix if present for fetching
-            clean_id = comment_id.replace("t1_", "")
-            comment = reddit.comment(clean_id)
-            
-            # Force fetch the comment data
-            _ = comment.body
-            
-            # Check if removed
-            # removed_by_category values: moderator, automod_filtered, deleted, author, 
-            # anti_evil_ops, content_takedown, reddit
-            removed_by = getattr(comment, 'removed_by_category', None)
-            
-            if comment.body == "[removed]" or getattr(comment, 'removed', False):
-                entry["outcome"] = "removed"
-                entry["removed_by"] = removed_by or "unknown"
-                stats["removed"] += 1
-            elif removed_by:
-                entry["outcome"] = "removed"
-                entry["removed_by"] = removed_by
-                stats["removed"] += 1
-            else:
-                # Comment still exists - check for positive approval evidence
-                num_reports = getattr(comment, 'num_reports', None)
-                approved_by = getattr(comment, 'approved_by', None)
-                
-                if num_reports == 0 or approved_by is not None:
-                    # Mod explicitly approved or cleared reports
-                    entry["outcome"] = "approved"
-                    stats["approved"] += 1
-                else:
-                    # Still in modqueue, no action taken
-                    stats["still_pending"] += 1
-                    continue  # Don't update checked_at, keep as pending
-            
-            entry["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-            stats["checked"] += 1
-            
-        except prawcore.exceptions.NotFound:
-            # Comment was deleted (by user or mod)
-            entry["outcome"] = "removed"
-            entry["removed_by"] = "deleted_or_notfound"
-            entry["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-            stats["removed"] += 1
-            stats["checked"] += 1
-        except Exception as e:
-            logging.warning(f"Error checking comment {comment_id}: {e}")
-            stats["errors"] += 1
+        to_check.setdefault(_tracked_fullname(comment_id), []).append(entry)
     
-    save_tracked_comments(comments)
+    # Check comment status via Reddit API, up to 100 per request
+    for batch, fetched in fetch_info_batches(reddit, list(to_check)):
+        if fetched is None:
+            stats["errors"] += sum(len(to_check[f]) for f in batch)
+            continue
+        for fullname in batch:
+            outcome, removed_by = _reported_outcome(fetched.get(fullname))
+            for entry in to_check[fullname]:
+                if outcome is None:
+                    # Still in modqueue, no action taken - keep as pending
+                    stats["still_pending"] += 1
+                    continue
+                entry["outcome"] = outcome
+                if removed_by:
+                    entry["removed_by"] = removed_by
+                entry["checked_at"] = checked_at
+                entry["checked_at_epoch"] = checked_at_epoch
+                stats[outcome] += 1
+                stats["checked"] += 1
+    
+    update_tracked_comments({
+        c["comment_id"]: {k: c[k] for k in _OUTCOME_FIELDS if k in c}
+        for c in comments if c.get("checked_at") == checked_at
+    })
     return stats
 
+def _reported_outcome(comment) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Outcome of a reported comment from reddit.info() (None = not returned, i.e. deleted).
+    Returns ("removed", removed_by), ("approved", None), or (None, None) while still pending.
+    """
+    if comment is None:
+        return "removed", "deleted_or_notfound"
+    
+    # removed_by_category values: moderator, automod_filtered, deleted, author, 
+    # anti_evil_ops, content_takedown, reddit
+    removed_by = getattr(comment, 'removed_by_category', None)
+    if getattr(comment, 'body', '') == "[removed]" or getattr(comment, 'removed', False):
+        return "removed", removed_by or "unknown"
+    if removed_by:
+        return "removed", removed_by
+    
+    # Comment still exists - only count it as approved with positive evidence:
+    # num_reports == 0 (mod cleared the reports) or approved_by set (mod clicked approve)
+    if getattr(comment, 'num_reports', None) == 0 or getattr(comment, 'approved_by', None) is not None:
+        return "approved", None
+    return None, None
+
+def _checked_after(entry: Dict, cutoff: float) -> bool:
+    """True unless the entry's outcome is known to have been recorded at or before cutoff"""
+    epoch = entry.get("checked_at_epoch")
+    if epoch is None:
+        # Older entries only have the ISO string; unparseable ones are kept
+        try:
+            epoch = _checked_epoch(entry)
+        except ValueError:
+            return True
+    return epoch is None or epoch > cutoff
+
 def cleanup_old_tracked(max_age_days: int = 30) -> int:
     """Remove entries older than max_age_days that have been resolved"""
-    comments = load_tracked_comments()
-    now = time.time()
-    original_count = len(comments)
-    
-    filtered = []
-    for entry in comments:
+    with _tracking_lock:
+        comments = load_tracked_comments()
+        cutoff = time.time() - max_age_days * 86400
+        original_count = len(comments)
+        
         # Keep pending entries regardless of age
-        if entry.get("outcome") == "pending":
-            filtered.append(entry)
-            continue
+        filtered = [entry for entry in comments
+                    if entry.get("outcome") == "pending" or _checked_after(entry, cutoff)]
         
-        # Check age of resolved entries
-        checked_at = entry.get("checked_at", "")
-        if checked_at:
-            try:
-                checked_time = time.mktime(time.strptime(checked_at, "%Y-%m-%dT%H:%M:%SZ"))
-                age_days = (now - checked_time) / 86400
-                if age_days < max_age_days:
-                    filtered.append(entry)
-            except ValueError:
-                filtered.append(entry)
-        else:
-            filtered.append(entry)
-    
-    save_tracked_comments(filtered)
+        save_tracked_comments(filtered)
     removed = original_count - len(filtered)
     if removed > 0:
         logging.info(f"Cleaned up {removed} old tracking entries")
@@ -352,7 +571,7 @@ def get_accuracy_stats(hours: int = None, reddit: 'praw.Reddit' = None, save_upd
                If None, count all items (all-time stats).
         reddit: If provided, do live checks on pending items to get current status.
         save_updates: If True and reddit checks found updates, save them to disk.
-        rate_limit_delay: Seconds to wait between Reddit API calls (0 = no delay).
+        rate_limit_delay: Seconds to wait between Reddit API requests (0 = no delay).
     """
     all_comments = load_tracked_comments()
     
@@ -361,81 +580,56 @@ def get_accuracy_stats(hours: int = None, reddit: 'praw.Reddit' = None, save_upd
         cutoff = time.time() - (hours * 3600)
         comments = []
         for c in all_comments:
-            reported_at = c.get("reported_at", "")
-            if reported_at:
-                try:
-                    reported_time = time.mktime(time.strptime(reported_at, "%Y-%m-%dT%H:%M:%SZ"))
-                    if reported_time >= cutoff:
-                        comments.append(c)
-                except ValueError:
-                    pass  # Skip malformed timestamps
+            try:
+                reported_time = _reported_epoch(c)
+                if reported_time is not None and reported_time >= cutoff:
+                    comments.append(c)
+            except ValueError:
+                pass  # Skip malformed timestamps
     else:
         comments = all_comments
     
     # If reddit client provided, do live checks on pending items
     updates_made = False
     if reddit is not None:
-        import prawcore.exceptions
         pending_items = [c for c in comments if c.get("outcome") == "pending"]
+        checked_at = _iso_now()  # One timestamp for the whole sweep
+        checked_at_epoch = int(time.time())
         
         if pending_items and rate_limit_delay > 0:
-            logging.info(f"Checking {len(pending_items)} pending items with {rate_limit_delay}s delay between calls...")
+            logging.info(f"Checking {len(pending_items)} pending items with {rate_limit_delay}s delay between requests...")
         
-        for i, c in enumerate(pending_items):
+        by_fullname: Dict[str, List[Dict]] = {}
+        for c in pending_items:
             comment_id = c.get("comment_id", "")
-            if not comment_id:
-                continue
-            
-            # Rate limiting
-            if rate_limit_delay > 0 and i > 0:
-                time.sleep(rate_limit_delay)
-            
-            try:
-                clean_id = comment_id.replace("t1_", "")
-                comment = reddit.comment(clean_id)
-                _ = comment.body  # Force fetch
-                
-                old_outcome = c.get("outcome")
-                removed_by = getattr(comment, 'removed_by_category', None)
-                
-                if comment.body == "[removed]" or getattr(comment, 'removed', False):
-                    c["outcome"] = "removed"
-                    c["removed_by"] = removed_by or "unknown"
-                    c["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-                elif removed_by:
-                    c["outcome"] = "removed"
-                    c["removed_by"] = removed_by
-                    c["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-                else:
-                    # Comment still exists and wasn't removed
-                    # Only mark as approved if we have positive evidence:
-                    # - num_reports == 0 means mod explicitly cleared/approved
-                    # - approved_by is set means mod clicked approve
-                    num_reports = getattr(comment, 'num_reports', None)
-                    approved_by = getattr(comment, 'approved_by', None)
-                    
-                    if num_reports == 0 or approved_by is not None:
-                        c["outcome"] = "approved"
-                        c["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-                    # Otherwise keep as pending - still in modqueue
-                
-                if c.get("outcome") != old_outcome:
+            if comment_id:
+                by_fullname.setdefault(_tracked_fullname(comment_id), []).append(c)
+        
+        # Up to 100 comments per request; rate_limit_delay applies between requests
+        for batch, fetched in fetch_info_batches(reddit, list(by_fullname), delay=rate_limit_delay):
+            if fetched is None:
+                continue  # Keep as pending on error
+            for fullname in batch:
+                outcome, removed_by = _reported_outcome(fetched.get(fullname))
+                if outcome is None:
+                    continue  # Keep as pending - still in modqueue
+                for c in by_fullname[fullname]:
+                    c["outcome"] = outcome
+                    if removed_by:
+                        c["removed_by"] = removed_by
+                    c["checked_at"] = checked_at
+                    c["checked_at_epoch"] = checked_at_epoch
                     updates_made = True
-                    
-            except prawcore.exceptions.NotFound:
-                c["outcome"] = "removed"  # Comment deleted/removed
-                c["removed_by"] = "deleted_or_notfound"
-                c["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-                updates_made = True
-            except Exception:
-                pass  # Keep as pending on error
         
         if pending_items and rate_limit_delay > 0:
             logging.info(f"Finished checking {len(pending_items)} pending items")
     
     # Save updates back to disk if any were made
     if updates_made and save_updates:
-        save_tracked_comments(all_comments)
+        update_tracked_comments({
+            c["comment_id"]: {k: c[k] for k in _OUTCOME_FIELDS if k in c}
+            for c in pending_items if c.get("outcome") != "pending"
+        })
     
     total = len(comments)
     pending = sum(1 for c in comments if c.get("outcome") == "pending")
@@ -459,7 +653,8 @@ def get_accuracy_stats(hours: int = None, reddit: 'praw.Reddit' = None, save_upd
 # Config
 # -------------------------------
 
-@dataclass
+# Slotted on 3.10+: cfg.* is read on every comment, and there's only ever one instance
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class Config:
     # Reddit
     client_id: str
@@ -478,10 +673,13 @@ class Config:
     llm_fallback_chain: List[str]  # Fallback models in order of preference
     llm_daily_limit: int        # Switch to fallback after this many calls
     llm_requests_per_minute: int  # Max requests per minute to Groq
+    llm_burst: int              # Requests allowed back to back before the per-minute spacing applies
+    llm_batch_size: int         # Max queued escalations reviewed per LLM call (1 = no batching)
     
     # Detoxify pre-filter
     detoxify_model: str        # "original" or "unbiased"
     detoxify_can_escalate: bool  # Whether Detoxify can trigger LLM review on its own
+    detoxify_device: str       # "auto" (CUDA if available), "cpu", "cuda", "cuda:1", ...
     
     # OpenAI Moderation API (optional, free supplement to Detoxify)
     openai_moderation_key: str      # API key for OpenAI (also used for moderation)
@@ -497,6 +695,12 @@ class Config:
     perspective_rpm: int            # Rate limit (requests per minute)
     perspective_mode: str           # "all" (every comment), "confirm" (only if Detoxify triggers), "only" (no Detoxify)
     
+    # External API score cache (persisted across restarts)
+    score_cache_max_entries: int    # Max cached texts per API (0 = disable caching)
+    
+    # Must-escalate comments always go to the LLM; external APIs only add context for them
+    ml_context_on_escalate: bool    # Call OpenAI/Perspective for must-escalate comments too
+    
     # Detoxify thresholds per label
     threshold_threat: float
     threshold_severe_toxicity: float
@@ -537,6 +741,9 @@ class Config:
 
     # Runtime
     log_level: str
+    
+    # Derived in load_config: (model, min score) for each known AUTO_REMOVE_REQUIRE_MODELS entry
+    auto_remove_rules: List[Tuple[str, float]] = field(default_factory=list)
 
 
 def load_config() -> Config:
@@ -590,9 +797,12 @@ def load_config() -> Config:
         ).split(",") if s.strip()],
         llm_daily_limit=int(os.getenv("LLM_DAILY_LIMIT", "240")),
         llm_requests_per_minute=int(os.getenv("LLM_REQUESTS_PER_MINUTE", "2")),
+        llm_burst=max(1, int(os.getenv("LLM_BURST", "1"))),
+        llm_batch_size=max(1, int(os.getenv("LLM_BATCH_SIZE", "8"))),
         
         detoxify_model=os.getenv("DETOXIFY_MODEL", "original"),
         detoxify_can_escalate=os.getenv("DETOXIFY_CAN_ESCALATE", "true").lower() == "true",
+        detoxify_device=os.getenv("DETOXIFY_DEVICE", "auto").strip().lower(),
         
         # OpenAI Moderation API settings
         openai_moderation_key=os.getenv("OPENAI_API_KEY", ""),  # Reuse same key as for other OpenAI
@@ -608,6 +818,9 @@ def load_config() -> Config:
         perspective_rpm=int(os.getenv("PERSPECTIVE_RPM", "60")),  # Requests per minute
         perspective_mode=os.getenv("PERSPECTIVE_MODE", "confirm"),  # "all", "confirm", or "only"
         
+        score_cache_max_entries=int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "10000")),
+        ml_context_on_escalate=os.getenv("ML_CONTEXT_ON_ESCALATE", "true").lower() == "true",
+        
         # Per-label thresholds (lower = more sensitive)
         threshold_threat=float(os.getenv("THRESHOLD_THREAT", "0.15")),
         threshold_severe_toxicity=float(os.getenv("THRESHOLD_SEVERE_TOXICITY", "0.20")),
@@ -645,6 +858,14 @@ def load_config() -> Config:
         
         log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
     )
+    
+    auto_remove_mins = {
+        "detoxify": cfg.auto_remove_detoxify_min,
+        "openai": cfg.auto_remove_openai_min,
+        "perspective": cfg.auto_remove_perspective_min,
+    }
+    cfg.auto_remove_rules = [(m, auto_remove_mins[m]) for m in cfg.auto_remove_require_models
+                             if m in auto_remove_mins]
     return cfg
 
 
@@ -682,6 +903,7 @@ def praw_client(cfg: Config) -> praw.Reddit:
 # -------------------------------
 
 import re
+import functools
 
 # ============================================
 # LOAD PATTERNS FROM JSON
@@ -692,8 +914,8 @@ PATTERNS_FILE = "moderation_patterns.json"
 def load_moderation_patterns(path: str = PATTERNS_FILE) -> Dict:
     """Load moderation patterns from JSON file"""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return json_loads(f.read())
     except FileNotFoundError:
         logging.warning(f"Patterns file not found at {path}, using defaults")
         return {}
@@ -704,6 +926,40 @@ def load_moderation_patterns(path: str = PATTERNS_FILE) -> Dict:
 # Load patterns at module level
 PATTERNS = load_moderation_patterns()
 
+# Pattern matching below uses thousands of distinct regexes (one per phrase),
+# which overflows re's internal cache and forces constant recompilation.
+# The set is finite (JSON phrases + literals), so cache them all.
+
+@functools.lru_cache(maxsize=None)
+def _compile(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a regex once and reuse it"""
+    return re.compile(pattern, flags)
+
+@functools.lru_cache(maxsize=None)
+def _phrase_re(phrase: str) -> re.Pattern:
+    """Word-boundary regex for a literal phrase"""
+    return _compile(r'\b' + re.escape(phrase) + r'\b')
+
+# Phrase list behind each alternation regex, for the Aho-Corasick scan below.
+# Keyed by id() - hashing a compiled pattern hashes its whole program.
+_PHRASE_LISTS: Dict[int, Tuple[Tuple[str, ...], bool]] = {}
+
+def _compile_phrase_regex(phrases, word_boundary: bool = True) -> re.Pattern:
+    """
+    One alternation regex for a whole phrase list, so a comment is scanned
+    once instead of once per phrase. search() finds a match exactly when
+    _phrase_re(p).search() (or `p in text` without word_boundary) would for some p.
+    """
+    if not phrases:
+        return re.compile(r'(?!)')  # Never matches
+    alternation = "|".join(re.escape(p) for p in sorted(phrases, key=lambda p: (-len(p), p)))
+    if word_boundary:
+        pattern = re.compile(r'\b(?:' + alternation + r')\b')
+    else:
+        pattern = re.compile(alternation)
+    _PHRASE_LISTS.setdefault(id(pattern), (tuple(phrases), word_boundary))
+    return pattern
+
 # ============================================
 # 1. TEXT NORMALIZATION & DE-OBFUSCATION
 # ============================================
@@ -719,6 +975,9 @@ COMMON_EVASIONS = PATTERNS.get("obfuscation_map", {}).get("common_evasions", {
     "ph": "f", "ck": "k"
 })
 
+# Every contains_*/is_* check normalizes the same comment again (~12 calls per
+# comment), so remember the last few results
+@functools.lru_cache(maxsize=256)
 def normalize_text(text: str) -> str:
     """
     Normalize text for pattern matching.
@@ -736,21 +995,12 @@ def normalize_text(text: str) -> str:
     
     return result
 
-def squash_text(text: str) -> str:
-    """
-    Remove spaces and punctuation for catching spaced-out evasions.
-    "k y s" -> "kys", "s.h" -> "sh"
-    """
-    result = normalize_text(text)
-    result = re.sub(r'[^a-z0-9]', '', result)
-    return result
-
 
 # ============================================
 # 2. BUILD PATTERN LISTS FROM JSON
 # ============================================
 
-def build_slur_sets() -> Tuple[set, set]:
+def build_slur_sets() -> Tuple[frozenset, set]:
     """
     Build separate sets for single-word slurs and multi-word slur phrases.
     Returns (slur_words, slur_phrases)
@@ -768,7 +1018,7 @@ def build_slur_sets() -> Tuple[set, set]:
                     slur_phrases.add(w_lower)
                 else:
                     slur_words.add(w_lower)
-    return slur_words, slur_phrases
+    return frozenset(slur_words), slur_phrases
 
 def build_self_harm_set() -> set:
     """Build set of self-harm phrases from JSON"""
@@ -821,7 +1071,7 @@ def build_dismissive_hostile_sets() -> Tuple[set, set, set]:
         hard = set(p.lower() for p in phrases)
     return hard, soft, gatekeeping
 
-def build_insult_sets() -> Tuple[set, set]:
+def build_insult_sets() -> Tuple[frozenset, set]:
     """
     Build sets for direct insults from JSON.
     Returns (insult_words, insult_phrases)
@@ -855,7 +1105,7 @@ def build_insult_sets() -> Tuple[set, set]:
                 else:
                     insult_words.add(w_lower)
     
-    return insult_words, insult_phrases
+    return frozenset(insult_words), insult_phrases
 
 def build_benign_phrases_set() -> set:
     """Build set of benign skip phrases from JSON - PHRASES ONLY, not single words"""
@@ -876,7 +1126,7 @@ def build_violence_illegal_set() -> set:
     phrases = PATTERNS.get("violence_illegal_advocacy", {}).get("phrases", [])
     return set(p.lower() for p in phrases)
 
-def build_contextual_terms_sets() -> Tuple[set, set]:
+def build_contextual_terms_sets() -> Tuple[frozenset, set]:
     """
     Build sets of contextual sensitive terms from JSON.
     These are ambiguous terms that should only escalate with additional signals.
@@ -895,7 +1145,7 @@ def build_contextual_terms_sets() -> Tuple[set, set]:
                     context_phrases.add(w_lower)
                 else:
                     context_words.add(w_lower)
-    return context_words, context_phrases
+    return frozenset(context_words), context_phrases
 
 def build_accusations_set() -> set:
     """Build set of bad faith accusation phrases from JSON"""
@@ -919,6 +1169,26 @@ def build_harassment_sets() -> Tuple[set, set, set]:
     emoji = set(p for p in harassment.get("emoji_mockery", []))  # Don't lowercase emojis
     return mod_accusations, condescension, emoji
 
+def build_benign_skip_phrases() -> Tuple[str, ...]:
+    """
+    Flatten every benign_skip category (words and phrases) into one
+    lowercased, de-duplicated tuple for substring checks.
+    """
+    phrases = []
+    seen = set()
+    benign = PATTERNS.get("benign_skip", {})
+    for category, words in benign.items():
+        if category.startswith("_"):
+            continue
+        if not isinstance(words, list):
+            continue
+        for phrase in words:
+            phrase_lower = phrase.lower()
+            if phrase_lower not in seen:
+                seen.add(phrase_lower)
+                phrases.append(phrase_lower)
+    return tuple(phrases)
+
 def build_slur_exceptions_set() -> set:
     """Build set of phrases that contain slurs but are benign (e.g., 'go poof')"""
     exceptions = PATTERNS.get("benign_skip", {}).get("slur_exceptions", [])
@@ -929,7 +1199,7 @@ def build_vote_manipulation_set() -> set:
     phrases = PATTERNS.get("shill_accusations", {}).get("vote_manipulation", [])
     return set(p.lower() for p in phrases)
 
-def build_dehumanizing_set() -> Tuple[set, set]:
+def build_dehumanizing_set() -> Tuple[frozenset, set]:
     """
     Build sets for dehumanizing insults from JSON.
     Returns (dehumanizing_words, dehumanizing_phrases)
@@ -943,7 +1213,7 @@ def build_dehumanizing_set() -> Tuple[set, set]:
             phrases.add(item_lower)
         else:
             words.add(item_lower)
-    return words, phrases
+    return frozenset(words), phrases
 
 def build_veiled_threats_set() -> set:
     """Build set of veiled threat/omen phrases from JSON"""
@@ -968,6 +1238,7 @@ INSULT_WORDS, INSULT_PHRASES = build_insult_sets()
 VIOLENCE_ILLEGAL_PHRASES = build_violence_illegal_set()
 CONTEXTUAL_WORDS, CONTEXTUAL_PHRASES = build_contextual_terms_sets()
 BENIGN_PHRASES_SET = build_benign_phrases_set()
+BENIGN_SKIP_PHRASES = build_benign_skip_phrases()
 ACCUSATION_PHRASES = build_accusations_set()
 HARASSMENT_MOD_PHRASES, HARASSMENT_CONDESCENSION_PHRASES, HARASSMENT_EMOJI = build_harassment_sets()
 VOTE_MANIPULATION_PHRASES = build_vote_manipulation_set()
@@ -975,6 +1246,182 @@ DEHUMANIZING_WORDS, DEHUMANIZING_PHRASES = build_dehumanizing_set()
 VEILED_THREAT_PHRASES = build_veiled_threats_set()
 HOMOPHOBIC_PEJORATIVE_PHRASES = build_homophobic_pejorative_set()
 
+# Brigading phrases that only count when a user/post is being targeted
+# ("mass report" could be "report to MUFON")
+BRIGADING_NEEDS_CONTEXT = frozenset({'mass report', 'everyone report', 'brigade'})
+
+# One compiled alternation per phrase set (the sets stay for explicit lookups)
+SLUR_EXCEPTIONS_RE = _compile_phrase_regex(SLUR_EXCEPTIONS, word_boundary=False)
+SLUR_PHRASES_RE = _compile_phrase_regex(SLUR_PHRASES)
+SELF_HARM_RE = _compile_phrase_regex(SELF_HARM_PHRASES)
+THREAT_RE = _compile_phrase_regex(THREAT_PHRASES)
+SEXUAL_VIOLENCE_RE = _compile_phrase_regex(SEXUAL_VIOLENCE_PHRASES)
+BRIGADING_RE = _compile_phrase_regex(BRIGADING_PHRASES - BRIGADING_NEEDS_CONTEXT)
+BRIGADING_CONTEXT_RE = _compile_phrase_regex(BRIGADING_PHRASES & BRIGADING_NEEDS_CONTEXT)
+SHILL_RE = _compile_phrase_regex(SHILL_PHRASES)
+DISMISSIVE_HARD_RE = _compile_phrase_regex(DISMISSIVE_HARD_PHRASES)
+DISMISSIVE_GATEKEEPING_RE = _compile_phrase_regex(DISMISSIVE_GATEKEEPING_PHRASES)
+DISMISSIVE_SOFT_RE = _compile_phrase_regex(DISMISSIVE_SOFT_PHRASES)
+INSULT_PHRASES_RE = _compile_phrase_regex(INSULT_PHRASES)
+VIOLENCE_ILLEGAL_RE = _compile_phrase_regex(VIOLENCE_ILLEGAL_PHRASES)
+CONTEXTUAL_PHRASES_RE = _compile_phrase_regex(CONTEXTUAL_PHRASES)
+ACCUSATION_RE = _compile_phrase_regex(ACCUSATION_PHRASES)
+HARASSMENT_MOD_RE = _compile_phrase_regex(HARASSMENT_MOD_PHRASES)
+HARASSMENT_CONDESCENSION_RE = _compile_phrase_regex(HARASSMENT_CONDESCENSION_PHRASES)
+VOTE_MANIPULATION_RE = _compile_phrase_regex(VOTE_MANIPULATION_PHRASES)
+DEHUMANIZING_PHRASES_RE = _compile_phrase_regex(DEHUMANIZING_PHRASES)
+VEILED_THREAT_RE = _compile_phrase_regex(VEILED_THREAT_PHRASES)
+HOMOPHOBIC_PEJORATIVE_RE = _compile_phrase_regex(HOMOPHOBIC_PEJORATIVE_PHRASES)
+VIOLENCE_ILLEGAL_PREFIXES = tuple(VIOLENCE_ILLEGAL_PHRASES)
+
+# Fixed helper patterns used by the contains_* checks below, compiled once.
+# Lists of alternatives are joined into one regex since callers only ask
+# whether any of them matches.
+WEAK_DIRECTED_RE = re.compile(r'\b(this\s+)?(guy|dude|person)\b')
+
+# Spaced-out self-harm evasions ("k y s", "k.y.s", "kill your self", "go  die"),
+# on normalized (lowercase) text. Only "kys" is case-insensitive: the others
+# used to also require e.g. "killyourself" in the squashed a-z0-9 text, which
+# holds exactly when they match case-sensitively here.
+SELF_HARM_EVASIONS_RE = re.compile(
+    r'\b(?:(?i:k[\s\.\-\_\*]*y[\s\.\-\_\*]*s)'
+    r'|kill[\s\.\-\_\*]*your[\s\.\-\_\*]*self'
+    r'|go[\s\.\-\_\*]*die'
+    r'|drink[\s\.\-\_\*]*bleach)\b'
+)
+
+# Brigading calls only count when they point at a user/person
+BRIGADING_TARGET_RE = re.compile('|'.join([
+    r'\bu/', r'\bthis\s+(guy|dude|user|person|account)\b',
+    r'\bthat\s+(guy|dude|user|person|account)\b',
+    r'\btheir\s+(account|profile|post)\b', r'\bthis\s+post\b',
+    r'\bthe\s+mods?\b', r'\bop\b', r'\bhim\b', r'\bher\b', r'\bthem\b'
+]))
+
+# Negation - if present, violence talk is likely discussion, not advocacy
+VIOLENCE_NEGATION_RE = re.compile('|'.join([
+    r'\bdon\'?t\b', r'\bdo\s+not\b', r'\bnever\b', r'\bshouldn\'?t\b',
+    r'\bshould\s+not\b', r'\bwouldn\'?t\b', r'\bwould\s+not\b',
+    r'\bcan\'?t\b', r'\bcannot\b', r'\billegal\s+to\b', r'\bagainst\s+the\s+law\b'
+]))
+
+# Exhortative context - advocacy requires one of these
+VIOLENCE_EXHORTATIVE_RE = re.compile('|'.join([
+    r'\bshould\b', r'\blet\'?s\b', r'\bgonna\b', r'\bgoing\s+to\b',
+    r'\bneed\s+to\b', r'\bwant\s+to\b', r'\bwanna\b', r'\bgotta\b',
+    r'\bwe\s+could\b', r'\bsomeone\s+should\b', r'\bwould\s+be\s+funny\b',
+    r'\bi\'?m\s+gonna\b', r'\bi\'?ll\b', r'\bwe\'?ll\b', r'\bjust\b'
+]))
+
+def _build_phrase_automaton():
+    """
+    One Aho-Corasick automaton over every phrase list above (if pyahocorasick
+    is installed), so a comment is scanned once for all categories instead
+    of once per regex. Returns (automaton, {id(pattern): bit}), or (None, {})
+    without the package.
+    """
+    if ahocorasick is None:
+        return None, {}
+    bits: Dict[int, int] = {}
+    owners: Dict[str, List[Tuple[int, bool]]] = {}
+    for pattern_id, (phrases, word_boundary) in _PHRASE_LISTS.items():
+        if "" in phrases:
+            continue  # Empty phrase matches everywhere - leave that list to its regex
+        bit = bits[pattern_id] = 1 << len(bits)
+        for phrase in phrases:
+            owners.setdefault(phrase, []).append((bit, word_boundary))
+    automaton = ahocorasick.Automaton()
+    for phrase, phrase_owners in owners.items():
+        automaton.add_word(phrase, (len(phrase), phrase_owners))
+    automaton.make_automaton()
+    return automaton, bits
+
+_PHRASE_AUTOMATON, _PHRASE_BITS = _build_phrase_automaton()
+
+def _build_phrase_first_words() -> Dict[int, frozenset]:
+    """
+    First word of every phrase, per word-boundary phrase list. A \\b-bounded
+    phrase can only match if its first word is a whole word in the text, so
+    the regex fallback skips lists none of whose first words appear.
+    """
+    first_words: Dict[int, frozenset] = {}
+    for pattern_id, (phrases, word_boundary) in _PHRASE_LISTS.items():
+        if not word_boundary:
+            continue
+        words = [re.match(r'\W*(\w+)', phrase) for phrase in phrases]
+        if words and all(words):
+            first_words[pattern_id] = frozenset(m.group(1) for m in words)
+    return first_words
+
+_PHRASE_FIRST_WORDS = _build_phrase_first_words()
+
+def _build_substring_automaton(phrases):
+    """
+    Aho-Corasick automaton for an any(p in text) check over a large phrase
+    list (the benign lists run against text.lower(), not normalized text, so
+    they get their own). None without pyahocorasick or for an empty phrase.
+    """
+    if ahocorasick is None or not phrases or "" in phrases:
+        return None
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+def _contains_any(text: str, phrases, automaton) -> bool:
+    """any(phrase in text for phrase in phrases), in one automaton pass when available"""
+    if automaton is not None:
+        return next(automaton.iter(text), None) is not None
+    return any(phrase in text for phrase in phrases)
+
+BENIGN_SKIP_AUTOMATON = _build_substring_automaton(BENIGN_SKIP_PHRASES)
+BENIGN_PHRASES_AUTOMATON = _build_substring_automaton(BENIGN_PHRASES_SET)
+
+def _at_word_boundary(text: str, i: int) -> bool:
+    """True where re's \\b matches at index i (\\w is alphanumeric or underscore)"""
+    before = i > 0 and (text[i - 1].isalnum() or text[i - 1] == "_")
+    after = i < len(text) and (text[i].isalnum() or text[i] == "_")
+    return before != after
+
+def _word_in(text: str, phrase: str) -> bool:
+    """_phrase_re(phrase).search(text) is not None, via str.find and boundary checks on each hit"""
+    end_offset = len(phrase)
+    i = text.find(phrase)
+    while i >= 0:
+        if _at_word_boundary(text, i) and _at_word_boundary(text, i + end_offset):
+            return True
+        i = text.find(phrase, i + 1)
+    return False
+
+@functools.lru_cache(maxsize=256)
+def _phrase_hits(normalized: str) -> int:
+    """Bitmask (see _PHRASE_BITS) of the phrase lists that match normalized, from one automaton pass"""
+    hits = 0
+    for end, (length, phrase_owners) in _PHRASE_AUTOMATON.iter(normalized):
+        bounded = None
+        for bit, word_boundary in phrase_owners:
+            if hits & bit:
+                continue
+            if word_boundary:
+                if bounded is None:
+                    bounded = (_at_word_boundary(normalized, end - length + 1)
+                               and _at_word_boundary(normalized, end + 1))
+                if not bounded:
+                    continue
+            hits |= bit
+    return hits
+
+def _phrase_search(pattern: re.Pattern, normalized: str) -> bool:
+    """pattern.search(normalized), answered from the shared automaton scan when available"""
+    bit = _PHRASE_BITS.get(id(pattern))
+    if bit:
+        return bool(_phrase_hits(normalized) & bit)
+    first_words = _PHRASE_FIRST_WORDS.get(id(pattern))
+    if first_words is not None and first_words.isdisjoint(word_tokens(normalized)):
+        return False
+    return pattern.search(normalized) is not None
+
 # Note: Pattern counts are logged when SmartPreFilter initializes (after logging is configured)
 
 # ============================================
@@ -998,22 +1445,56 @@ MUST_ESCALATE_RE = build_must_escalate_regex()
 # These match common exclamations that are clearly not attacks
 BENIGN_TAIL_PATTERN = r'[\s.,!?…]*(?:lol|lmao|rofl|haha|😂|🤣|😭|💀|🔥|👀|😱|🤯|omg|bruh)?[\s.,!?…😂🤣😭💀🔥👀😱🤯]*$'
 
-BENIGN_PHRASES_RE = [
-    re.compile(r'^(holy\s+)?(shit|fuck|crap|hell|cow)' + BENIGN_TAIL_PATTERN, re.IGNORECASE),
-    re.compile(r'^what\s+the\s+(fuck|hell|heck)' + BENIGN_TAIL_PATTERN, re.IGNORECASE),
-    re.compile(r'^(oh\s+)?(my\s+)?(god|gosh|lord)' + BENIGN_TAIL_PATTERN, re.IGNORECASE),
-    re.compile(r'^(damn|dang|darn)' + BENIGN_TAIL_PATTERN, re.IGNORECASE),
-    re.compile(r'^no\s+(fucking|freaking)?\s*way' + BENIGN_TAIL_PATTERN, re.IGNORECASE),
-    re.compile(r'^(wow|whoa|woah)' + BENIGN_TAIL_PATTERN, re.IGNORECASE),
-    re.compile(r'^(omg|wtf|lol|lmao|bruh)' + BENIGN_TAIL_PATTERN, re.IGNORECASE),
-    re.compile(r'^(this is |that\'?s )?(insane|crazy|wild|nuts|unreal|incredible|amazing)' + BENIGN_TAIL_PATTERN, re.IGNORECASE),
-]
+# One anchored alternation (the engine backtracks into the next exclamation if the tail fails)
+BENIGN_PHRASES_RE = re.compile(r'^(?:' + '|'.join([
+    r'(holy\s+)?(shit|fuck|crap|hell|cow)',
+    r'what\s+the\s+(fuck|hell|heck)',
+    r'(oh\s+)?(my\s+)?(god|gosh|lord)',
+    r'(damn|dang|darn)',
+    r'no\s+(fucking|freaking)?\s*way',
+    r'(wow|whoa|woah)',
+    r'(omg|wtf|lol|lmao|bruh)',
+    r'(this is |that\'?s )?(insane|crazy|wild|nuts|unreal|incredible|amazing)',
+]) + r')' + BENIGN_TAIL_PATTERN, re.IGNORECASE)
 
 
 # ============================================
 # 4. DIRECTEDNESS CHECK
 # ============================================
 
+YOU_RE = re.compile(r'\b(you|your|you\'re|youre|ur)\b')
+
+# Strong directedness signals other than "you" (matched on lowercased text)
+STRONG_DIRECTED_RE = re.compile('|'.join(f'(?:{p})' for p in [
+    r'\bu/\w+',                                     # Explicit user mention
+    r'\bop\b',                                      # OP reference
+    r'\bmods?\b',                                   # Mod reference (often targeted)
+    r'\by\'?all\b',                                 # Y'all / yall
+    r'\byou (all|guys|people)\b',                   # Collective: "you all", "you guys"
+    r'\ball of you\b',
+    r'\beveryone here\b',
+    r'\bpeople here\b',                             # Attacking users in this sub
+    r'\bthis (sub|subreddit)\b',                    # Attacking the community
+    # "bro", "dude", "man" only when addressing someone with criticism
+    r'\b(come on|shut up|wtf|calm down|chill out)\s*(bro|dude|man)\b',
+    r'\b(bro|dude|man)\s*,?\s*(this is|you\'re|you are|that\'s)\s*(stupid|dumb|idiotic|moronic|ridiculous)',
+    # Imperatives - commands directed at the reader even without "you"
+    r'\b(quit|stop)\s+being?\s+',                   # "quit being stupid", "stop being dumb"
+    r'\b(don\'t|dont|never)\s+be\s+',               # "don't be an idiot"
+    r'\b(go|get)\s+(away|lost|out|fucked)\b',       # "go away", "get lost"
+]))
+
+# "Generic you" phrases ("if you think", "you don't need to") as
+# (lowercased phrase, match with word boundaries); punctuation-ending
+# phrases are removed as plain substrings
+GENERIC_YOU_PHRASES = tuple(
+    (p.lower(), p.lower()[-1].isalnum())
+    for p in PATTERNS.get("regex_patterns", {}).get("generic_you_phrases", []) if p
+)
+
+# should_analyze asks this of the same comment up to ~10 times (once per
+# category check and again for the log context), so remember recent answers
+@functools.lru_cache(maxsize=256)
 def is_strongly_directed(text: str) -> bool:
     """
     Check if comment is STRONGLY directed at another user.
@@ -1028,136 +1509,65 @@ def is_strongly_directed(text: str) -> bool:
     """
     text_lower = text.lower()
     
-    # Explicit user mention - always directed
-    if re.search(r'\bu/\w+', text_lower):
+    # Explicit mentions, OP/mods, collective addresses, direct address and
+    # imperatives - any one is enough, so check them all in one search
+    if STRONG_DIRECTED_RE.search(text_lower):
         return True
     
-    # Check for "you/your" words
-    has_you = bool(re.search(r'\b(you|your|you\'re|youre|ur)\b', text_lower))
-    
-    if has_you:
-        # Check if ALL instances of "you" are in generic phrases
-        generic_phrases = PATTERNS.get("regex_patterns", {}).get("generic_you_phrases", [])
-        
-        # If any generic phrase is found, check if "you" appears outside of it
-        text_check = text_lower
-        for phrase in generic_phrases:
-            phrase_lower = phrase.lower()
-            # For phrases ending in punctuation, use substring match
-            # For phrases ending in word characters, use word boundary
-            if phrase_lower[-1].isalnum():
-                pattern = r'\b' + re.escape(phrase_lower) + r'\b'
-                text_check = re.sub(pattern, '', text_check)
-            else:
-                # Substring replacement for phrases ending in punctuation
-                text_check = text_check.replace(phrase_lower, '')
-        
-        # If "you" still appears after removing generic phrases, it's directed
-        if re.search(r'\b(you|your|you\'re|youre|ur)\b', text_check):
-            return True
+    # "you/your" is directed unless every instance sits inside a generic phrase
+    if not YOU_RE.search(text_lower):
+        return False
+    text_check = text_lower
+    for phrase_lower, word_boundary in GENERIC_YOU_PHRASES:
+        if phrase_lower not in text_check:
+            continue  # Nothing to remove (skips the regex call)
+        if word_boundary:
+            text_check = _phrase_re(phrase_lower).sub('', text_check)
         else:
-            # All "you" instances were in generic phrases - not directed
-            has_you = False
-    
-    if has_you:
-        return True
-    
-    # OP reference
-    if re.search(r'\bop\b', text_lower):
-        return True
-    # Mod reference (often targeted)
-    if re.search(r'\bmods?\b', text_lower):
-        return True
-    # Y'all / yall
-    if re.search(r'\by\'?all\b', text_lower):
-        return True
-    # Collective: "you all", "you guys", "you people"
-    if re.search(r'\byou (all|guys|people)\b', text_lower):
-        return True
-    # "all of you"
-    if re.search(r'\ball of you\b', text_lower):
-        return True
-    # "everyone here"
-    if re.search(r'\beveryone here\b', text_lower):
-        return True
-    # "people here" (attacking users in this sub)
-    if re.search(r'\bpeople here\b', text_lower):
-        return True
-    # "this sub" / "this subreddit" (attacking the community)
-    if re.search(r'\bthis (sub|subreddit)\b', text_lower):
-        return True
+            # Substring replacement for phrases ending in punctuation
+            text_check = text_check.replace(phrase_lower, '')
     
-    # Direct address terms combined with negative content
-    # "bro", "dude", "man" when used to address someone directly
-    # Only count as directed if followed by criticism/insult patterns
-    if re.search(r'\b(come on|shut up|wtf|calm down|chill out)\s*(bro|dude|man)\b', text_lower):
-        return True
-    if re.search(r'\b(bro|dude|man)\s*,?\s*(this is|you\'re|you are|that\'s)\s*(stupid|dumb|idiotic|moronic|ridiculous)', text_lower):
-        return True
-    
-    # Imperatives - commands directed at the reader even without "you"
-    # "quit being stupid", "stop being dumb", "don't be an idiot"
-    if re.search(r'\b(quit|stop)\s+being?\s+', text_lower):
-        return True
-    # "don't be", "never be" - also imperatives
-    if re.search(r'\b(don\'t|dont|never)\s+be\s+', text_lower):
-        return True
-    # "go away", "get lost", "get out" - commands
-    if re.search(r'\b(go|get)\s+(away|lost|out|fucked)\b', text_lower):
-        return True
-    
-    return False
+    # If "you" still appears after removing generic phrases, it's directed
+    return YOU_RE.search(text_check) is not None
 
 def is_weakly_directed(text: str) -> bool:
     """
     Check for weak directedness signals.
     "this guy", "this dude", etc. - often refers to public figures, not users.
     """
-    text_lower = text.lower()
-    if re.search(r'\b(this\s+)?(guy|dude|person)\b', text_lower):
-        return True
-    return False
+    return WEAK_DIRECTED_RE.search(text.lower()) is not None
 
 # For backwards compatibility, keep is_directed_at_person as alias for strong
 def is_directed_at_person(text: str) -> bool:
     """Alias for is_strongly_directed"""
     return is_strongly_directed(text)
 
+# A Reddit quote line: optional indentation, then '>' (group 1 = the stripped line,
+# trailing newline consumed so sub() drops the whole line)
+QUOTE_LINE_RE = re.compile(r'^[^\S\n]*(>[^\n]*?)[^\S\n]*(?:\n|$)', re.MULTILINE)
+
 def get_non_quoted_text(text: str) -> str:
     """
     Extract the non-quoted portion of a comment.
     Reddit quotes start with '>' at the beginning of a line.
     Returns the text without quoted lines.
     """
-    lines = text.split('\n')
-    non_quoted = []
-    for line in lines:
-        stripped = line.strip()
-        # Skip lines that start with > (quotes)
-        if not stripped.startswith('>'):
-            non_quoted.append(line)
-    return '\n'.join(non_quoted).strip()
+    if '>' not in text:
+        return text.strip()
+    return QUOTE_LINE_RE.sub('', text).strip()
 
 def is_primarily_quote(text: str) -> bool:
     """
     Check if a comment is primarily quoting someone else.
     Returns True if more than 50% of the content is quoted.
     """
-    lines = text.split('\n')
-    quoted_chars = 0
-    total_chars = 0
-    
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        total_chars += len(stripped)
-        if stripped.startswith('>'):
-            quoted_chars += len(stripped)
-    
-    if total_chars == 0:
+    if '>' not in text:
         return False
-    
+    quoted_chars = sum(len(quote) for quote in QUOTE_LINE_RE.findall(text))
+    if not quoted_chars:
+        return False
+    # Non-whitespace content per line, as the quoted lines are measured
+    total_chars = sum(len(line.strip()) for line in text.split('\n'))
     return (quoted_chars / total_chars) > 0.5
 
 
@@ -1165,6 +1575,15 @@ def is_primarily_quote(text: str) -> bool:
 # 5. PHRASE MATCHING HELPERS
 # ============================================
 
+# Word tokens for single-word list checks against the *_WORDS frozensets.
+# Four checks tokenize the same comment, so the token set is built once.
+WORD_TOKEN_RE = re.compile(r'\b\w+\b')
+
+@functools.lru_cache(maxsize=256)
+def word_tokens(normalized: str) -> frozenset:
+    """Distinct word tokens of normalized text, shared by the single-word list checks"""
+    return frozenset(WORD_TOKEN_RE.findall(normalized))
+
 def contains_slur(text: str) -> bool:
     """
     Check if text contains any slur words OR slur phrases.
@@ -1175,87 +1594,42 @@ def contains_slur(text: str) -> bool:
     
     # First check if any slur exception phrases are present
     # If so, the slur is being used in a benign context
-    for exception in SLUR_EXCEPTIONS:
-        if exception in normalized:
-            # This slur usage is benign (e.g., "go poof" meaning vanish)
-            return False
+    if _phrase_search(SLUR_EXCEPTIONS_RE, normalized):
+        # This slur usage is benign (e.g., "go poof" meaning vanish)
+        return False
     
     # Check single-word slurs via tokenization
-    words = set(re.findall(r'\b\w+\b', normalized))
-    if words & SLUR_WORDS:
+    words = word_tokens(normalized)
+    if not SLUR_WORDS.isdisjoint(words):
         return True
     
     # Check multi-word slur phrases with word boundaries
-    for phrase in SLUR_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    
-    return False
+    return _phrase_search(SLUR_PHRASES_RE, normalized)
 
 def contains_self_harm(text: str) -> bool:
     """Check if text contains self-harm encouragement"""
     normalized = normalize_text(text)
-    squashed = squash_text(text)
-    
-    # Check squashed for spaced evasions like "k y s" or "k.y" but NOT words that 
-    # happen to contain these letters (e.g., "sticky slots" -> "stickys" contains "kys")
-    # Only match if the squashed pattern appears near word boundaries in original
     
-    # For "kys" - only match if original has k, y, s separated by non-letters
-    # e.g., "k y s", "k.y.s", "k-y-s" but not "stickys"
-    kys_pattern = r'\bk[\s\.\-\_\*]*y[\s\.\-\_\*]*s\b'
-    if re.search(kys_pattern, normalized, re.IGNORECASE):
+    # Spaced evasions like "k y s", "k.y.s", "kill your self", "go  die" -
+    # word boundaries keep words that merely contain the letters ("stickys") out
+    if SELF_HARM_EVASIONS_RE.search(normalized):
         return True
     
-    # For "kill yourself" with spaces/punctuation
-    if 'killyourself' in squashed:
-        # Verify it's actually spaced out, not part of another word
-        kill_yourself_pattern = r'\bkill[\s\.\-\_\*]*your[\s\.\-\_\*]*self\b'
-        if re.search(kill_yourself_pattern, normalized, re.IGNORECASE):
-            return True
-    
-    # "go die" with spaces  
-    if 'godie' in squashed:
-        go_die_pattern = r'\bgo[\s\.\-\_\*]*die\b'
-        if re.search(go_die_pattern, normalized, re.IGNORECASE):
-            return True
-            
-    # "drink bleach" with spaces
-    if 'drinkbleach' in squashed:
-        drink_bleach_pattern = r'\bdrink[\s\.\-\_\*]*bleach\b'
-        if re.search(drink_bleach_pattern, normalized, re.IGNORECASE):
-            return True
-    
     # Check phrases with word boundaries to avoid false matches
     # e.g., "end it" should not match "recommend it"
-    for phrase in SELF_HARM_PHRASES:
-        # Use word boundaries for matching
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    
-    return False
+    return _phrase_search(SELF_HARM_RE, normalized)
 
 def contains_threat(text: str) -> bool:
     """Check if text contains threats"""
     normalized = normalize_text(text)
-    for phrase in THREAT_PHRASES:
-        # Use word boundaries to avoid false matches
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    return False
+    # Word boundaries avoid false matches
+    return _phrase_search(THREAT_RE, normalized)
 
 def contains_sexual_violence(text: str) -> bool:
     """Check if text contains sexual violence threats"""
     normalized = normalize_text(text)
-    for phrase in SEXUAL_VIOLENCE_PHRASES:
-        # Use word boundaries to avoid false matches
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    return False
+    # Word boundaries avoid false matches
+    return _phrase_search(SEXUAL_VIOLENCE_RE, normalized)
 
 def contains_brigading(text: str) -> bool:
     """
@@ -1265,52 +1639,22 @@ def contains_brigading(text: str) -> bool:
     """
     normalized = normalize_text(text)
     
-    # Phrases that always indicate brigading (inherently targeted)
-    always_brigading = {
-        'everyone go harass', 'go harass this guy', 'go after this guy',
-        'ruin their life', 'make them regret', 'teach them a lesson',
-        'dox them', 'doxx them', 'raid this'
-    }
+    # Phrases that are inherently targeted ("dox them", "raid this", ...) trigger immediately
+    if _phrase_search(BRIGADING_RE, normalized):
+        return True
     
-    # Phrases that need targeting context
-    needs_context = {'mass report', 'everyone report', 'brigade'}
+    # Context-dependent phrases (BRIGADING_NEEDS_CONTEXT) need targeting;
+    # without it they could be "report to authorities"
+    if not _phrase_search(BRIGADING_CONTEXT_RE, normalized):
+        return False
     
     # Targeting indicators (user/person references)
-    targeting_patterns = [
-        r'\bu/', r'\bthis\s+(guy|dude|user|person|account)\b',
-        r'\bthat\s+(guy|dude|user|person|account)\b',
-        r'\btheir\s+(account|profile|post)\b', r'\bthis\s+post\b',
-        r'\bthe\s+mods?\b', r'\bop\b', r'\bhim\b', r'\bher\b', r'\bthem\b'
-    ]
-    
-    for phrase in BRIGADING_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            # Always-brigading phrases trigger immediately
-            if phrase in always_brigading:
-                return True
-            
-            # Context-dependent phrases need targeting
-            if phrase in needs_context:
-                has_targeting = any(re.search(t, normalized) for t in targeting_patterns)
-                if has_targeting:
-                    return True
-                # Without targeting, skip (could be "report to authorities")
-                continue
-            
-            # Other brigading phrases - trigger
-            return True
-    
-    return False
+    return BRIGADING_TARGET_RE.search(normalized) is not None
 
 def contains_shill_accusation(text: str) -> bool:
     """Check if text contains shill/bot accusations"""
     normalized = normalize_text(text)
-    for phrase in SHILL_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    return False
+    return _phrase_search(SHILL_RE, normalized)
 
 def contains_dismissive_hostile(text: str) -> Tuple[bool, str]:
     """
@@ -1323,33 +1667,23 @@ def contains_dismissive_hostile(text: str) -> Tuple[bool, str]:
     normalized = normalize_text(text)
     
     # Check hard phrases first
-    for phrase in DISMISSIVE_HARD_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True, "hard"
+    if _phrase_search(DISMISSIVE_HARD_RE, normalized):
+        return True, "hard"
     
     # Check gatekeeping phrases (treat similar to hard)
-    for phrase in DISMISSIVE_GATEKEEPING_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True, "gatekeeping"
+    if _phrase_search(DISMISSIVE_GATEKEEPING_RE, normalized):
+        return True, "gatekeeping"
     
     # Check soft phrases
-    for phrase in DISMISSIVE_SOFT_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True, "soft"
+    if _phrase_search(DISMISSIVE_SOFT_RE, normalized):
+        return True, "soft"
     
     return False, ""
 
 def contains_accusation(text: str) -> bool:
     """Check if text contains bad faith accusation phrases (e.g., 'you're lying')"""
     normalized = normalize_text(text)
-    for phrase in ACCUSATION_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    return False
+    return _phrase_search(ACCUSATION_RE, normalized)
 
 def contains_harassment(text: str) -> Tuple[bool, str]:
     """
@@ -1359,16 +1693,12 @@ def contains_harassment(text: str) -> Tuple[bool, str]:
     normalized = normalize_text(text)
     
     # Check mod accusations
-    for phrase in HARASSMENT_MOD_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True, "mod_accusation"
+    if _phrase_search(HARASSMENT_MOD_RE, normalized):
+        return True, "mod_accusation"
     
     # Check condescension/mockery
-    for phrase in HARASSMENT_CONDESCENSION_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True, "condescension"
+    if _phrase_search(HARASSMENT_CONDESCENSION_RE, normalized):
+        return True, "condescension"
     
     # Check emoji mockery (check original text, not normalized)
     for emoji in HARASSMENT_EMOJI:
@@ -1380,11 +1710,7 @@ def contains_harassment(text: str) -> Tuple[bool, str]:
 def contains_vote_manipulation(text: str) -> bool:
     """Check if text contains vote manipulation accusations"""
     normalized = normalize_text(text)
-    for phrase in VOTE_MANIPULATION_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    return False
+    return _phrase_search(VOTE_MANIPULATION_RE, normalized)
 
 def contains_dehumanizing(text: str) -> bool:
     """
@@ -1394,17 +1720,12 @@ def contains_dehumanizing(text: str) -> bool:
     normalized = normalize_text(text)
     
     # Check single-word dehumanizing terms
-    words = set(re.findall(r'\b\w+\b', normalized))
-    if words & DEHUMANIZING_WORDS:
+    words = word_tokens(normalized)
+    if not DEHUMANIZING_WORDS.isdisjoint(words):
         return True
     
     # Check dehumanizing phrases with word boundaries
-    for phrase in DEHUMANIZING_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    
-    return False
+    return _phrase_search(DEHUMANIZING_PHRASES_RE, normalized)
 
 def contains_veiled_threat(text: str) -> bool:
     """
@@ -1412,11 +1733,7 @@ def contains_veiled_threat(text: str) -> bool:
     E.g., "reap the consequences", "you'll pay", "watch your back"
     """
     normalized = normalize_text(text)
-    for phrase in VEILED_THREAT_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    return False
+    return _phrase_search(VEILED_THREAT_RE, normalized)
 
 def contains_homophobic_pejorative(text: str) -> bool:
     """
@@ -1425,11 +1742,7 @@ def contains_homophobic_pejorative(text: str) -> bool:
     These are uses of 'gay' as an insult, not identity references.
     """
     normalized = normalize_text(text)
-    for phrase in HOMOPHOBIC_PEJORATIVE_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    return False
+    return _phrase_search(HOMOPHOBIC_PEJORATIVE_RE, normalized)
 
 def contains_violence_illegal(text: str) -> bool:
     """
@@ -1439,41 +1752,26 @@ def contains_violence_illegal(text: str) -> bool:
     """
     normalized = normalize_text(text)
     
-    # Negation patterns - if present, this is likely discussion, not advocacy
-    negation_patterns = [
-        r'\bdon\'?t\b', r'\bdo\s+not\b', r'\bnever\b', r'\bshouldn\'?t\b',
-        r'\bshould\s+not\b', r'\bwouldn\'?t\b', r'\bwould\s+not\b',
-        r'\bcan\'?t\b', r'\bcannot\b', r'\billegal\s+to\b', r'\bagainst\s+the\s+law\b'
-    ]
+    # Use word boundaries for all phrases to avoid false matches
+    if not _phrase_search(VIOLENCE_ILLEGAL_RE, normalized):
+        return False
     
-    # Exhortative patterns - advocacy requires these
-    exhortative_patterns = [
-        r'\bshould\b', r'\blet\'?s\b', r'\bgonna\b', r'\bgoing\s+to\b',
-        r'\bneed\s+to\b', r'\bwant\s+to\b', r'\bwanna\b', r'\bgotta\b',
-        r'\bwe\s+could\b', r'\bsomeone\s+should\b', r'\bwould\s+be\s+funny\b',
-        r'\bi\'?m\s+gonna\b', r'\bi\'?ll\b', r'\bwe\'?ll\b', r'\bjust\b'
-    ]
+    # Check for negation first - if negated, it's discussion not advocacy
+    # ("don't shoot" not "shoot it")
+    if VIOLENCE_NEGATION_RE.search(normalized):
+        return False
     
-    for phrase in VIOLENCE_ILLEGAL_PHRASES:
-        # Use word boundaries for all phrases to avoid false matches
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            # Check for negation first - if negated, it's discussion not advocacy
-            has_negation = any(re.search(neg, normalized) for neg in negation_patterns)
-            if has_negation:
-                continue  # Skip - this is "don't shoot" not "shoot it"
-            
-            # Check for exhortative context
-            has_exhortative = any(re.search(exh, normalized) for exh in exhortative_patterns)
-            if has_exhortative:
-                return True
-            
-            # Also trigger if it's a direct imperative (starts with verb)
-            # e.g., "Shoot it down!" at the start
-            if normalized.strip().startswith(phrase):
-                return True
+    # Check for exhortative context (advocacy requires these)
+    if VIOLENCE_EXHORTATIVE_RE.search(normalized):
+        return True
     
-    return False
+    # Also trigger if it's a direct imperative (starts with verb)
+    # e.g., "Shoot it down!" at the start
+    stripped = normalized.strip()
+    if not stripped.startswith(VIOLENCE_ILLEGAL_PREFIXES):
+        return False  # One C-level prefix check before testing phrases one by one
+    return any(stripped.startswith(phrase) and _word_in(normalized, phrase)
+               for phrase in VIOLENCE_ILLEGAL_PHRASES)
 
 def contains_direct_insult(text: str) -> bool:
     """
@@ -1483,17 +1781,12 @@ def contains_direct_insult(text: str) -> bool:
     normalized = normalize_text(text)
     
     # Check single-word insults
-    words = set(re.findall(r'\b\w+\b', normalized))
-    if words & INSULT_WORDS:
+    words = word_tokens(normalized)
+    if not INSULT_WORDS.isdisjoint(words):
         return True
     
     # Check insult phrases with word boundaries
-    for phrase in INSULT_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    
-    return False
+    return _phrase_search(INSULT_PHRASES_RE, normalized)
 
 def contains_contextual_term(text: str) -> bool:
     """
@@ -1503,18 +1796,16 @@ def contains_contextual_term(text: str) -> bool:
     normalized = normalize_text(text)
     
     # Check single-word contextual terms
-    words = set(re.findall(r'\b\w+\b', normalized))
-    if words & CONTEXTUAL_WORDS:
+    words = word_tokens(normalized)
+    if not CONTEXTUAL_WORDS.isdisjoint(words):
         return True
     
     # Check multi-word contextual phrases with word boundaries
-    for phrase in CONTEXTUAL_PHRASES:
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        if re.search(pattern, normalized):
-            return True
-    
-    return False
+    return _phrase_search(CONTEXTUAL_PHRASES_RE, normalized)
 
+# should_analyze can ask this of the same comment up to four times (harassment,
+# dismissive, insult checks and is_benign_exclamation), each a scan of ~1200 phrases
+@functools.lru_cache(maxsize=256)
 def matches_any_benign_pattern(text: str) -> bool:
     """
     Check if text matches ANY benign_skip pattern from the patterns file.
@@ -1529,20 +1820,8 @@ def matches_any_benign_pattern(text: str) -> bool:
     Used to prevent must_escalate on comments that contain insult words
     but are clearly not personal attacks.
     """
-    text_lower = text.lower()
-    
-    # Check all benign_skip categories
-    benign_skip = PATTERNS.get("benign_skip", {})
-    for category, phrases in benign_skip.items():
-        if category.startswith("_"):
-            continue
-        if not isinstance(phrases, list):
-            continue
-        for phrase in phrases:
-            if phrase.lower() in text_lower:
-                return True
-    
-    return False
+    # Check all benign_skip categories (pre-lowercased at load time)
+    return _contains_any(text.lower(), BENIGN_SKIP_PHRASES, BENIGN_SKIP_AUTOMATON)
 
 def is_benign_exclamation(text: str) -> bool:
     """
@@ -1576,9 +1855,8 @@ def is_benign_exclamation(text: str) -> bool:
     text_lower = text.strip().lower()
     
     # Check regex patterns first (these are anchored, safe for any length)
-    for pattern in BENIGN_PHRASES_RE:
-        if pattern.match(text_lower):
-            return True
+    if BENIGN_PHRASES_RE.match(text_lower):
+        return True
     
     # NEW: Check specific benign patterns that indicate non-toxic intent
     # These are safe for any length because they're specific phrases
@@ -1596,17 +1874,86 @@ def is_benign_exclamation(text: str) -> bool:
         return False
     
     # Now safe to do substring matching on short, non-insulting comments
-    for phrase in BENIGN_PHRASES_SET:
-        if phrase in text_lower:
-            return True
-    
-    return False
+    return _contains_any(text_lower, BENIGN_PHRASES_SET, BENIGN_PHRASES_AUTOMATON)
 
 
 # ============================================
 # 6. EXTERNAL MODERATION API CLIENTS
 # ============================================
 
+class ScoreCache:
+    """
+    Persistent LRU cache of external moderation API scores.
+    Scores are deterministic for a given text and model version, so reposted
+    copypasta doesn't need another 100-300ms round-trip (or rate limit slot).
+    Keys are blake2b(text|model_version); entries are saved to a JSON file
+    periodically so they survive restarts.
+    """
+    
+    SAVE_EVERY = 25  # Save to disk after this many new entries
+    
+    def __init__(self, path: str, model_version: str, max_entries: int = 10000):
+        self.path = path
+        self.model_version = model_version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._load()
+    
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                data = json_loads(f.read())
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError:
+            logging.warning(f"Could not parse {self.path}, starting with empty score cache")
+            return
+        # Keep only the newest entries if the cap was lowered since last run
+        for key, scores in list(data.items())[-self.max_entries:]:
+            self._entries[key] = scores
+        if self._entries:
+            logging.info(f"Loaded {len(self._entries)} cached scores from {self.path}")
+    
+    def key_for(self, text: str) -> str:
+        """Cache key for text scored by this cache's model version"""
+        return hashlib.blake2b(f"{text}|{self.model_version}".encode("utf-8"), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return scores
+    
+    def put(self, key: str, scores: Dict[str, float]) -> None:
+        with self._lock:
+            self._entries[key] = scores
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            if self._unsaved < self.SAVE_EVERY:
+                return
+        self.save()
+    
+    def save(self) -> None:
+        """Persist cache to disk"""
+        with self._lock:
+            data = dict(self._entries)
+            self._unsaved = 0
+        try:
+            write_json_file(self.path, data, indent=False)
+        except OSError as e:
+            logging.warning(f"Failed to save score cache {self.path}: {e}")
+
+
 class OpenAIModerationClient:
     """
     Client for OpenAI's free Moderation API.
@@ -1629,7 +1976,13 @@ class OpenAIModerationClient:
         'violence/graphic': 0.7,
     }
     
-    def __init__(self, api_key: str, threshold: float = 0.5, requests_per_minute: int = 30):
+    MODEL = "omni-moderation-latest"
+    
+    # Safety-critical categories that should NOT have thresholds raised
+    SAFETY_CRITICAL = {'self-harm', 'self-harm/intent', 'self-harm/instructions', 'sexual/minors'}
+    
+    def __init__(self, api_key: str, threshold: float = 0.5, requests_per_minute: int = 30,
+                 cache: Optional[ScoreCache] = None):
         self.api_key = api_key
         self.base_threshold = threshold
         self.available = bool(api_key)
@@ -1638,6 +1991,7 @@ class OpenAIModerationClient:
         self.errors = 0
         self.rate_limited_skips = 0
         self.client = None
+        self.cache = cache
         
         # Rate limiting
         self.requests_per_minute = requests_per_minute
@@ -1682,6 +2036,14 @@ class OpenAIModerationClient:
         if not self.available or not self.client:
             return False, 0.0, {}
         
+        # Scores are deterministic per text/model, so reuse them when we can
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.key_for(text)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._evaluate_scores(cached, text)
+        
         # Check rate limit before making request
         if not self._check_rate_limit():
             self.rate_limited_skips += 1
@@ -1694,46 +2056,48 @@ class OpenAIModerationClient:
             
             # Call OpenAI Moderation API
             response = self.client.moderations.create(
-                model="omni-moderation-latest",
+                model=self.MODEL,
                 input=text[:32000]  # API limit
             )
             
             result = response.results[0]
+            scores = dict(result.category_scores.model_dump())
             
-            # Extract scores
-            scores = {}
-            triggered_categories = []
-            
-            # Safety-critical categories that should NOT have thresholds raised
-            SAFETY_CRITICAL = {'self-harm', 'self-harm/intent', 'self-harm/instructions', 'sexual/minors'}
+            if cache_key and scores:
+                self.cache.put(cache_key, scores)
             
-            for category, score in result.category_scores.model_dump().items():
-                scores[category] = score
-                default_thresh = self.DEFAULT_THRESHOLDS.get(category, 0.5)
-                
-                # For safety-critical categories, always use the lower (more sensitive) threshold
-                # For other categories, allow env var to raise threshold (less sensitive)
-                if category in SAFETY_CRITICAL:
-                    threshold = min(default_thresh, self.base_threshold)
-                else:
-                    threshold = max(default_thresh, self.base_threshold)
-                
-                if score >= threshold:
-                    triggered_categories.append(f"{category}={score:.2f}")
-            
-            max_score = max(scores.values()) if scores else 0.0
-            is_flagged = len(triggered_categories) > 0
-            
-            if is_flagged:
-                self.flagged_count += 1
-                logging.debug(f"OpenAI Moderation flagged ({', '.join(triggered_categories)}): {text[:50]}...")
-            
-            return is_flagged, max_score, scores
+            return self._evaluate_scores(scores, text)
             
         except Exception as e:
             logging.warning(f"OpenAI Moderation API error: {e}")
             self.errors += 1
             return False, 0.0, {}
+    
+    def _evaluate_scores(self, scores: Dict[str, float], text: str) -> Tuple[bool, float, Dict[str, float]]:
+        """Apply category thresholds to raw scores (fresh or cached)"""
+        triggered_categories = []
+        
+        for category, score in scores.items():
+            default_thresh = self.DEFAULT_THRESHOLDS.get(category, 0.5)
+            
+            # For safety-critical categories, always use the lower (more sensitive) threshold
+            # For other categories, allow env var to raise threshold (less sensitive)
+            if category in self.SAFETY_CRITICAL:
+                threshold = min(default_thresh, self.base_threshold)
+            else:
+                threshold = max(default_thresh, self.base_threshold)
+            
+            if score >= threshold:
+                triggered_categories.append(f"{category}={score:.2f}")
+        
+        max_score = max(scores.values()) if scores else 0.0
+        is_flagged = len(triggered_categories) > 0
+        
+        if is_flagged:
+            self.flagged_count += 1
+            logging.debug(f"OpenAI Moderation flagged ({', '.join(triggered_categories)}): {text[:50]}...")
+        
+        return is_flagged, max_score, scores
 
 
 class PerspectiveAPIClient:
@@ -1753,9 +2117,11 @@ class PerspectiveAPIClient:
         'THREAT': 0.5,
     }
     
+    API_VERSION = "v1alpha1"
     DISCOVERY_URL = "https://commentanalyzer.googleapis.com/$discovery/rest?version=v1alpha1"
     
-    def __init__(self, api_key: str, threshold: float = 0.7, requests_per_minute: int = 60):
+    def __init__(self, api_key: str, threshold: float = 0.7, requests_per_minute: int = 60,
+                 cache: Optional[ScoreCache] = None):
         self.api_key = api_key
         self.base_threshold = threshold
         self.available = bool(api_key)
@@ -1764,6 +2130,7 @@ class PerspectiveAPIClient:
         self.errors = 0
         self.rate_limited_skips = 0
         self.client = None
+        self.cache = cache
         
         # Rate limiting
         self.requests_per_minute = requests_per_minute
@@ -1774,7 +2141,7 @@ class PerspectiveAPIClient:
                 from googleapiclient import discovery
                 self.client = discovery.build(
                     "commentanalyzer",
-                    "v1alpha1",
+                    self.API_VERSION,
                     developerKey=api_key,
                     discoveryServiceUrl=self.DISCOVERY_URL,
                     static_discovery=False,
@@ -1814,6 +2181,14 @@ class PerspectiveAPIClient:
         if not self.available or not self.client:
             return False, 0.0, {}
         
+        # Scores are deterministic per text/model, so reuse them when we can
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.key_for(text)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._evaluate_scores(cached, text)
+        
         # Check rate limit before making request
         if not self._check_rate_limit():
             self.rate_limited_skips += 1
@@ -1834,30 +2209,14 @@ class PerspectiveAPIClient:
             logging.info(f"HTTP Request: POST https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze")
             response = self.client.comments().analyze(body=analyze_request).execute()
             
-            # Extract scores
             scores = {}
-            triggered_categories = []
-            
             for attr, data in response.get('attributeScores', {}).items():
-                score = data.get('summaryScore', {}).get('value', 0.0)
-                scores[attr] = score
-                # Use base_threshold from env if set higher than default (less sensitive)
-                # or use default if it's already higher (e.g., PROFANITY=0.8)
-                # This allows PERSPECTIVE_THRESHOLD to raise thresholds
-                default_thresh = self.DEFAULT_THRESHOLDS.get(attr, 0.7)
-                threshold = max(default_thresh, self.base_threshold)
-                
-                if score >= threshold:
-                    triggered_categories.append(f"{attr}={score:.2f}")
+                scores[attr] = data.get('summaryScore', {}).get('value', 0.0)
             
-            max_score = max(scores.values()) if scores else 0.0
-            is_flagged = len(triggered_categories) > 0
-            
-            if is_flagged:
-                self.flagged_count += 1
-                logging.debug(f"Perspective API flagged ({', '.join(triggered_categories)}): {text[:50]}...")
+            if cache_key and scores:
+                self.cache.put(cache_key, scores)
             
-            return is_flagged, max_score, scores
+            return self._evaluate_scores(scores, text)
             
         except Exception as e:
             error_str = str(e)
@@ -1870,6 +2229,29 @@ class PerspectiveAPIClient:
             logging.warning(f"Perspective API error: {e}")
             self.errors += 1
             return False, 0.0, {}
+    
+    def _evaluate_scores(self, scores: Dict[str, float], text: str) -> Tuple[bool, float, Dict[str, float]]:
+        """Apply attribute thresholds to raw scores (fresh or cached)"""
+        triggered_categories = []
+        
+        for attr, score in scores.items():
+            # Use base_threshold from env if set higher than default (less sensitive)
+            # or use default if it's already higher (e.g., PROFANITY=0.8)
+            # This allows PERSPECTIVE_THRESHOLD to raise thresholds
+            default_thresh = self.DEFAULT_THRESHOLDS.get(attr, 0.7)
+            threshold = max(default_thresh, self.base_threshold)
+            
+            if score >= threshold:
+                triggered_categories.append(f"{attr}={score:.2f}")
+        
+        max_score = max(scores.values()) if scores else 0.0
+        is_flagged = len(triggered_categories) > 0
+        
+        if is_flagged:
+            self.flagged_count += 1
+            logging.debug(f"Perspective API flagged ({', '.join(triggered_categories)}): {text[:50]}...")
+        
+        return is_flagged, max_score, scores
 
 
 # ============================================
@@ -1883,6 +2265,15 @@ class PreFilterResult:
     SKIP = "SKIP"
 
 
+# Shared read-only scores for the common "nothing scored, nothing triggered"
+# skip, so the hottest path doesn't allocate a dict per comment
+EMPTY_SCORES: Mapping[str, float] = MappingProxyType({})
+
+# Newline -> space table for one-line log previews of comment text
+_NL_TRANS = str.maketrans("\n", " ")
+_LOG_RULE = "=" * 61
+
+
 class SmartPreFilter:
     """
     Multi-layered pre-filter that:
@@ -1893,6 +2284,10 @@ class SmartPreFilter:
     5. Considers directedness for borderline cases
     """
     
+    # Persisted pipeline counters (see save_stats / load_pipeline_stats)
+    STATS_COUNTERS = ("total", "must_escalate", "ml_sent", "openai_mod_flagged",
+                      "perspective_flagged", "detoxify_triggered", "benign_skipped", "pattern_skipped")
+    
     def __init__(self, config: Config):
         self.config = config
         self.model = None
@@ -1900,24 +2295,44 @@ class SmartPreFilter:
         self.openai_mod_client = None
         self.perspective_client = None
         
+        # External API calls are network-bound, so run them alongside Detoxify
+        self._api_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="moderation-api")
+        
         # Initialize OpenAI Moderation client if enabled
         if config.openai_moderation_enabled and config.openai_moderation_key:
+            openai_cache = None
+            if config.score_cache_max_entries > 0:
+                openai_cache = ScoreCache(OPENAI_MOD_CACHE_FILE, OpenAIModerationClient.MODEL,
+                                          max_entries=config.score_cache_max_entries)
             self.openai_mod_client = OpenAIModerationClient(
                 api_key=config.openai_moderation_key,
                 threshold=config.openai_moderation_threshold,
-                requests_per_minute=config.openai_moderation_rpm
+                requests_per_minute=config.openai_moderation_rpm,
+                cache=openai_cache
             )
             logging.info(f"OpenAI Moderation mode: {config.openai_moderation_mode}")
         
         # Initialize Perspective API client if enabled
         if config.perspective_enabled and config.perspective_api_key:
+            perspective_cache = None
+            if config.score_cache_max_entries > 0:
+                perspective_cache = ScoreCache(PERSPECTIVE_CACHE_FILE, PerspectiveAPIClient.API_VERSION,
+                                               max_entries=config.score_cache_max_entries)
             self.perspective_client = PerspectiveAPIClient(
                 api_key=config.perspective_api_key,
                 threshold=config.perspective_threshold,
-                requests_per_minute=config.perspective_rpm
+                requests_per_minute=config.perspective_rpm,
+                cache=perspective_cache
             )
             logging.info(f"Perspective API mode: {config.perspective_mode}")
         
+        # When to call each external API, resolved once from its mode:
+        # "all" = every comment, "confirm" = only if Detoxify triggers, "only" = skip Detoxify
+        self._openai_call_always = config.openai_moderation_mode in ("all", "only")
+        self._openai_call_on_confirm = config.openai_moderation_mode == "confirm"
+        self._perspective_call_always = config.perspective_mode in ("all", "only")
+        self._perspective_call_on_confirm = config.perspective_mode == "confirm"
+        
         # Determine if we should skip Detoxify
         # Skip only if BOTH APIs are in "only" mode, or if one is "only" and the other is disabled
         self.skip_detoxify = False
@@ -1932,8 +2347,15 @@ class SmartPreFilter:
         if not self.skip_detoxify:
             try:
                 from detoxify import Detoxify
-                logging.info(f"Loading Detoxify model '{config.detoxify_model}'...")
-                self.model = Detoxify(config.detoxify_model)
+                device = config.detoxify_device
+                if device == "auto":
+                    import torch
+                    device = "cuda" if torch.cuda.is_available() else "cpu"
+                logging.info(f"Loading Detoxify model '{config.detoxify_model}' on {device}...")
+                self.model = Detoxify(config.detoxify_model, device=device)
+                if device.startswith("cuda"):
+                    # FP16 halves memory traffic per batch; scores move only in the 3rd decimal
+                    self.model.model.half()
                 self.available = True
                 logging.info(f"Detoxify model loaded successfully")
             except ImportError:
@@ -1958,6 +2380,19 @@ class SmartPreFilter:
                      f"toxicity={config.threshold_toxicity_directed}/{config.threshold_toxicity_not_directed} (dir/not), "
                      f"obscene={config.threshold_obscene}, borderline={config.threshold_borderline}")
         
+        # Per-label Detoxify thresholds, keyed by is_directed (only insult/toxicity differ)
+        self._detox_thresholds = {
+            is_directed: {
+                'threat': config.threshold_threat,
+                'severe_toxicity': config.threshold_severe_toxicity,
+                'identity_attack': config.threshold_identity_attack,
+                'insult': config.threshold_insult_directed if is_directed else config.threshold_insult_not_directed,
+                'toxicity': config.threshold_toxicity_directed if is_directed else config.threshold_toxicity_not_directed,
+                'obscene': config.threshold_obscene,
+            }
+            for is_directed in (True, False)
+        }
+        
         # Stats - load persisted values or start fresh
         persisted = load_pipeline_stats()
         self.total = persisted.get("total", 0)
@@ -1969,59 +2404,81 @@ class SmartPreFilter:
         self.benign_skipped = persisted.get("benign_skipped", 0)
         self.pattern_skipped = persisted.get("pattern_skipped", 0)
         self._stats_save_counter = 0  # Save every N comments to reduce disk writes
+        # Counters are read by the daily stats thread and bumped from the
+        # processing path, so updates and snapshots go through one lock
+        self._stats_lock = threading.Lock()
         
         if persisted:
             logging.info(f"Loaded persisted pipeline stats: {self.total} total, {self.must_escalate + self.ml_sent} sent to LLM")
     
+    def _bump(self, counter: str) -> None:
+        """Increment a stats counter (thread-safe)"""
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def stats_snapshot(self) -> Dict[str, int]:
+        """Consistent copy of all stats counters"""
+        with self._stats_lock:
+            return {name: getattr(self, name) for name in self.STATS_COUNTERS}
+    
     def save_stats(self) -> None:
         """Persist current stats to disk"""
-        save_pipeline_stats({
-            "total": self.total,
-            "must_escalate": self.must_escalate,
-            "ml_sent": self.ml_sent,
-            "openai_mod_flagged": self.openai_mod_flagged,
-            "perspective_flagged": self.perspective_flagged,
-            "detoxify_triggered": self.detoxify_triggered,
-            "benign_skipped": self.benign_skipped,
-            "pattern_skipped": self.pattern_skipped,
-            "last_updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        })
+        stats = self.stats_snapshot()
+        stats["last_updated"] = _iso_now()
+        save_pipeline_stats(stats)
     
     def _maybe_save_stats(self) -> None:
         """Save stats periodically (every 10 comments) to reduce disk writes"""
-        self._stats_save_counter += 1
-        if self._stats_save_counter >= 10:
-            self.save_stats()
+        with self._stats_lock:
+            self._stats_save_counter += 1
+            if self._stats_save_counter < 10:
+                return
             self._stats_save_counter = 0
+        self.save_stats()
     
-    def _get_ml_scores(self, text: str, is_top_level: bool = False) -> Dict[str, float]:
+    def _get_ml_scores(self, text: str, is_top_level: bool = False,
+                       include_external: bool = True,
+                       detox_scores: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """
         Get ML scores from all available detectors (Detoxify, OpenAI, Perspective).
         Used to provide context to LLM even for pattern-matched comments.
+        With include_external=False only the local Detoxify model is used.
+        detox_scores, if given, are reused instead of running Detoxify again.
         """
         scores = {}
         
+        # Start external APIs first so their round-trips overlap with Detoxify
+        openai_future = None
+        if include_external and self.openai_mod_client and self.openai_mod_client.available:
+            openai_future = self._api_executor.submit(self.openai_mod_client.check_toxicity, text)
+        
+        perspective_future = None
+        if include_external and self.perspective_client and self.perspective_client.available:
+            perspective_future = self._api_executor.submit(self.perspective_client.check_toxicity, text)
+        
         # Run Detoxify if available
-        if self.available:
+        if detox_scores is not None:
+            scores = dict(detox_scores)
+        elif self.available:
             try:
                 results = self.model.predict(text)
                 scores = {k: float(v) for k, v in results.items()}
             except Exception as e:
                 logging.debug(f"Detoxify scoring failed in _get_ml_scores: {e}")
         
-        # Run OpenAI Moderation if available (always run for context)
-        if self.openai_mod_client and self.openai_mod_client.available:
+        # Collect OpenAI Moderation scores (always run for context)
+        if openai_future:
             try:
-                _, _, mod_scores = self.openai_mod_client.check_toxicity(text)
+                _, _, mod_scores = openai_future.result()
                 for cat, score in mod_scores.items():
                     scores[f"openai_{cat}"] = score
             except Exception as e:
                 logging.debug(f"OpenAI Moderation failed in _get_ml_scores: {e}")
         
-        # Run Perspective if available (always run for context)
-        if self.perspective_client and self.perspective_client.available:
+        # Collect Perspective scores (always run for context)
+        if perspective_future:
             try:
-                _, _, persp_scores = self.perspective_client.check_toxicity(text)
+                _, _, persp_scores = perspective_future.result()
                 for cat, score in persp_scores.items():
                     scores[f"perspective_{cat}"] = score
             except Exception as e:
@@ -2029,20 +2486,40 @@ class SmartPreFilter:
         
         return scores
     
-    def should_analyze(self, text: str, is_top_level: bool = False) -> Tuple[bool, float, Dict[str, float]]:
+    def predict_batch(self, texts: List[str]) -> List[Optional[Dict[str, float]]]:
+        """
+        Score several texts with one Detoxify forward pass.
+        Returns one score dict per text, or None entries when Detoxify is
+        unavailable/skipped or the batch fails (should_analyze then scores
+        those texts itself).
+        """
+        if not texts or self.skip_detoxify or not self.available:
+            return [None] * len(texts)
+        try:
+            results = self.model.predict(texts)
+        except Exception as e:
+            logging.warning(f"Detoxify batch scoring failed ({len(texts)} texts): {e}")
+            return [None] * len(texts)
+        return [{k: float(v[i]) for k, v in results.items()} for i in range(len(texts))]
+    
+    def should_analyze(self, text: str, is_top_level: bool = False,
+                       detox_scores: Optional[Dict[str, float]] = None) -> Tuple[bool, float, Dict[str, float]]:
         """
         Determine if comment should be sent to LLM.
         
         Args:
             text: The comment text to analyze
             is_top_level: Whether this is a top-level comment (not a reply)
+            detox_scores: Detoxify scores already computed by predict_batch (optional)
         
         Returns:
             (should_send_to_llm, max_score, all_scores)
+            all_scores may be the shared read-only EMPTY_SCORES on skips;
+            copy it before mutating.
         """
-        self.total += 1
+        self._bump("total")
         self._maybe_save_stats()  # Persist stats periodically
-        text_preview = text[:80].replace('\n', ' ')
+        text_preview = text[:80].translate(_NL_TRANS)
         
         # -----------------------------------------
         # Layer 1: Must-escalate patterns
@@ -2150,8 +2627,11 @@ class SmartPreFilter:
         
         # If must_escalate triggered, still get ML scores for context, then return
         if must_escalate_reason:
-            self.must_escalate += 1
-            scores = self._get_ml_scores(text, is_top_level)
+            self._bump("must_escalate")
+            # The decision is already made, so external APIs are only for LLM/Discord context
+            scores = self._get_ml_scores(text, is_top_level,
+                                         include_external=self.config.ml_context_on_escalate,
+                                         detox_scores=detox_scores)
             scores["_trigger_reasons"] = must_escalate_reason
             logging.info(f"PREFILTER | MUST_ESCALATE ({must_escalate_reason}) | '{text_preview}...'")
             return True, 1.0, scores
@@ -2175,12 +2655,32 @@ class SmartPreFilter:
         openai_mod_triggered = False
         perspective_triggered = False
         triggered_reasons = []
+        openai_max = 0.0  # Max category score from each external API (0.0 if not called)
+        persp_max = 0.0
+        
+        # Start APIs that don't depend on the Detoxify result now, so the
+        # network round-trips overlap with local inference.
+        # "confirm" mode only waits for Detoxify if there is a Detoxify to wait for.
+        confirm_ready = not self.available
+        
+        openai_future = None
+        use_openai = self.openai_mod_client and self.openai_mod_client.available
+        if use_openai and (self._openai_call_always or (self._openai_call_on_confirm and confirm_ready)):
+            openai_future = self._api_executor.submit(self.openai_mod_client.check_toxicity, text)
+        
+        perspective_future = None
+        use_perspective = self.perspective_client and self.perspective_client.available
+        if use_perspective and (self._perspective_call_always or (self._perspective_call_on_confirm and confirm_ready)):
+            perspective_future = self._api_executor.submit(self.perspective_client.check_toxicity, text)
         
         # --- Run Detoxify (unless skipped) ---
         if not self.skip_detoxify and self.available:
             try:
-                results = self.model.predict(text)
-                scores = {k: float(v) for k, v in results.items()}
+                if detox_scores is not None:
+                    scores = dict(detox_scores)
+                else:
+                    results = self.model.predict(text)
+                    scores = {k: float(v) for k, v in results.items()}
                 
                 # Use STRONG directedness for threshold lowering
                 is_directed = is_strongly_directed(text)
@@ -2198,15 +2698,8 @@ class SmartPreFilter:
                     reason = "directed" if is_directed else f"identity_attack={identity_attack_score:.2f}"
                     triggered_reasons.append(f"contextual+{reason}")
                 
-                # Thresholds per label from config
-                thresholds = {
-                    'threat': self.config.threshold_threat,
-                    'severe_toxicity': self.config.threshold_severe_toxicity,
-                    'identity_attack': self.config.threshold_identity_attack,
-                    'insult': self.config.threshold_insult_directed if is_directed else self.config.threshold_insult_not_directed,
-                    'toxicity': self.config.threshold_toxicity_directed if is_directed else self.config.threshold_toxicity_not_directed,
-                    'obscene': self.config.threshold_obscene,
-                }
+                # Thresholds per label from config (precomputed in __init__)
+                thresholds = self._detox_thresholds[is_directed]
                 
                 triggered_labels = []
                 for label, score in scores.items():
@@ -2233,49 +2726,42 @@ class SmartPreFilter:
                 triggered_reasons.append("contextual+directed(no-detoxify)")
         
         # --- Run External APIs based on their mode settings ---
-        # Modes: "all" = every comment, "confirm" = only if Detoxify triggers, "only" = skip Detoxify
-        
-        # Helper to determine if we should call an API
-        def should_call_api(mode: str) -> bool:
-            if mode == "all":
-                return True
-            elif mode == "confirm":
-                return detoxify_triggered or not self.available
-            elif mode == "only":
-                return True
-            return False
-        
-        # --- Run OpenAI Moderation (if enabled) ---
-        if self.openai_mod_client and self.openai_mod_client.available:
-            if should_call_api(self.config.openai_moderation_mode):
-                is_flagged, max_mod_score, mod_scores = self.openai_mod_client.check_toxicity(text)
-                
-                # Add OpenAI scores to our scores dict with prefix
-                for cat, score in mod_scores.items():
-                    scores[f"openai_{cat}"] = score
-                
-                if is_flagged:
-                    openai_mod_triggered = True
-                    self.openai_mod_flagged += 1
-                    triggered_cats = [f"{k}={v:.2f}" for k, v in mod_scores.items() 
-                                     if v >= self.openai_mod_client.DEFAULT_THRESHOLDS.get(k, 0.5)]
-                    triggered_reasons.append(f"openai:{','.join(triggered_cats[:3])}")
-        
-        # --- Run Perspective API (if enabled) ---
-        if self.perspective_client and self.perspective_client.available:
-            if should_call_api(self.config.perspective_mode):
-                is_flagged, max_persp_score, persp_scores = self.perspective_client.check_toxicity(text)
-                
-                # Add Perspective scores to our scores dict with prefix
-                for cat, score in persp_scores.items():
-                    scores[f"perspective_{cat}"] = score
-                
-                if is_flagged:
-                    perspective_triggered = True
-                    self.perspective_flagged += 1
-                    triggered_cats = [f"{k}={v:.2f}" for k, v in persp_scores.items() 
-                                     if v >= self.perspective_client.DEFAULT_THRESHOLDS.get(k, 0.7)]
-                    triggered_reasons.append(f"perspective:{','.join(triggered_cats[:3])}")
+        # "confirm" mode APIs start here once Detoxify has triggered; both run concurrently
+        if detoxify_triggered:
+            if use_openai and not openai_future and self._openai_call_on_confirm:
+                openai_future = self._api_executor.submit(self.openai_mod_client.check_toxicity, text)
+            if use_perspective and not perspective_future and self._perspective_call_on_confirm:
+                perspective_future = self._api_executor.submit(self.perspective_client.check_toxicity, text)
+        
+        # --- Collect OpenAI Moderation (if enabled) ---
+        if openai_future:
+            is_flagged, openai_max, mod_scores = openai_future.result()
+            
+            # Add OpenAI scores to our scores dict with prefix
+            for cat, score in mod_scores.items():
+                scores[f"openai_{cat}"] = score
+            
+            if is_flagged:
+                openai_mod_triggered = True
+                self._bump("openai_mod_flagged")
+                triggered_cats = [f"{k}={v:.2f}" for k, v in mod_scores.items() 
+                                 if v >= self.openai_mod_client.DEFAULT_THRESHOLDS.get(k, 0.5)]
+                triggered_reasons.append(f"openai:{','.join(triggered_cats[:3])}")
+        
+        # --- Collect Perspective API (if enabled) ---
+        if perspective_future:
+            is_flagged, persp_max, persp_scores = perspective_future.result()
+            
+            # Add Perspective scores to our scores dict with prefix
+            for cat, score in persp_scores.items():
+                scores[f"perspective_{cat}"] = score
+            
+            if is_flagged:
+                perspective_triggered = True
+                self._bump("perspective_flagged")
+                triggered_cats = [f"{k}={v:.2f}" for k, v in persp_scores.items() 
+                                 if v >= self.perspective_client.DEFAULT_THRESHOLDS.get(k, 0.7)]
+                triggered_reasons.append(f"perspective:{','.join(triggered_cats[:3])}")
         
         # --- Decision: Send to AI if any triggered ---
         # If detoxify_can_escalate is False, detoxify alone won't trigger send
@@ -2292,14 +2778,11 @@ class SmartPreFilter:
         # Detoxify triggers on any profanity/edgy content, but isn't reliable for actual toxicity
         # Require external validation: OpenAI OR Perspective must also trigger OR have elevated scores
         if effective_detoxify_triggered and not openai_mod_triggered and not perspective_triggered:
-            # Get OpenAI and Perspective max scores
-            openai_max = max([v for k, v in scores.items() if k.startswith('openai_') and isinstance(v, float)], default=0.0)
-            persp_max = max([v for k, v in scores.items() if k.startswith('perspective_') and isinstance(v, float)], default=0.0)
             external_max = max(openai_max, persp_max)
             
             # Skip if external APIs don't validate the concern (scores < 0.30)
             if external_max < 0.30:
-                self.benign_skipped += 1
+                self._bump("benign_skipped")
                 scores_summary = self._format_scores_summary(scores)
                 benign_note = " (has benign pattern)" if has_benign_pattern else ""
                 logging.info(f"PREFILTER | SKIP (detox-only, external APIs low: OpenAI={openai_max:.2f}, Persp={persp_max:.2f}){benign_note} | {scores_summary} | '{text_preview}...'")
@@ -2311,9 +2794,8 @@ class SmartPreFilter:
         if openai_mod_triggered and not effective_detoxify_triggered and not perspective_triggered:
             if has_benign_pattern and not is_strongly_directed(text):
                 # Check Perspective score - if it's also low, skip
-                persp_max = max([v for k, v in scores.items() if k.startswith('perspective_') and isinstance(v, float)], default=0.0)
                 if persp_max < 0.40:  # Perspective doesn't see it as toxic either
-                    self.benign_skipped += 1
+                    self._bump("benign_skipped")
                     scores_summary = self._format_scores_summary(scores)
                     logging.info(f"PREFILTER | SKIP (openai-only, benign pattern + not directed, Persp={persp_max:.2f}) | {scores_summary} | '{text_preview}...'")
                     return False, scores.get('toxicity', 0.0), scores
@@ -2321,9 +2803,10 @@ class SmartPreFilter:
         if effective_detoxify_triggered or openai_mod_triggered or perspective_triggered:
             # Count detoxify triggers (for stats, even if not used for escalation)
             if detoxify_triggered:
-                self.detoxify_triggered += 1
+                self._bump("detoxify_triggered")
             
-            max_score = max([v for k, v in scores.items() if isinstance(v, (int, float))], default=0.5)
+            # Scores only hold numeric values until _trigger_reasons is added below
+            max_score = max(scores.values(), default=0.5)
             
             # Build log message
             directed_str = "directed" if is_strongly_directed(text) else "not directed"
@@ -2338,7 +2821,7 @@ class SmartPreFilter:
             scores["_trigger_reasons"] = triggers
             
             # Track total ML-layer sends (not double-counted)
-            self.ml_sent += 1
+            self._bump("ml_sent")
             
             # Build scores summary for logging
             scores_summary = self._format_scores_summary(scores)
@@ -2347,23 +2830,21 @@ class SmartPreFilter:
             return True, max_score, scores
         
         # --- None triggered: SKIP ---
-        self.pattern_skipped += 1
+        self._bump("pattern_skipped")
         
         # Log if detoxify triggered but was ignored
         if detoxify_triggered and not self.config.detoxify_can_escalate:
             logging.debug(f"PREFILTER | SKIP (detoxify triggered but DETOXIFY_CAN_ESCALATE=false) | '{text_preview}...'")
         
         if scores:
-            numeric_scores = {k: v for k, v in scores.items() if isinstance(v, (int, float))}
-            if numeric_scores:
-                max_score = max(numeric_scores.values())
-                # Build scores summary for logging
-                scores_summary = self._format_scores_summary(scores)
-                logging.info(f"PREFILTER | SKIP | {scores_summary} | '{text_preview}...'")
-                return False, max_score, scores
+            max_score = max(scores.values())
+            # Build scores summary for logging
+            scores_summary = self._format_scores_summary(scores)
+            logging.info(f"PREFILTER | SKIP | {scores_summary} | '{text_preview}...'")
+            return False, max_score, scores
         
         logging.info(f"PREFILTER | SKIP (no triggers) | '{text_preview}...'")
-        return False, 0.0, scores
+        return False, 0.0, EMPTY_SCORES
     
     def _format_scores_summary(self, scores: Dict) -> str:
         """Format scores from all APIs into a readable summary string."""
@@ -2411,10 +2892,17 @@ class SmartPreFilter:
         
         ml_str = f", triggers: {'+'.join(ml_details)}" if ml_details else ""
         
+        # Score cache hits (API calls avoided)
+        cache_details = []
+        for name, client in (("openai", self.openai_mod_client), ("perspective", self.perspective_client)):
+            if client and client.cache and client.cache.hits > 0:
+                cache_details.append(f"{name}:{client.cache.hits}")
+        cache_str = f" | Cache hits: {', '.join(cache_details)}" if cache_details else ""
+        
         return (
             f"Total: {self.total} | "
             f"Sent to LLM: {sent} (must_escalate: {self.must_escalate}, ml: {self.ml_sent}{ml_str}) | "
-            f"Skipped: {skipped} ({pct_skipped:.1f}%)"
+            f"Skipped: {skipped} ({pct_skipped:.1f}%){cache_str}"
         )
 
 
@@ -2426,6 +2914,19 @@ DetoxifyFilter = SmartPreFilter
 # LLM Analysis
 # -------------------------------
 
+# Response format: "VERDICT: REPORT|BENIGN" and "REASON: <short explanation>" lines
+_VERDICT_RE = re.compile(r'^[ \t]*VERDICT[ \t]*:[ \t]*(\S+)', re.I | re.M)
+_REASON_RE = re.compile(r'^[ \t]*REASON[ \t]*:[ \t]*(.+?)\s*$', re.I | re.M)
+# Unlabelled responses: the words anywhere (substring match, as the old upper() check did)
+_REPORT_RE = re.compile(r'REPORT', re.I)
+_BENIGN_RE = re.compile(r'BENIGN', re.I)
+# Batched responses: one "COMMENT <n>" header line per comment (markdown decoration tolerated)
+_BATCH_HEADER_RE = re.compile(r'^[ \t]*[*#=]*[ \t]*COMMENT[ \t]*#?(\d+)[ \t]*[*=:]*[ \t]*$', re.I | re.M)
+
+# Rate limit error parsing: "Limit 1000, Used 1000" and wait times like 24h0m0s, 5m20s, 30s, 220ms
+_RPD_RE = re.compile(r'Limit (\d+), Used (\d+)')
+_RETRY_TIME_RE = re.compile(r'(\d+h)?(\d+m(?!s))?(\d+(?:\.\d+)?s)?(\d+ms)?')
+
 @dataclass
 class AnalysisResult:
     """Result from LLM comment analysis"""
@@ -2436,9 +2937,98 @@ class AnalysisResult:
     detoxify_score: float = 0.0  # Pre-filter score that triggered analysis
 
 
+class LFUCache:
+    """
+    Least-frequently-used cache with LRU tie-break, O(1) get/put.
+    Keys are grouped into per-frequency buckets (insertion-ordered), so the
+    eviction victim is the oldest key in the lowest-frequency bucket.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._values: Dict[str, Any] = {}
+        self._freqs: Dict[str, int] = {}
+        self._buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_freq = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def _touch(self, key: str) -> None:
+        freq = self._freqs[key]
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freqs[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._values:
+                return None
+            self._touch(key)
+            return self._values[key]
+    
+    def put(self, key: str, value: Any) -> None:
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            if key in self._values:
+                self._values[key] = value
+                self._touch(key)
+                return
+            if len(self._values) >= self.capacity:
+                bucket = self._buckets[self._min_freq]
+                victim, _ = bucket.popitem(last=False)
+                if not bucket:
+                    del self._buckets[self._min_freq]
+                del self._values[victim]
+                del self._freqs[victim]
+            self._values[key] = value
+            self._freqs[key] = 1
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_freq = 1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at rate_per_minute, holding at most
+    `capacity` tokens (capacity=1 spaces requests evenly, larger allows bursts).
+    Callers reserve a token and sleep outside the lock, so concurrent callers
+    are handed successive slots instead of all waking at once.
+    """
+    
+    def __init__(self, rate_per_minute: float, capacity: int = 1):
+        self.interval = 60.0 / rate_per_minute  # seconds per token
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.interval)
+        self._updated = now
+    
+    def reserve(self) -> float:
+        """Take the next token, returning how many seconds to wait before using it"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return max(0.0, -self._tokens * self.interval)
+
+
 class LLMAnalyzer:
     """Uses Groq (free tier), x.ai Grok, or OpenAI GPT for toxicity analysis with context understanding"""
     
+    # Consecutive non-rate-limit errors before a model is put on cooldown, and
+    # for how long. Once the cooldown expires one more error re-opens it.
+    ERROR_BREAKER_THRESHOLD = 3
+    ERROR_BREAKER_COOLDOWN = 300
+    
     # x.ai model prefixes - models starting with these use x.ai API
     XAI_MODEL_PREFIXES = ("grok-", "grok/")
     
@@ -2449,7 +3039,8 @@ class LLMAnalyzer:
                  fallback_chain: List[str] = None, daily_limit: int = 240,
                  requests_per_minute: int = 2, xai_api_key: str = "",
                  xai_reasoning_effort: str = "low", groq_reasoning_effort: str = "medium",
-                 openai_api_key: str = ""):
+                 openai_api_key: str = "", verdict_cache_size: int = 50000,
+                 burst: int = 1):
         # Groq client (always available)
         self.groq_client = Groq(api_key=groq_api_key)
         self.groq_reasoning_effort = groq_reasoning_effort
@@ -2476,22 +3067,101 @@ class LLMAnalyzer:
         self.fallback_chain = fallback_chain or []
         self.daily_limit = daily_limit
         self.guidelines = guidelines
+        # Static prefix first (guidelines, then the ML legend) - identical for every
+        # call so it can be prompt-cached. Everything comment-specific goes after it.
+        self.system_prompt = f"{guidelines}\n\n{self.ML_SCORES_LEGEND}"
         self.requests_per_minute = requests_per_minute
         
         # Track daily usage
         self.daily_calls = 0
         self.last_reset_date = time.strftime("%Y-%m-%d")
         
-        # Rate limiting - track last request time
-        self.last_request_time = 0
-        self.min_request_interval = 60.0 / requests_per_minute  # seconds between requests
+        # Rate limiting - requests_per_minute spread evenly (one request every 60/rpm seconds),
+        # with up to `burst` requests allowed back to back after an idle spell
+        self._rate_bucket = TokenBucket(requests_per_minute, capacity=burst)
         
         # Model cooldowns - track when each model can be used again
         # Key: model name, Value: timestamp when cooldown expires
         self.model_cooldowns: Dict[str, float] = {}
+        # Consecutive errors per model (cleared on success), so an outage
+        # doesn't cost a failed request on every comment
+        self.model_errors: Dict[str, int] = {}
         
         # Total stats
         self.api_calls = 0
+        
+        # Verdicts for repeated text (copypasta, bot spam, re-streamed comments).
+        # Keyed on a hash of the guidelines too, so editing them invalidates entries.
+        self._verdict_cache = LFUCache(verdict_cache_size)
+        self._guidelines_hash = hashlib.blake2b(guidelines.encode("utf-8"), digest_size=8).hexdigest()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Prompt cache accounting (provider-side prefix caching)
+        self.prompt_tokens_total = 0
+        self.cached_tokens_total = 0
+        
+        # API routing and request kwargs per model, so the retry loop does no string checks
+        self._model_flags: Dict[str, Dict[str, Any]] = {}
+        for m in [self.primary_model] + self.fallback_chain:
+            self._get_model_flags(m)
+    
+    def _verdict_cache_key(self, subreddit: str, user_prompt: str) -> str:
+        """
+        Cache key for an LLM verdict - keyed on the whole user prompt, so the
+        same text only hits when its parent/grandparent context, post title
+        and ML scores match too
+        """
+        key_src = f"{self._guidelines_hash}|{subreddit.lower()}|{user_prompt}"
+        return hashlib.blake2b(key_src.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _xai_conv_id_for(self, subreddit: str, model: str) -> str:
+        """Stable x.ai conv-id per (subreddit, model) so each bucket builds its own prompt cache"""
+        if not subreddit:
+            return self.xai_conv_id
+        return hashlib.blake2b(f"{subreddit}|{model}".encode("utf-8"), digest_size=8).hexdigest()
+    
+    def _build_model_flags(self, model: str) -> Dict[str, Any]:
+        """Work out which API a model uses and its per-model request kwargs"""
+        model_lower = model.lower()
+        is_xai = self._is_xai_model(model)
+        is_openai = self._is_openai_model(model)
+        kwargs: Dict[str, Any] = {}
+        
+        if is_xai:
+            kwargs["max_tokens"] = 200
+            # Only grok-3-mini supports reasoning_effort parameter
+            # grok-4 is always a reasoning model (no parameter needed)
+            # grok-3 does not support reasoning_effort
+            if "grok-3-mini" in model_lower:
+                kwargs["extra_body"] = {"reasoning_effort": self.xai_reasoning_effort}
+        elif is_openai:
+            # Newer models (gpt-5, o1, o3) use max_completion_tokens instead of max_tokens
+            if any(x in model_lower for x in ['gpt-5', 'gpt-4.5', 'o1-', 'o3-']):
+                kwargs["max_completion_tokens"] = 200
+            else:
+                kwargs["max_tokens"] = 200
+        else:
+            kwargs["max_tokens"] = 200
+            # Add reasoning parameters for Groq models that support it
+            if "qwen3" in model_lower:
+                # Qwen3 uses reasoning_format, always reasons by default
+                kwargs["reasoning_format"] = "hidden"  # Don't show <think> tags
+            elif "gpt-oss" in model_lower:
+                # GPT-OSS supports reasoning_effort (low/medium/high)
+                kwargs["reasoning_effort"] = self.groq_reasoning_effort
+            elif "deepseek-r1" in model_lower:
+                # DeepSeek R1 always reasons, hide the output
+                kwargs["reasoning_format"] = "hidden"
+        
+        return {"is_xai": is_xai, "is_openai": is_openai, "kwargs": kwargs}
+    
+    def _get_model_flags(self, model: str) -> Dict[str, Any]:
+        """Per-model flags, computed once (models outside the configured chain are added on first use)"""
+        flags = self._model_flags.get(model)
+        if flags is None:
+            flags = self._model_flags[model] = self._build_model_flags(model)
+        return flags
     
     def _is_xai_model(self, model: str) -> bool:
         """Check if a model should use x.ai API"""
@@ -2515,15 +3185,10 @@ class LLMAnalyzer:
     
     def _wait_for_rate_limit(self) -> None:
         """Wait if needed to respect rate limit"""
-        now = time.time()
-        time_since_last = now - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            wait_time = self.min_request_interval - time_since_last
+        wait_time = self._rate_bucket.reserve()
+        if wait_time > 0:
             logging.debug(f"Rate limiting: waiting {wait_time:.1f}s before next Groq request")
             time.sleep(wait_time)
-        
-        self.last_request_time = time.time()
     
     def _get_current_model(self) -> str:
         """Get the model to use - always returns primary, fallback handled in analyze()"""
@@ -2547,14 +3212,12 @@ class LLMAnalyzer:
         """
         if not time_str:
             return None
-            
-        import re
         
         time_str_lower = time_str.lower()
         
         # Try to find time pattern anywhere in string (handles "try again in X" format)
         # Pattern handles: 24h0m0s, 5m20s, 30s, 220ms
-        match = re.search(r'(\d+h)?(\d+m(?!s))?(\d+(?:\.\d+)?s)?(\d+ms)?', time_str_lower)
+        match = _RETRY_TIME_RE.search(time_str_lower)
         if not match:
             return None
         
@@ -2626,68 +3289,63 @@ class LLMAnalyzer:
             # Don't fail on header parsing errors
             logging.debug(f"Could not parse rate limit headers: {e}")
     
+    # Static description of the ML detectors, sent as part of the system prompt.
+    # Keeping it out of the per-comment user prompt makes the system prompt
+    # byte-identical across calls so providers can serve it from prompt cache.
+    ML_SCORES_LEGEND = """[ML DETECTOR SCORES - how to read them:]
+Some comments include scores from one or more ML models that analyzed them:
+
+  DETOXIFY (local ML model - fast pre-filter, can have false positives on profanity):
+    Thresholds: insult≥0.40 (directed)/0.65 (general), toxicity≥0.50/0.65, threat≥0.15
+
+  OPENAI MODERATION (highly accurate for harassment, hate speech, self-harm, violence):
+    Thresholds: harassment≥0.50, hate≥0.50, violence≥0.70, self-harm≥0.30
+
+  GOOGLE PERSPECTIVE (highly accurate for toxicity, trained on millions of comments):
+    Thresholds: TOXICITY≥0.70, INSULT≥0.70, SEVERE_TOXICITY≥0.50, THREAT≥0.50
+
+  PATTERN MATCH: Direct pattern match on slurs, threats, or targeted insults
+
+  GUIDANCE: OpenAI and Google Perspective are more accurate for true toxicity.
+  High scores from multiple models = stronger signal. Use your judgment on context."""
+    
     def _build_ml_scores_context(self, scores: Dict[str, float]) -> str:
-        """Build a context string describing ML detector scores for the LLM."""
+        """Build the per-comment ML detector scores for the LLM (legend lives in the system prompt)."""
         if not scores:
             return ""
         
-        lines = ["[ML DETECTOR SCORES - Multiple models analyzed this comment:]"]
-        
-        # Detoxify scores (local ML model)
-        detoxify_scores = {k: v for k, v in scores.items() 
-                          if not k.startswith(('openai_', 'perspective_', '_')) and isinstance(v, (int, float))}
-        if detoxify_scores:
-            top_scores = sorted(detoxify_scores.items(), key=lambda x: x[1], reverse=True)[:4]
-            score_strs = [f"{k}={v:.2f}" for k, v in top_scores if v > 0.1]
-            if score_strs:
-                lines.append(f"")
-                lines.append(f"  DETOXIFY (local ML model - fast pre-filter, can have false positives on profanity):")
-                lines.append(f"    Scores: {', '.join(score_strs)}")
-                lines.append(f"    Thresholds: insult≥0.40 (directed)/0.65 (general), toxicity≥0.50/0.65, threat≥0.15")
-        
-        # OpenAI Moderation scores
-        openai_scores = {k.replace('openai_', ''): v for k, v in scores.items() 
-                        if k.startswith('openai_') and isinstance(v, (int, float))}
-        if openai_scores:
-            top_scores = sorted(openai_scores.items(), key=lambda x: x[1], reverse=True)[:4]
-            score_strs = [f"{k}={v:.2f}" for k, v in top_scores if v > 0.1]
-            if score_strs:
-                lines.append(f"")
-                lines.append(f"  OPENAI MODERATION (highly accurate for harassment, hate speech, self-harm, violence):")
-                lines.append(f"    Scores: {', '.join(score_strs)}")
-                lines.append(f"    Thresholds: harassment≥0.50, hate≥0.50, violence≥0.70, self-harm≥0.30")
-        
-        # Perspective API scores
-        perspective_scores = {k.replace('perspective_', ''): v for k, v in scores.items() 
-                             if k.startswith('perspective_') and isinstance(v, (int, float))}
-        if perspective_scores:
-            top_scores = sorted(perspective_scores.items(), key=lambda x: x[1], reverse=True)[:4]
+        # One pass to split scores by model (legend/thresholds are static, in ML_SCORES_LEGEND)
+        by_model: Dict[str, List[Tuple[str, float]]] = {"DETOXIFY": [], "OPENAI MODERATION": [], "GOOGLE PERSPECTIVE": []}
+        for k, v in scores.items():
+            if not isinstance(v, (int, float)):
+                continue
+            if k.startswith('openai_'):
+                by_model["OPENAI MODERATION"].append((k[7:], v))
+            elif k.startswith('perspective_'):
+                by_model["GOOGLE PERSPECTIVE"].append((k[12:], v))
+            elif not k.startswith('_'):
+                by_model["DETOXIFY"].append((k, v))
+        
+        lines = ["[ML DETECTOR SCORES:]"]
+        for label, items in by_model.items():
+            # Top 4 per model, ignoring near-zero scores
+            top_scores = sorted(items, key=lambda x: x[1], reverse=True)[:4]
             score_strs = [f"{k}={v:.2f}" for k, v in top_scores if v > 0.1]
             if score_strs:
-                lines.append(f"")
-                lines.append(f"  GOOGLE PERSPECTIVE (highly accurate for toxicity, trained on millions of comments):")
-                lines.append(f"    Scores: {', '.join(score_strs)}")
-                lines.append(f"    Thresholds: TOXICITY≥0.70, INSULT≥0.70, SEVERE_TOXICITY≥0.50, THREAT≥0.50")
+                lines.append(f"  {label}: {', '.join(score_strs)}")
         
         # Check trigger reasons if available
         trigger = scores.get('_trigger_reasons', '')
         if trigger and 'must_escalate' in trigger:
-            lines.append(f"")
             lines.append(f"  ⚠️ PATTERN MATCH: {trigger}")
-            lines.append(f"    (Direct pattern match on slurs, threats, or targeted insults)")
         
         if len(lines) > 1:
-            lines.append(f"")
-            lines.append(f"  GUIDANCE: OpenAI and Google Perspective are more accurate for true toxicity.")
-            lines.append(f"  High scores from multiple models = stronger signal. Use your judgment on context.")
             return '\n'.join(lines)
         return ""
     
-    def analyze(self, text: str, subreddit: str, context_info: Dict[str, str] = None, 
-                detoxify_score: float = 0.0, is_top_level: bool = False, 
-                scores: Dict[str, float] = None) -> AnalysisResult:
-        """Send to Groq for nuanced analysis"""
-        
+    def _build_user_prompt(self, text: str, context_info: Optional[Dict[str, str]],
+                           is_top_level: bool, scores: Optional[Dict[str, float]]) -> str:
+        """Comment-specific part of the prompt: conversation context, notes, ML scores and the comment"""
         # Extract context info
         context_info = context_info or {}
         post_title = context_info.get("post_title", "")
@@ -2697,10 +3355,6 @@ class LLMAnalyzer:
         grandparent_context = context_info.get("grandparent_context", "")
         grandparent_author = context_info.get("grandparent_author", "")
         
-        current_model = self._get_current_model()
-        
-        system_prompt = f"""{self.guidelines}"""
-
         # Add context about comment type for accurate reasoning
         if is_top_level:
             context_note = "[TOP-LEVEL COMMENT on a post - not replying to another user]"
@@ -2714,7 +3368,7 @@ class LLMAnalyzer:
                 context_note = "[REPLY to another user's comment]"
         
         # Check if comment contains Reddit-style quotes
-        has_quotes = '\n>' in text or text.startswith('>')
+        has_quotes = text.startswith('>') or '\n>' in text
         if has_quotes:
             context_note += "\n[CONTAINS QUOTED TEXT - lines starting with '>' are quoting another user, not the commenter's own words]"
         
@@ -2724,10 +3378,7 @@ class LLMAnalyzer:
             context_note += f"\n\n{ml_context}"
         
         # Build user prompt with full context
-        user_prompt = f"{context_note}\n"
-        
-        if post_title:
-            user_prompt += f"\nPost title: \"{post_title}\"\n"
+        user_prompt = ""
         
         # Add grandparent context first (if available) for full conversation flow
         if grandparent_context:
@@ -2742,296 +3393,292 @@ class LLMAnalyzer:
                 op_note = " [OP]" if is_parent_op else ""
                 user_prompt += f"\nParent comment (from {pa_author_str}{op_note}):\n> {parent_context[:1000]}\n"
         
+        # Comment-specific notes and the title sit right before the comment itself
+        user_prompt += f"\n{context_note}\n"
+        if post_title:
+            user_prompt += f"\nPost title: \"{post_title}\"\n"
+        
         user_prompt += f"\nAnalyze this comment:\n\n{text}"
+        user_prompt = user_prompt.lstrip("\n")
+        return user_prompt
+    
+    def _complete(self, messages: List[Dict[str, str]], subreddit: str, current_model: str) -> str:
+        """
+        Run one chat completion through the model chain (rate limit, retries,
+        cooldowns, fallbacks) and return the raw response text.
+        Raises if every model fails.
+        """
+        # Wait if needed to respect our own rate limit
+        self._wait_for_rate_limit()
+        
+        self.api_calls += 1
+        self.daily_calls += 1
+        
+        # Start with configured model first, then fall through to fallback chain
+        models_to_try = [current_model]
+        for m in self.fallback_chain:
+            if m not in models_to_try:
+                models_to_try.append(m)
+        
+        last_error = None
+        response = None
+        success = False
+        fallback_delay = 30  # seconds to wait between fallback models
+        tried_model = False  # Only wait before a fallback if an earlier model was actually called
+        
+        for model_idx, model_to_use in enumerate(models_to_try):
+            if success:
+                break
+        
+            # Check if model is on cooldown
+            cooldown_until = self.model_cooldowns.get(model_to_use, 0)
+            if time.time() < cooldown_until:
+                remaining = int(cooldown_until - time.time())
+                logging.info(f"Skipping {model_to_use} - on cooldown for {remaining}s more")
+                continue
+        
+            # Wait before trying fallback models (not for the first model)
+            if tried_model:
+                logging.info(f"Waiting {fallback_delay}s before trying fallback model...")
+                time.sleep(fallback_delay)
+        
+            # Retry logic for each model
+            max_retries = 2 if model_idx > 0 else 3  # Fewer retries for fallbacks
+            retry_delay = 3  # seconds
+        
+            logging.info(f"Trying model {model_idx + 1}/{len(models_to_try)}: {model_to_use}")
+        
+            # Check if this is an x.ai model and we have the client
+            flags = self._get_model_flags(model_to_use)
+            is_xai = flags["is_xai"]
+            is_openai = flags["is_openai"]
+        
+            if is_xai and not self.xai_client:
+                logging.warning(f"Skipping {model_to_use} - XAI_API_KEY not configured")
+                continue
+        
+            if is_openai and not self.openai_client:
+                logging.warning(f"Skipping {model_to_use} - OPENAI_API_KEY not configured for LLM")
+                continue
+        
+            tried_model = True
+            api_kwargs = {
+                "model": model_to_use,
+                "messages": messages,
+                "temperature": 0.1,  # Low temp for consistent classification
+                **flags["kwargs"],
+            }
+        
+            for attempt in range(max_retries):
+                try:
+                    if is_xai:
+                        # x.ai API (OpenAI-compatible)
+                        # Use conv_id header (per subreddit/model) to improve prompt caching across requests
+                        api_kwargs["extra_headers"] = {"x-grok-conv-id": self._xai_conv_id_for(subreddit, model_to_use)}
+                        response = self.xai_client.chat.completions.create(**api_kwargs)
+                        raw_response = None  # No rate limit headers for x.ai
+                    elif is_openai:
+                        # OpenAI API (GPT models)
+                        response = self.openai_client.chat.completions.create(**api_kwargs)
+                        raw_response = None  # Handle rate limits via exceptions
+                    else:
+                        # Groq API - use with_raw_response to get rate limit headers
+                        raw_response = self.groq_client.chat.completions.with_raw_response.create(**api_kwargs)
+                        response = raw_response.parse()
+        
+                    if model_to_use != models_to_try[0]:
+                        logging.info(f"Successfully used fallback model: {model_to_use}")
+                    # Clear any cooldown on success
+                    if model_to_use in self.model_cooldowns:
+                        del self.model_cooldowns[model_to_use]
+                    self.model_errors.pop(model_to_use, None)
+        
+                    # Check rate limit headers from response (Groq only)
+                    if raw_response and hasattr(raw_response, 'headers'):
+                        self._check_rate_limit_headers(model_to_use, raw_response.headers)
+        
+                    success = True
+                    break  # Success - exit retry loop
+        
+                except Exception as e:
+                    error_str = str(e)
+                    last_error = e
+                    if "429" in error_str or "rate_limit" in error_str.lower():
+                        # Log full error for debugging
+                        logging.debug("Full rate limit error: %s", error_str)
+        
+                        # Check if daily limit is fully exhausted (Used == Limit)
+                        daily_exhausted = False
+                        rpd_match = _RPD_RE.search(error_str)
+                        if rpd_match:
+                            limit = int(rpd_match.group(1))
+                            used = int(rpd_match.group(2))
+                            if used >= limit:
+                                daily_exhausted = True
+                                logging.warning(f"⚠️ {model_to_use} daily limit EXHAUSTED ({used}/{limit} RPD)")
+        
+                        # Try to get retry-after from exception response headers first
+                        suggested_wait = None
+                        if hasattr(e, 'response') and hasattr(e.response, 'headers'):
+                            retry_after = e.response.headers.get('retry-after')
+                            if retry_after:
+                                try:
+                                    suggested_wait = float(retry_after)
+                                    logging.debug("Got retry-after header: %ss", suggested_wait)
+                                except (ValueError, TypeError):
+                                    pass
+        
+                        # Fall back to parsing error message
+                        if not suggested_wait:
+                            suggested_wait = self._parse_retry_time(error_str)
+                            if suggested_wait:
+                                logging.debug("Parsed wait time from message: %.0fs", suggested_wait)
+        
+                        if not suggested_wait:
+                            logging.debug("Could not parse wait time from error")
+        
+                        # If daily limit exhausted, set 1 hour cooldown regardless of retry-after
+                        if daily_exhausted:
+                            cooldown_time = 3600  # 1 hour
+                            self.model_cooldowns[model_to_use] = time.time() + cooldown_time
+                            logging.warning(f"Rate limited on {model_to_use} - daily limit exhausted, 1h cooldown set, trying next model...")
+                            break  # Exit retry loop, try next model
+                        # If wait time is short (< 30s), wait and retry same model
+                        elif suggested_wait and suggested_wait <= 30 and attempt < max_retries - 1:
+                            logging.warning(f"Rate limited on {model_to_use}, waiting {suggested_wait:.0f}s (from API) before retry {attempt + 2}/{max_retries}")
+                            time.sleep(suggested_wait)
+                            continue
+                        elif suggested_wait and suggested_wait > 30:
+                            # Set cooldown - minimum 120s, plus 60s buffer on top of API time
+                            # Cap at 1 hour - if longer, we'll just retry and get a fresh wait time
+                            cooldown_time = min(max(suggested_wait + 60, 120), 3600)
+                            self.model_cooldowns[model_to_use] = time.time() + cooldown_time
+                            logging.warning(f"Rate limited on {model_to_use} for {suggested_wait:.0f}s - {cooldown_time:.0f}s cooldown set, trying next model...")
+                            break  # Exit retry loop, try next model
+                        elif attempt < max_retries - 1:
+                            wait_time = retry_delay * (attempt + 1)
+                            logging.warning(f"Rate limited on {model_to_use}, waiting {wait_time}s before retry {attempt + 2}/{max_retries}")
+                            time.sleep(wait_time)
+                            continue
+                        else:
+                            # Out of retries for this model, set longer cooldown (10 min)
+                            # since we couldn't parse the wait time
+                            self.model_cooldowns[model_to_use] = time.time() + 600
+                            logging.warning(f"Rate limit exhausted for {model_to_use}, 10m cooldown set, trying next model...")
+                            break  # Exit retry loop, try next model
+                    else:
+                        # Non-rate-limit error - log and try next model
+                        logging.warning(f"Error on {model_to_use}: {e}, trying next model...")
+                        errors = self.model_errors.get(model_to_use, 0) + 1
+                        self.model_errors[model_to_use] = errors
+                        if errors >= self.ERROR_BREAKER_THRESHOLD:
+                            self.model_cooldowns[model_to_use] = time.time() + self.ERROR_BREAKER_COOLDOWN
+                            logging.warning(f"{model_to_use} failed {errors} times in a row - {self.ERROR_BREAKER_COOLDOWN}s cooldown set")
+                        break
+        
+        if not success:
+            # All models exhausted
+            raise last_error or Exception("All models rate limited")
+        
+        raw = response.choices[0].message.content.strip()
+        
+        # Log prompt cache usage
+        if hasattr(response, 'usage') and response.usage:
+            usage = response.usage
+            prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+            completion_tokens = getattr(usage, 'completion_tokens', 0)
+        
+            # Cached tokens: OpenAI/x.ai (and newer Groq) report them in prompt_tokens_details,
+            # older Groq responses put them under x_groq.usage
+            cached_tokens = 0
+            if hasattr(usage, 'prompt_tokens_details') and usage.prompt_tokens_details:
+                cached_tokens = getattr(usage.prompt_tokens_details, 'cached_tokens', 0) or 0
+            if not cached_tokens:
+                x_groq_usage = getattr(getattr(response, 'x_groq', None), 'usage', None)
+                cached_tokens = getattr(x_groq_usage, 'cached_tokens', 0) or 0
+        
+            self.prompt_tokens_total += prompt_tokens
+            self.cached_tokens_total += cached_tokens
+            total_pct = 100 * self.cached_tokens_total / self.prompt_tokens_total if self.prompt_tokens_total else 0
+        
+            if cached_tokens > 0:
+                cache_pct = 100 * cached_tokens / prompt_tokens if prompt_tokens > 0 else 0
+                logging.info(f"LLM USAGE: {prompt_tokens} prompt ({cached_tokens} cached = {cache_pct:.1f}%, overall {total_pct:.1f}%), {completion_tokens} completion")
+            else:
+                logging.debug("LLM USAGE: %s prompt (no cache, overall %.1f%%), %s completion", prompt_tokens, total_pct, completion_tokens)
+        
+        # Debug: log raw response
+        logging.debug("GROQ RAW RESPONSE: %s", raw)
+        
+        return raw
+    
+    def _parse_verdict(self, raw: str, detoxify_score: float) -> AnalysisResult:
+        """Parse a VERDICT:/REASON: response into an AnalysisResult"""
+        # Parse the plain text response
+        # Expected format:
+        # VERDICT: REPORT | BENIGN
+        # REASON: <short explanation>
+
+        verdict_match = _VERDICT_RE.search(raw)
+        if verdict_match:
+            verdict = Verdict.REPORT if 'REPORT' in verdict_match.group(1).upper() else Verdict.BENIGN
+        else:
+            # Fallback: look for REPORT or BENIGN anywhere in response
+            verdict = Verdict.REPORT if _REPORT_RE.search(raw) and not _BENIGN_RE.search(raw) else Verdict.BENIGN
+
+        reason_match = _REASON_RE.search(raw)
+        reason = reason_match.group(1) if reason_match else ""
+
+        # Safeguard: if reason is empty or invalid, use a default
+        if not reason or reason.upper() in ['REPORT', 'BENIGN', 'N/A', 'NONE']:
+            reason = "Flagged for moderator review" if verdict == Verdict.REPORT else "No issues detected"
+
+        return AnalysisResult(
+            verdict=verdict,
+            reason=reason,
+            confidence="high",  # Not used anymore but kept for compatibility
+            raw_response=raw,
+            detoxify_score=detoxify_score
+        )
+    
+    def analyze(self, text: str, subreddit: str, context_info: Dict[str, str] = None, 
+                detoxify_score: float = 0.0, is_top_level: bool = False, 
+                scores: Dict[str, float] = None, verdict_cache: bool = True) -> AnalysisResult:
+        """
+        Send to Groq for nuanced analysis.
+        An identical prompt (same comment, context and scores) in the same subreddit
+        reuses the cached verdict unless verdict_cache=False (e.g. to force re-analysis).
+        """
+        
+        user_prompt = self._build_user_prompt(text, context_info, is_top_level, scores)
+        cache_key = self._verdict_cache_key(subreddit, user_prompt)
+        if verdict_cache:
+            cached = self._verdict_cache.get(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                logging.info(f"LLM verdict cache hit: {cached.verdict.value} ({cached.reason[:60]})")
+                return replace(cached, detoxify_score=detoxify_score)
+            self.cache_misses += 1
+        
+        current_model = self._get_current_model()
 
-        # Debug: log what we're sending
-        logging.debug(f"GROQ SYSTEM PROMPT LENGTH: {len(system_prompt)} chars")
-        logging.debug(f"GROQ USER PROMPT: {user_prompt[:500]}")
-        logging.debug(f"GROQ MODEL: {current_model} (daily calls: {self.daily_calls}/{self.daily_limit})")
+        # Debug: log what we're sending (guarded so len()/slicing don't run when DEBUG is off)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("GROQ SYSTEM PROMPT LENGTH: %d chars", len(self.system_prompt))
+            logging.debug("GROQ USER PROMPT: %s", user_prompt[:500])
+            logging.debug("GROQ MODEL: %s (daily calls: %d/%d)", current_model, self.daily_calls, self.daily_limit)
 
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
         try:
-            # Wait if needed to respect our own rate limit
-            self._wait_for_rate_limit()
-            
-            self.api_calls += 1
-            self.daily_calls += 1
-            
-            # Start with configured model first, then fall through to fallback chain
-            models_to_try = [current_model]
-            for m in self.fallback_chain:
-                if m not in models_to_try:
-                    models_to_try.append(m)
-            
-            last_error = None
-            response = None
-            success = False
-            fallback_delay = 30  # seconds to wait between fallback models
-            
-            for model_idx, model_to_use in enumerate(models_to_try):
-                if success:
-                    break
-                
-                # Check if model is on cooldown
-                cooldown_until = self.model_cooldowns.get(model_to_use, 0)
-                if time.time() < cooldown_until:
-                    remaining = int(cooldown_until - time.time())
-                    logging.info(f"Skipping {model_to_use} - on cooldown for {remaining}s more")
-                    continue
-                
-                # Wait before trying fallback models (not for the first model)
-                if model_idx > 0:
-                    logging.info(f"Waiting {fallback_delay}s before trying fallback model...")
-                    time.sleep(fallback_delay)
-                    
-                # Retry logic for each model
-                max_retries = 2 if model_idx > 0 else 3  # Fewer retries for fallbacks
-                retry_delay = 3  # seconds
-                
-                logging.info(f"Trying model {model_idx + 1}/{len(models_to_try)}: {model_to_use}")
-                
-                # Check if this is an x.ai model and we have the client
-                is_xai = self._is_xai_model(model_to_use)
-                is_openai = self._is_openai_model(model_to_use)
-                
-                if is_xai and not self.xai_client:
-                    logging.warning(f"Skipping {model_to_use} - XAI_API_KEY not configured")
-                    continue
-                
-                if is_openai and not self.openai_client:
-                    logging.warning(f"Skipping {model_to_use} - OPENAI_API_KEY not configured for LLM")
-                    continue
-                
-                for attempt in range(max_retries):
-                    try:
-                        if is_xai:
-                            # x.ai API (OpenAI-compatible)
-                            # Use conv_id header to improve prompt caching across requests
-                            api_kwargs = {
-                                "model": model_to_use,
-                                "messages": [
-                                    {"role": "system", "content": system_prompt},
-                                    {"role": "user", "content": user_prompt}
-                                ],
-                                "max_tokens": 200,
-                                "temperature": 0.1,
-                                "extra_headers": {"x-grok-conv-id": self.xai_conv_id}
-                            }
-                            
-                            # Only grok-3-mini supports reasoning_effort parameter
-                            # grok-4 is always a reasoning model (no parameter needed)
-                            # grok-3 does not support reasoning_effort
-                            if "grok-3-mini" in model_to_use.lower():
-                                api_kwargs["extra_body"] = {"reasoning_effort": self.xai_reasoning_effort}
-                            
-                            response = self.xai_client.chat.completions.create(**api_kwargs)
-                            raw_response = None  # No rate limit headers for x.ai
-                        elif is_openai:
-                            # OpenAI API (GPT models)
-                            # Newer models (gpt-5, o1, o3) use max_completion_tokens instead of max_tokens
-                            model_lower = model_to_use.lower()
-                            use_new_param = any(x in model_lower for x in ['gpt-5', 'gpt-4.5', 'o1-', 'o3-'])
-                            
-                            api_kwargs = {
-                                "model": model_to_use,
-                                "messages": [
-                                    {"role": "system", "content": system_prompt},
-                                    {"role": "user", "content": user_prompt}
-                                ],
-                                "temperature": 0.1,
-                            }
-                            
-                            if use_new_param:
-                                api_kwargs["max_completion_tokens"] = 200
-                            else:
-                                api_kwargs["max_tokens"] = 200
-                            
-                            response = self.openai_client.chat.completions.create(**api_kwargs)
-                            raw_response = None  # Handle rate limits via exceptions
-                        else:
-                            # Groq API - use with_raw_response to get rate limit headers
-                            groq_kwargs = {
-                                "model": model_to_use,
-                                "messages": [
-                                    {"role": "system", "content": system_prompt},
-                                    {"role": "user", "content": user_prompt}
-                                ],
-                                "max_tokens": 200,
-                                "temperature": 0.1,  # Low temp for consistent classification
-                            }
-                            
-                            # Add reasoning parameters for models that support it
-                            model_lower = model_to_use.lower()
-                            if "qwen3" in model_lower or "qwen/qwen3" in model_lower:
-                                # Qwen3 uses reasoning_format, always reasons by default
-                                groq_kwargs["reasoning_format"] = "hidden"  # Don't show <think> tags
-                            elif "gpt-oss" in model_lower or "openai/gpt-oss" in model_lower:
-                                # GPT-OSS supports reasoning_effort (low/medium/high)
-                                groq_kwargs["reasoning_effort"] = self.groq_reasoning_effort
-                            elif "deepseek-r1" in model_lower:
-                                # DeepSeek R1 always reasons, hide the output
-                                groq_kwargs["reasoning_format"] = "hidden"
-                            
-                            raw_response = self.groq_client.chat.completions.with_raw_response.create(**groq_kwargs)
-                            response = raw_response.parse()
-                        
-                        if model_to_use != models_to_try[0]:
-                            logging.info(f"Successfully used fallback model: {model_to_use}")
-                        # Clear any cooldown on success
-                        if model_to_use in self.model_cooldowns:
-                            del self.model_cooldowns[model_to_use]
-                        
-                        # Check rate limit headers from response (Groq only)
-                        if raw_response and hasattr(raw_response, 'headers'):
-                            self._check_rate_limit_headers(model_to_use, raw_response.headers)
-                        
-                        success = True
-                        break  # Success - exit retry loop
-                        
-                    except Exception as e:
-                        error_str = str(e)
-                        last_error = e
-                        if "429" in error_str or "rate_limit" in error_str.lower():
-                            # Log full error for debugging
-                            logging.debug(f"Full rate limit error: {error_str}")
-                            
-                            # Check if daily limit is fully exhausted (Used == Limit)
-                            daily_exhausted = False
-                            import re
-                            rpd_match = re.search(r'Limit (\d+), Used (\d+)', error_str)
-                            if rpd_match:
-                                limit = int(rpd_match.group(1))
-                                used = int(rpd_match.group(2))
-                                if used >= limit:
-                                    daily_exhausted = True
-                                    logging.warning(f"⚠️ {model_to_use} daily limit EXHAUSTED ({used}/{limit} RPD)")
-                            
-                            # Try to get retry-after from exception response headers first
-                            suggested_wait = None
-                            if hasattr(e, 'response') and hasattr(e.response, 'headers'):
-                                retry_after = e.response.headers.get('retry-after')
-                                if retry_after:
-                                    try:
-                                        suggested_wait = float(retry_after)
-                                        logging.debug(f"Got retry-after header: {suggested_wait}s")
-                                    except (ValueError, TypeError):
-                                        pass
-                            
-                            # Fall back to parsing error message
-                            if not suggested_wait:
-                                suggested_wait = self._parse_retry_time(error_str)
-                                if suggested_wait:
-                                    logging.debug(f"Parsed wait time from message: {suggested_wait:.0f}s")
-                            
-                            if not suggested_wait:
-                                logging.debug(f"Could not parse wait time from error")
-                            
-                            # If daily limit exhausted, set 1 hour cooldown regardless of retry-after
-                            if daily_exhausted:
-                                cooldown_time = 3600  # 1 hour
-                                self.model_cooldowns[model_to_use] = time.time() + cooldown_time
-                                logging.warning(f"Rate limited on {model_to_use} - daily limit exhausted, 1h cooldown set, trying next model...")
-                                break  # Exit retry loop, try next model
-                            # If wait time is short (< 30s), wait and retry same model
-                            elif suggested_wait and suggested_wait <= 30 and attempt < max_retries - 1:
-                                logging.warning(f"Rate limited on {model_to_use}, waiting {suggested_wait:.0f}s (from API) before retry {attempt + 2}/{max_retries}")
-                                time.sleep(suggested_wait)
-                                continue
-                            elif suggested_wait and suggested_wait > 30:
-                                # Set cooldown - minimum 120s, plus 60s buffer on top of API time
-                                # Cap at 1 hour - if longer, we'll just retry and get a fresh wait time
-                                cooldown_time = min(max(suggested_wait + 60, 120), 3600)
-                                self.model_cooldowns[model_to_use] = time.time() + cooldown_time
-                                logging.warning(f"Rate limited on {model_to_use} for {suggested_wait:.0f}s - {cooldown_time:.0f}s cooldown set, trying next model...")
-                                break  # Exit retry loop, try next model
-                            elif attempt < max_retries - 1:
-                                wait_time = retry_delay * (attempt + 1)
-                                logging.warning(f"Rate limited on {model_to_use}, waiting {wait_time}s before retry {attempt + 2}/{max_retries}")
-                                time.sleep(wait_time)
-                                continue
-                            else:
-                                # Out of retries for this model, set longer cooldown (10 min)
-                                # since we couldn't parse the wait time
-                                self.model_cooldowns[model_to_use] = time.time() + 600
-                                logging.warning(f"Rate limit exhausted for {model_to_use}, 10m cooldown set, trying next model...")
-                                break  # Exit retry loop, try next model
-                        else:
-                            # Non-rate-limit error - log and try next model
-                            logging.warning(f"Error on {model_to_use}: {e}, trying next model...")
-                            break
-            
-            if not success:
-                # All models exhausted
-                raise last_error or Exception("All models rate limited")
-            
-            raw = response.choices[0].message.content.strip()
-            
-            # Log cache usage for x.ai requests
-            if hasattr(response, 'usage') and response.usage:
-                usage = response.usage
-                prompt_tokens = getattr(usage, 'prompt_tokens', 0)
-                completion_tokens = getattr(usage, 'completion_tokens', 0)
-                
-                # Check for cached tokens (x.ai specific)
-                cached_tokens = 0
-                if hasattr(usage, 'prompt_tokens_details') and usage.prompt_tokens_details:
-                    cached_tokens = getattr(usage.prompt_tokens_details, 'cached_tokens', 0)
-                
-                if cached_tokens > 0:
-                    cache_pct = 100 * cached_tokens / prompt_tokens if prompt_tokens > 0 else 0
-                    logging.info(f"LLM USAGE: {prompt_tokens} prompt ({cached_tokens} cached = {cache_pct:.1f}%), {completion_tokens} completion")
-                else:
-                    logging.debug(f"LLM USAGE: {prompt_tokens} prompt (no cache), {completion_tokens} completion")
-            
-            # Debug: log raw response
-            logging.debug(f"GROQ RAW RESPONSE: {raw}")
-            
-            # Parse the plain text response
-            # Expected format:
-            # VERDICT: REPORT | BENIGN
-            # REASON: <short explanation>
-            
-            verdict = Verdict.BENIGN  # Default
-            reason = ""
-            
-            # Normalize the response - handle variations in formatting
-            raw_upper = raw.upper()
-            
-            # Look for verdict
-            if 'VERDICT:' in raw_upper or 'VERDICT :' in raw_upper:
-                for line in raw.split('\n'):
-                    line_stripped = line.strip()
-                    line_upper = line_stripped.upper()
-                    if line_upper.startswith('VERDICT'):
-                        # Extract the verdict value
-                        parts = line_stripped.split(':', 1)
-                        if len(parts) > 1:
-                            verdict_str = parts[1].strip().upper()
-                            if 'REPORT' in verdict_str:
-                                verdict = Verdict.REPORT
-                            else:
-                                verdict = Verdict.BENIGN
-                    elif line_upper.startswith('REASON'):
-                        parts = line_stripped.split(':', 1)
-                        if len(parts) > 1:
-                            reason = parts[1].strip()
-            else:
-                # Fallback: look for REPORT or BENIGN anywhere in response
-                if 'REPORT' in raw_upper and 'BENIGN' not in raw_upper:
-                    verdict = Verdict.REPORT
-                else:
-                    verdict = Verdict.BENIGN
-            
-            # Safeguard: if reason is empty or invalid, use a default
-            if not reason or reason.upper() in ['REPORT', 'BENIGN', 'N/A', 'NONE']:
-                reason = "Flagged for moderator review" if verdict == Verdict.REPORT else "No issues detected"
-            
-            return AnalysisResult(
-                verdict=verdict,
-                reason=reason,
-                confidence="high",  # Not used anymore but kept for compatibility
-                raw_response=raw,
-                detoxify_score=detoxify_score
-            )
+            raw = self._complete(messages, subreddit, current_model)
+            result = self._parse_verdict(raw, detoxify_score)
+            # Only real LLM verdicts are cached - the "LLM unavailable" fallback below is not
+            self._verdict_cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             logging.error(f"LLM analysis failed after trying all models: {e}")
@@ -3050,10 +3697,93 @@ class LLMAnalyzer:
                 detoxify_score=detoxify_score
             )
     
+    def analyze_batch(self, items: List[Dict[str, Any]]) -> List[AnalysisResult]:
+        """
+        Analyze several escalated comments with one LLM call.
+        Each item holds analyze()'s arguments (text, subreddit, context_info,
+        detoxify_score, is_top_level, scores). Cached verdicts are reused; if
+        the batched response can't be matched up to every comment, each one
+        falls back to its own analyze() call.
+        """
+        results: List[Optional[AnalysisResult]] = [None] * len(items)
+        pending = []
+        user_prompts = [self._build_user_prompt(item["text"], item["context_info"], item["is_top_level"], item["scores"])
+                        for item in items]
+        cache_keys = [self._verdict_cache_key(item["subreddit"], p) for item, p in zip(items, user_prompts)]
+        for i, item in enumerate(items):
+            cached = self._verdict_cache.get(cache_keys[i])
+            if cached is not None:
+                self.cache_hits += 1
+                logging.info(f"LLM verdict cache hit: {cached.verdict.value} ({cached.reason[:60]})")
+                results[i] = replace(cached, detoxify_score=item["detoxify_score"])
+            else:
+                pending.append(i)
+        
+        if len(pending) <= 1:
+            for i in pending:
+                results[i] = self.analyze(**items[i])
+            return results
+        
+        current_model = self._get_current_model()
+        sections = [f"You are reviewing {len(pending)} separate comments. Judge each one independently.\n"
+                    f"Answer with one block per comment, in order, in exactly this format:\n"
+                    f"COMMENT <number>\nVERDICT: REPORT or BENIGN\nREASON: <short explanation>"]
+        for n, i in enumerate(pending, 1):
+            sections.append(f"=== COMMENT {n} ===\n{user_prompts[i]}")
+        user_prompt = "\n\n".join(sections)
+        
+        logging.info(f"LLM batch: {len(pending)} comments in one request")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("GROQ BATCH USER PROMPT: %s", user_prompt[:500])
+        
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        try:
+            raw = self._complete(messages, items[pending[0]]["subreddit"], current_model)
+        except Exception as e:
+            logging.error(f"LLM batch analysis failed after trying all models: {e}")
+            self.cache_misses += len(pending)
+            for i in pending:
+                detoxify_score = items[i]["detoxify_score"]
+                if detoxify_score >= 0.7:
+                    logging.warning(f"⚠️ HIGH DETOXIFY SCORE ({detoxify_score:.2f}) but LLM unavailable - SKIPPING (not reporting)")
+                results[i] = AnalysisResult(
+                    verdict=Verdict.BENIGN,
+                    reason=f"LLM unavailable - skipped (detox={detoxify_score:.2f})",
+                    confidence="low",
+                    raw_response="",
+                    detoxify_score=detoxify_score
+                )
+            return results
+        
+        # Split the response at each "COMMENT <n>" header; every comment needs its own verdict
+        blocks: Dict[int, str] = {}
+        headers = list(_BATCH_HEADER_RE.finditer(raw))
+        for h, nxt in zip(headers, headers[1:] + [None]):
+            blocks.setdefault(int(h.group(1)), raw[h.end():nxt.start() if nxt else len(raw)])
+        if sorted(blocks) != list(range(1, len(pending) + 1)) or \
+                not all(_VERDICT_RE.search(b) for b in blocks.values()):
+            logging.warning(f"LLM batch response didn't cover all {len(pending)} comments - analyzing individually")
+            for i in pending:
+                results[i] = self.analyze(**items[i])
+            return results
+        
+        self.cache_misses += len(pending)
+        for n, i in enumerate(pending, 1):
+            item = items[i]
+            result = self._parse_verdict(blocks[n].strip(), item["detoxify_score"])
+            self._verdict_cache.put(cache_keys[i], result)
+            results[i] = result
+        return results
+    
     def get_stats(self) -> str:
         cooldowns = [m for m, t in self.model_cooldowns.items() if time.time() < t]
         cooldown_str = f", {len(cooldowns)} models on cooldown" if cooldowns else ""
-        return f"LLM API calls: {self.api_calls} (today: {self.daily_calls}, primary: {self.primary_model}{cooldown_str})"
+        cache_str = f", verdict cache: {self.cache_hits} hits/{self.cache_misses} misses" if self.cache_hits else ""
+        return f"LLM API calls: {self.api_calls} (today: {self.daily_calls}, primary: {self.primary_model}{cooldown_str}{cache_str})"
 
 
 # -------------------------------
@@ -3061,35 +3791,144 @@ class LLMAnalyzer:
 # -------------------------------
 
 FALSE_POSITIVES_FILE = "false_positives.json"
+FALSE_POSITIVES_LOG = "false_positives.jsonl"  # Append-only, folded into FALSE_POSITIVES_FILE on compaction
+REDDIT_INFO_BATCH_SIZE = 100  # Max fullnames per reddit.info() request
+REDDIT_INFO_RETRIES = 2  # Retries per reddit.info() batch on 429/5xx or network errors (2s, then 4s)
+REDDIT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+REDDIT_SWEEP_MIN_REMAINING = 10  # Background sweeps pause below this many requests left in the window
+
+
+def _wait_for_reddit_quota(reddit: praw.Reddit, min_remaining: int = REDDIT_SWEEP_MIN_REMAINING) -> None:
+    """
+    Sleep until Reddit's rate-limit window resets if the remaining request
+    budget (from the X-Ratelimit-* headers praw tracks) is nearly spent, so
+    background sweeps leave headroom for the comment stream.
+    """
+    limits = getattr(reddit.auth, "limits", None) or {}
+    remaining = limits.get("remaining")
+    reset_at = limits.get("reset_timestamp")
+    if remaining is None or reset_at is None or remaining >= min_remaining:
+        return
+    wait = min(max(reset_at - time.time(), 0), 600)
+    if wait > 0:
+        logging.info(f"Reddit rate limit low ({remaining:.0f} left), pausing sweep {wait:.0f}s")
+        time.sleep(wait)
+
+def _tracked_fullname(comment_id: str) -> str:
+    """Fullname for a tracked comment_id (bare ids are comments)"""
+    return comment_id if comment_id.startswith(("t1_", "t3_")) else f"t1_{comment_id}"
+
+
+def fetch_info_batches(reddit: praw.Reddit, fullnames: List[str], delay: float = 0.0):
+    """
+    Fetch things with reddit.info(), up to REDDIT_INFO_BATCH_SIZE per request.
+    Yields (batch, {fullname: thing}) per request, or (batch, None) if it failed.
+    Fullnames missing from the dict weren't returned (deleted/removed).
+    """
+    for i in range(0, len(fullnames), REDDIT_INFO_BATCH_SIZE):
+        batch = fullnames[i:i + REDDIT_INFO_BATCH_SIZE]
+        if delay > 0 and i > 0:
+            time.sleep(delay)
+        fetched = None
+        for attempt in range(REDDIT_INFO_RETRIES + 1):
+            _wait_for_reddit_quota(reddit)
+            try:
+                fetched = {thing.fullname: thing for thing in reddit.info(fullnames=batch)}
+                break
+            except prawcore.exceptions.ResponseException as e:
+                # Includes TooManyRequests/ServerError - worth retrying, other statuses aren't
+                status = e.response.status_code
+                if status in REDDIT_RETRY_STATUSES and attempt < REDDIT_INFO_RETRIES:
+                    wait = 2 ** (attempt + 1)
+                    logging.warning(f"Reddit returned {status} checking {len(batch)} comments, retrying in {wait}s")
+                    time.sleep(wait)
+                    continue
+                logging.warning(f"Reddit returned {status} checking {len(batch)} comments: {e}")
+            except prawcore.exceptions.RequestException as e:
+                # Connection/timeout errors - the request never got an answer
+                if attempt < REDDIT_INFO_RETRIES:
+                    wait = 2 ** (attempt + 1)
+                    logging.warning(f"Network error checking {len(batch)} comments, retrying in {wait}s: {e}")
+                    time.sleep(wait)
+                    continue
+                logging.warning(f"Network error checking {len(batch)} comments: {e}")
+            except Exception as e:
+                logging.warning(f"Error checking {len(batch)} comments: {e}")
+            break
+        yield batch, fetched
+
+
+def _build_discord_session() -> requests.Session:
+    """
+    Shared HTTP session for Discord so bursts of notifications reuse one
+    keep-alive TLS connection. Only retries what Discord has definitely not
+    acted on: connect errors, 429 (honouring Retry-After) and 503. A 500/502/504
+    or read error may come after the message was already posted, so those are
+    never retried.
+    """
+    retry = Retry(
+        total=2,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 503],
+        allowed_methods=frozenset({"POST", "PATCH"}),
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    return session
+
+
+_DISCORD_SESSION = _build_discord_session()
+
+
+def _truncate_for_code_block(text: str, limit: int) -> str:
+    """
+    Truncate text (adding "...") for display inside a Discord ```code block```.
+    Every backtick is followed by a zero-width space, so no run of any length
+    can close the fence early or merge with it. The limit applies after
+    escaping, so a backtick-heavy comment can't overflow Discord's field limits.
+    """
+    if '`' in text:
+        text = text.replace("`", "`\u200b")
+        if text.startswith('`'):
+            text = "\u200b" + text
+    if len(text) > limit:
+        text = text[:limit].rstrip('`') + "..."
+    return text
+
+
+_CODE_FENCE = "```"
+
+
+def _code_block(text: str, limit: int) -> str:
+    """text truncated to limit and wrapped in a Discord code block"""
+    return _CODE_FENCE + _truncate_for_code_block(text, limit) + _CODE_FENCE
+
 
 def post_discord(webhook: str, content: str) -> None:
     """Post a simple text message to Discord"""
     if not webhook:
         return
-    data = json.dumps({"content": content}).encode("utf-8")
-    req = urllib.request.Request(
-        webhook,
-        data=data,
-        headers={
-            "Content-Type": "application/json",
-            "User-Agent": "ToxicReportBot/2.0"
-        },
-        method="POST",
-    )
+    data = json_bytes({"content": content})
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            _ = resp.read()
+        resp = _DISCORD_SESSION.post(
+            webhook,
+            data=data,
+            headers={
+                "Content-Type": "application/json",
+                "User-Agent": "ToxicReportBot/2.0"
+            },
+            timeout=10,
+        )
+        resp.raise_for_status()
     except Exception as e:
         logging.warning(f"Discord post failed: {e}")
 
 
-def post_discord_embed(webhook: str, title: str, description: str, 
-                       color: int = 0xFF0000, fields: List[Dict] = None,
-                       url: str = None, footer: str = None) -> bool:
-    """Post a rich embed message to Discord. Returns True on success."""
-    if not webhook:
-        return False
-    
+def build_discord_embed(title: str, description: str, color: int = 0xFF0000,
+                        fields: List[Dict] = None, url: str = None, footer: str = None) -> Dict:
+    """Build a Discord embed dict, truncated to Discord's limits"""
     embed = {
         "title": title[:256],  # Discord limit
         "description": description[:4096],  # Discord limit
@@ -3115,38 +3954,145 @@ def post_discord_embed(webhook: str, title: str, description: str,
         if valid_fields:
             embed["fields"] = valid_fields
     
-    embed["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-    
-    payload = {"embeds": [embed]}
-    data = json.dumps(payload).encode("utf-8")
+    embed["timestamp"] = _iso_now()
+    return embed
+
+
+def send_discord_embeds(webhook: str, embeds: List[Dict]) -> bool:
+    """POST one or more embeds (max 10) as a single webhook message. Returns True on success."""
+    data = json_bytes({"embeds": embeds})
     
-    req = urllib.request.Request(
-        webhook,
-        data=data,
-        headers={
-            "Content-Type": "application/json",
-            "User-Agent": "ToxicReportBot/2.0"
-        },
-        method="POST",
-    )
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            _ = resp.read()
+        resp = _DISCORD_SESSION.post(
+            webhook,
+            data=data,
+            headers={
+                "Content-Type": "application/json",
+                "User-Agent": "ToxicReportBot/2.0"
+            },
+            timeout=10,
+        )
+        if resp.status_code >= 400:
+            # Include error response for debugging
+            logging.warning(f"Discord embed post failed: HTTP {resp.status_code} - {resp.text}")
+            return False
         return True
-    except urllib.error.HTTPError as e:
-        # Read error response for debugging
-        error_body = ""
-        try:
-            error_body = e.read().decode('utf-8')
-        except:
-            pass
-        logging.warning(f"Discord embed post failed: {e} - {error_body}")
-        return False
     except Exception as e:
         logging.warning(f"Discord embed post failed: {e}")
         return False
 
 
+def post_discord_embed(webhook: str, title: str, description: str, 
+                       color: int = 0xFF0000, fields: List[Dict] = None,
+                       url: str = None, footer: str = None) -> bool:
+    """Post a rich embed message to Discord. Returns True on success."""
+    if not webhook:
+        return False
+    return send_discord_embeds(webhook, [build_discord_embed(title, description, color, fields, url, footer)])
+
+
+# Per-comment notifications are queued and sent by a background worker so the
+# processing loop never waits on Discord. Embeds for the same webhook that
+# arrive close together are combined into one message. Other Discord calls
+# (e.g. bot API review posts) can be queued as tasks with submit_discord_task.
+DISCORD_MAX_EMBEDS_PER_MESSAGE = 10  # Discord limit
+DISCORD_MAX_EMBED_CHARS_PER_MESSAGE = 6000  # Discord limit, summed over all embeds
+DISCORD_BATCH_WAIT = 0.25  # Seconds to wait for more embeds before sending
+DISCORD_QUEUE_MAX = 1024  # Notifications beyond this are dropped rather than blocking
+
+# Items are (webhook, embed) or (None, (func, kwargs)) for queued tasks
+_discord_queue: "queue.Queue[Tuple[Optional[str], Any]]" = queue.Queue(maxsize=DISCORD_QUEUE_MAX)
+_discord_worker_lock = threading.Lock()
+_discord_worker_started = False
+_discord_dropped = 0
+
+
+def _discord_embed_chars(embed: Dict) -> int:
+    """Characters Discord counts toward the per-message embed limit"""
+    total = len(embed.get("title", "")) + len(embed.get("description", ""))
+    total += len(embed.get("footer", {}).get("text", ""))
+    for f in embed.get("fields", ()):
+        total += len(f["name"]) + len(f["value"])
+    return total
+
+
+def _discord_worker() -> None:
+    """Drain the notification queue, combining nearby embeds per webhook"""
+    while True:
+        batch = [_discord_queue.get()]
+        while len(batch) < DISCORD_MAX_EMBEDS_PER_MESSAGE:
+            try:
+                batch.append(_discord_queue.get(timeout=DISCORD_BATCH_WAIT))
+            except queue.Empty:
+                break
+        
+        by_webhook: Dict[str, List[Dict]] = {}
+        tasks = []
+        for webhook, item in batch:
+            if webhook is None:
+                tasks.append(item)
+            else:
+                by_webhook.setdefault(webhook, []).append(item)
+        
+        for webhook, embeds in by_webhook.items():
+            chunk, chunk_chars = [], 0
+            for embed in embeds:
+                embed_chars = _discord_embed_chars(embed)
+                if chunk and chunk_chars + embed_chars > DISCORD_MAX_EMBED_CHARS_PER_MESSAGE:
+                    send_discord_embeds(webhook, chunk)
+                    chunk, chunk_chars = [], 0
+                chunk.append(embed)
+                chunk_chars += embed_chars
+            if chunk:
+                send_discord_embeds(webhook, chunk)
+        
+        for func, kwargs in tasks:
+            try:
+                func(**kwargs)
+            except Exception as e:
+                logging.warning(f"Queued Discord task {func.__name__} failed: {e}")
+        
+        for _ in batch:
+            _discord_queue.task_done()
+
+
+def _enqueue_discord(item: Tuple[Optional[str], Any]) -> None:
+    """Put an item on the Discord queue (starting the worker on first use), dropping it if full"""
+    global _discord_worker_started, _discord_dropped
+    if not _discord_worker_started:
+        with _discord_worker_lock:
+            if not _discord_worker_started:
+                threading.Thread(target=_discord_worker, name="discord-notify", daemon=True).start()
+                _discord_worker_started = True
+    
+    try:
+        _discord_queue.put_nowait(item)
+    except queue.Full:
+        _discord_dropped += 1
+        logging.warning(f"Discord queue full - dropped notification ({_discord_dropped} dropped so far)")
+
+
+def queue_discord_embed(webhook: str, title: str, description: str,
+                        color: int = 0xFF0000, fields: List[Dict] = None,
+                        url: str = None, footer: str = None) -> None:
+    """Queue a rich embed for the background Discord worker (non-blocking)"""
+    if not webhook:
+        return
+    _enqueue_discord((webhook, build_discord_embed(title, description, color, fields, url, footer)))
+
+
+def submit_discord_task(func, **kwargs) -> None:
+    """Run func(**kwargs) on the background Discord worker (non-blocking)"""
+    _enqueue_discord((None, (func, kwargs)))
+
+
+def flush_discord_queue(timeout: float = 10.0) -> None:
+    """Wait (up to timeout seconds) for queued Discord notifications to be sent"""
+    deadline = time.time() + timeout
+    while _discord_queue.unfinished_tasks and time.time() < deadline:
+        time.sleep(0.1)
+
+
 def notify_discord_report(webhook: str, comment_text: str, permalink: str, 
                           reason: str, detoxify_score: float) -> None:
     """Send a Discord notification when a comment is reported"""
@@ -3154,14 +4100,14 @@ def notify_discord_report(webhook: str, comment_text: str, permalink: str,
         return
     
     # Truncate comment for Discord (keep under embed limit)
-    truncated = comment_text[:1500] + "..." if len(comment_text) > 1500 else comment_text
+    truncated = _truncate_for_code_block(comment_text, 1500)
     
     fields = [
         {"name": "Reason", "value": reason[:1024], "inline": True},
         {"name": "Detoxify Score", "value": f"{detoxify_score:.2f}", "inline": True},
     ]
     
-    post_discord_embed(
+    queue_discord_embed(
         webhook=webhook,
         title="🚨 Comment Reported",
         description=f"```{truncated}```",
@@ -3171,6 +4117,36 @@ def notify_discord_report(webhook: str, comment_text: str, permalink: str,
     )
 
 
+def format_max_scores(scores: Dict[str, float]) -> str:
+    """
+    One-line summary of the top score per model, e.g.
+    "Detoxify: 0.91 | OpenAI: 0.88 (harassment) | Perspective: 0.79 (INSULT)".
+    """
+    # Max score and top category per model, in one pass over the scores
+    best = {"detox": None, "openai": None, "persp": None}  # (score, category)
+    for k, v in (scores or {}).items():
+        if not isinstance(v, (int, float)) or k.startswith('_'):
+            continue
+        if k.startswith('openai_'):
+            ns, cat = "openai", k[7:]
+        elif k.startswith('perspective_'):
+            ns, cat = "persp", k[12:]
+        else:
+            ns, cat = "detox", k
+        if best[ns] is None or v > best[ns][0]:
+            best[ns] = (v, cat)
+    
+    score_parts = []
+    if best["detox"]:
+        score_parts.append(f"Detoxify: {best['detox'][0]:.2f}")
+    if best["openai"]:
+        score_parts.append(f"OpenAI: {best['openai'][0]:.2f} ({best['openai'][1]})")
+    if best["persp"]:
+        score_parts.append(f"Perspective: {best['persp'][0]:.2f} ({best['persp'][1]})")
+    
+    return " | ".join(score_parts) if score_parts else "N/A"
+
+
 def notify_discord_auto_remove(webhook: str, comment_text: str, permalink: str,
                                 reason: str, scores: Dict[str, float], 
                                 auto_remove_reason: str) -> None:
@@ -3179,35 +4155,10 @@ def notify_discord_auto_remove(webhook: str, comment_text: str, permalink: str,
         return
     
     # Truncate comment for Discord
-    truncated = comment_text[:1500] + "..." if len(comment_text) > 1500 else comment_text
+    truncated = _truncate_for_code_block(comment_text, 1500)
     
     # Build scores summary
-    score_parts = []
-    
-    # Detoxify max score
-    detox_scores = {k: v for k, v in scores.items() 
-                  if not k.startswith(('openai_', 'perspective_', '_')) and isinstance(v, (int, float))}
-    if detox_scores:
-        max_detox = max(detox_scores.values())
-        score_parts.append(f"Detoxify: {max_detox:.2f}")
-    
-    # OpenAI max score
-    openai_scores = {k.replace('openai_', ''): v for k, v in scores.items() 
-                    if k.startswith('openai_') and isinstance(v, (int, float))}
-    if openai_scores:
-        max_openai = max(openai_scores.values())
-        top_cat = max(openai_scores, key=openai_scores.get)
-        score_parts.append(f"OpenAI: {max_openai:.2f} ({top_cat})")
-    
-    # Perspective max score
-    persp_scores = {k.replace('perspective_', ''): v for k, v in scores.items() 
-                   if k.startswith('perspective_') and isinstance(v, (int, float))}
-    if persp_scores:
-        max_persp = max(persp_scores.values())
-        top_cat = max(persp_scores, key=persp_scores.get)
-        score_parts.append(f"Perspective: {max_persp:.2f} ({top_cat})")
-    
-    scores_display = " | ".join(score_parts) if score_parts else "N/A"
+    scores_display = format_max_scores(scores)
     
     fields = [
         {"name": "Reason", "value": reason[:1024], "inline": False},
@@ -3215,7 +4166,7 @@ def notify_discord_auto_remove(webhook: str, comment_text: str, permalink: str,
         {"name": "Auto-Remove Trigger", "value": f"`{auto_remove_reason}`", "inline": False},
     ]
     
-    post_discord_embed(
+    queue_discord_embed(
         webhook=webhook,
         title="🚫 REMOVED - Please Review",
         description=f"```{truncated}```",
@@ -3233,7 +4184,7 @@ def notify_discord_llm_analysis(webhook: str, comment_text: str, permalink: str,
         return
     
     # Truncate comment for Discord
-    truncated = comment_text[:800] + "..." if len(comment_text) > 800 else comment_text
+    truncated = _truncate_for_code_block(comment_text, 800)
     
     fields = [
         {"name": "Subreddit", "value": f"r/{subreddit}", "inline": True},
@@ -3246,7 +4197,7 @@ def notify_discord_llm_analysis(webhook: str, comment_text: str, permalink: str,
         reasons_display = trigger_reasons[:200] + "..." if len(trigger_reasons) > 200 else trigger_reasons
         fields.append({"name": "Triggered By", "value": f"`{reasons_display}`", "inline": False})
     
-    post_discord_embed(
+    queue_discord_embed(
         webhook=webhook,
         title="🔍 Analyzing Comment",
         description=f"```{truncated}```",
@@ -3269,7 +4220,7 @@ def notify_discord_verdict(webhook: str, verdict: str, reason: str,
         color = 0x44FF44  # Green
         emoji = "✅"
     
-    post_discord_embed(
+    queue_discord_embed(
         webhook=webhook,
         title=f"{emoji} Verdict: {verdict}",
         description=f"**Reason:** {reason}",
@@ -3285,7 +4236,7 @@ def notify_discord_borderline_skip(webhook: str, comment_text: str, permalink: s
         return
     
     # Truncate comment for Discord
-    truncated = comment_text[:800] + "..." if len(comment_text) > 800 else comment_text
+    truncated = _truncate_for_code_block(comment_text, 800)
     
     fields = [
         {"name": "Subreddit", "value": f"r/{subreddit}", "inline": True},
@@ -3293,7 +4244,7 @@ def notify_discord_borderline_skip(webhook: str, comment_text: str, permalink: s
         {"name": "Status", "value": "Skipped (below threshold)", "inline": True},
     ]
     
-    post_discord_embed(
+    queue_discord_embed(
         webhook=webhook,
         title="⚪ Borderline Skip",
         description=f"```{truncated}```",
@@ -3453,8 +4404,8 @@ def notify_discord_daily_stats(webhook: str, stats: Dict) -> None:
 def load_pending_reviews() -> List[Dict]:
     """Load pending review notifications from JSON file"""
     try:
-        with open(PENDING_REVIEWS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(PENDING_REVIEWS_FILE, "rb") as f:
+            return json_loads(f.read())
     except FileNotFoundError:
         return []
     except json.JSONDecodeError:
@@ -3464,8 +4415,7 @@ def load_pending_reviews() -> List[Dict]:
 
 def save_pending_reviews(reviews: List[Dict]) -> None:
     """Save pending review notifications to JSON file"""
-    with open(PENDING_REVIEWS_FILE, "w", encoding="utf-8") as f:
-        json.dump(reviews, f, indent=2)
+    write_json_file(PENDING_REVIEWS_FILE, reviews)
 
 
 def add_pending_review(comment_id: str, discord_message_id: str, permalink: str, 
@@ -3480,7 +4430,7 @@ def add_pending_review(comment_id: str, discord_message_id: str, permalink: str,
         "comment_text": comment_text[:500],  # Truncate for storage
         "reason": reason,
         "auto_remove_reason": auto_remove_reason,
-        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "created_at": _iso_now(),
         "scores": {k: v for k, v in scores.items() if isinstance(v, (int, float))}
     })
     save_pending_reviews(reviews)
@@ -3504,35 +4454,10 @@ def discord_bot_post_review(cfg: Config, comment_text: str, permalink: str,
         return None
     
     # Truncate comment for Discord
-    truncated = comment_text[:1500] + "..." if len(comment_text) > 1500 else comment_text
+    truncated = _truncate_for_code_block(comment_text, 1500)
     
     # Build scores summary
-    score_parts = []
-    
-    # Detoxify max score
-    detox_scores = {k: v for k, v in scores.items() 
-                  if not k.startswith(('openai_', 'perspective_', '_')) and isinstance(v, (int, float))}
-    if detox_scores:
-        max_detox = max(detox_scores.values())
-        score_parts.append(f"Detoxify: {max_detox:.2f}")
-    
-    # OpenAI max score
-    openai_scores = {k.replace('openai_', ''): v for k, v in scores.items() 
-                    if k.startswith('openai_') and isinstance(v, (int, float))}
-    if openai_scores:
-        max_openai = max(openai_scores.values())
-        top_cat = max(openai_scores, key=openai_scores.get)
-        score_parts.append(f"OpenAI: {max_openai:.2f} ({top_cat})")
-    
-    # Perspective max score
-    persp_scores = {k.replace('perspective_', ''): v for k, v in scores.items() 
-                   if k.startswith('perspective_') and isinstance(v, (int, float))}
-    if persp_scores:
-        max_persp = max(persp_scores.values())
-        top_cat = max(persp_scores, key=persp_scores.get)
-        score_parts.append(f"Perspective: {max_persp:.2f} ({top_cat})")
-    
-    scores_display = " | ".join(score_parts) if score_parts else "N/A"
+    scores_display = format_max_scores(scores)
     
     # Build embed
     embed = {
@@ -3547,29 +4472,28 @@ def discord_bot_post_review(cfg: Config, comment_text: str, permalink: str,
             {"name": "⚡ Trigger", "value": f"`{auto_remove_reason}`", "inline": False},
         ],
         "footer": {"text": "Bot will update this message when reviewed"},
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        "timestamp": _iso_now()
     }
     
-    payload = json.dumps({"embeds": [embed]}).encode("utf-8")
+    payload = json_bytes({"embeds": [embed]})
     
     url = f"https://discord.com/api/v10/channels/{cfg.discord_review_channel_id}/messages"
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bot {cfg.discord_bot_token}",
-            "User-Agent": "ToxicReportBot/1.0"
-        },
-        method="POST"
-    )
     
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            response_data = json.loads(resp.read().decode("utf-8"))
-            message_id = response_data.get("id")
-            logging.info(f"Discord review notification posted (message_id: {message_id})")
-            return message_id
+        resp = _DISCORD_SESSION.post(
+            url,
+            data=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bot {cfg.discord_bot_token}",
+                "User-Agent": "ToxicReportBot/1.0"
+            },
+            timeout=10,
+        )
+        resp.raise_for_status()
+        message_id = resp.json().get("id")
+        logging.info(f"Discord review notification posted (message_id: {message_id})")
+        return message_id
     except Exception as e:
         logging.error(f"Failed to post Discord review notification: {e}")
         return None
@@ -3585,7 +4509,7 @@ def discord_bot_update_review(cfg: Config, message_id: str, status: str,
         return False
     
     # Truncate comment for Discord
-    truncated = original_text[:1500] + "..." if len(original_text) > 1500 else original_text
+    truncated = _truncate_for_code_block(original_text, 1500)
     
     if status == "approved":
         title = "✅ APPROVED"
@@ -3610,32 +4534,57 @@ def discord_bot_update_review(cfg: Config, message_id: str, status: str,
             {"name": "📊 Original Reason", "value": original_reason[:500], "inline": False},
         ],
         "footer": {"text": f"Reviewed at {time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime())}"},
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        "timestamp": _iso_now()
     }
     
-    payload = json.dumps({"embeds": [embed]}).encode("utf-8")
+    payload = json_bytes({"embeds": [embed]})
     
     url = f"https://discord.com/api/v10/channels/{cfg.discord_review_channel_id}/messages/{message_id}"
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bot {cfg.discord_bot_token}",
-            "User-Agent": "ToxicReportBot/1.0"
-        },
-        method="PATCH"
-    )
     
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            logging.info(f"Discord review notification updated (message_id: {message_id}, status: {status})")
-            return True
+        resp = _DISCORD_SESSION.patch(
+            url,
+            data=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bot {cfg.discord_bot_token}",
+                "User-Agent": "ToxicReportBot/1.0"
+            },
+            timeout=10,
+        )
+        resp.raise_for_status()
+        logging.info(f"Discord review notification updated (message_id: {message_id}, status: {status})")
+        return True
     except Exception as e:
         logging.error(f"Failed to update Discord review notification: {e}")
         return False
 
 
+def discord_bot_post_and_track_review(cfg: Config, comment_id: str, comment_text: str, permalink: str,
+                                      reason: str, scores: Dict[str, float],
+                                      auto_remove_reason: str, author: str = "unknown") -> None:
+    """Post a review notification and, if it was posted, track it for status updates"""
+    discord_msg_id = discord_bot_post_review(
+        cfg=cfg,
+        comment_text=comment_text,
+        permalink=permalink,
+        reason=reason,
+        scores=scores,
+        auto_remove_reason=auto_remove_reason,
+        author=author
+    )
+    if discord_msg_id:
+        add_pending_review(
+            comment_id=comment_id,
+            discord_message_id=discord_msg_id,
+            permalink=permalink,
+            comment_text=comment_text,
+            reason=reason,
+            scores=scores,
+            auto_remove_reason=auto_remove_reason
+        )
+
+
 def check_pending_reviews(reddit: praw.Reddit, cfg: Config) -> None:
     """
     Check all pending reviews to see if they've been actioned by a mod.
@@ -3700,7 +4649,7 @@ def check_pending_reviews(reddit: praw.Reddit, cfg: Config) -> None:
                     created_at = review.get("created_at", "")
                     if created_at:
                         try:
-                            created_time = time.mktime(time.strptime(created_at, "%Y-%m-%dT%H:%M:%SZ"))
+                            created_time = _iso_to_epoch(created_at)
                             # If it's been more than 24 hours and still removed, consider it confirmed
                             if time.time() - created_time > 86400:
                                 mod_action = "removed"
@@ -3746,16 +4695,65 @@ def check_pending_reviews(reddit: praw.Reddit, cfg: Config) -> None:
         logging.info(f"Removed {len(resolved)} resolved review(s) from tracking")
 
 
-def load_false_positives() -> List[Dict]:
-    """Load false positives from JSON file"""
+# False positives are kept in memory after the first load. New entries are
+# appended to FALSE_POSITIVES_LOG (one JSON object per line) instead of
+# rewriting the whole file; save_false_positives() compacts the log back
+# into FALSE_POSITIVES_FILE.
+_fp_entries: Optional[List[Dict]] = None
+_fp_seen_ids: set = set()
+_fp_lock = threading.Lock()
+
+
+def _fp_dumps(entry: Dict) -> bytes:
+    """Encode one false positive entry as a JSONL line"""
+    return json_bytes(entry) + b"\n"
+
+
+def _load_fp_store() -> List[Dict]:
+    """Load the compacted file plus any appended log lines (once per process, caller holds _fp_lock)"""
+    global _fp_entries
+    if _fp_entries is not None:
+        return _fp_entries
+    
+    entries = []
     try:
-        with open(FALSE_POSITIVES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(FALSE_POSITIVES_FILE, "rb") as f:
+            entries = json_loads(f.read())
     except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
+        pass
+    except ValueError:
         logging.warning(f"Could not parse {FALSE_POSITIVES_FILE}, starting fresh")
-        return []
+    
+    try:
+        with open(FALSE_POSITIVES_LOG, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json_loads(line))
+                except ValueError:
+                    # Partial last line from a crash mid-write
+                    logging.warning(f"Skipping unreadable line in {FALSE_POSITIVES_LOG}")
+    except FileNotFoundError:
+        pass
+    
+    _fp_seen_ids.clear()
+    deduped = []
+    for entry in entries:
+        comment_id = entry.get("comment_id")
+        if comment_id in _fp_seen_ids:
+            continue
+        _fp_seen_ids.add(comment_id)
+        deduped.append(entry)
+    
+    _fp_entries = deduped
+    return _fp_entries
+
+
+def load_false_positives() -> List[Dict]:
+    """Load false positives (from memory after the first call)"""
+    with _fp_lock:
+        return list(_load_fp_store())
 
 
 def get_recent_false_positives(hours: int = 24, limit: int = 5) -> List[Dict]:
@@ -3772,7 +4770,7 @@ def get_recent_false_positives(hours: int = 24, limit: int = 5) -> List[Dict]:
         discovered_at = entry.get("discovered_at", "")
         if discovered_at:
             try:
-                discovered_time = time.mktime(time.strptime(discovered_at, "%Y-%m-%dT%H:%M:%SZ"))
+                discovered_time = _iso_to_epoch(discovered_at)
                 if discovered_time >= cutoff:
                     recent.append(entry)
             except ValueError:
@@ -3783,10 +4781,25 @@ def get_recent_false_positives(hours: int = 24, limit: int = 5) -> List[Dict]:
     return recent[:limit]
 
 
-def save_false_positives(entries: List[Dict]) -> None:
-    """Save false positives to JSON file"""
-    with open(FALSE_POSITIVES_FILE, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2)
+def save_false_positives(entries: List[Dict] = None) -> None:
+    """
+    Write false positives to FALSE_POSITIVES_FILE and clear the append log.
+    With no entries given, compacts the in-memory store.
+    """
+    global _fp_entries
+    with _fp_lock:
+        if entries is None:
+            entries = _load_fp_store()
+        else:
+            _fp_entries = list(entries)
+            _fp_seen_ids.clear()
+            _fp_seen_ids.update(e.get("comment_id") for e in _fp_entries)
+        
+        write_json_file(FALSE_POSITIVES_FILE, entries)
+        
+        # Everything in the log is now in the main file
+        if os.path.exists(FALSE_POSITIVES_LOG):
+            os.remove(FALSE_POSITIVES_LOG)
 
 
 def track_false_positive(comment_id: str, permalink: str, text: str,
@@ -3797,16 +4810,10 @@ def track_false_positive(comment_id: str, permalink: str, text: str,
                          perspective_scores: Dict[str, float] = None,
                          context_info: Dict[str, str] = None) -> None:
     """Track a false positive (reported comment that was approved)"""
-    entries = load_false_positives()
-    
-    # Don't add duplicates
-    if any(e.get("comment_id") == comment_id for e in entries):
-        return
-    
     # Extract context info
     context_info = context_info or {}
     
-    entries.append({
+    entry = {
         "comment_id": comment_id,
         "permalink": permalink,
         "text": text[:1000],
@@ -3823,10 +4830,21 @@ def track_false_positive(comment_id: str, permalink: str, text: str,
         "grandparent_context": context_info.get("grandparent_context", "")[:300],
         "grandparent_author": context_info.get("grandparent_author", ""),
         "reported_at": reported_at,
-        "discovered_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-    })
+        "discovered_at": _iso_now(),
+    }
+    
+    with _fp_lock:
+        entries = _load_fp_store()
+        
+        # Don't add duplicates
+        if comment_id in _fp_seen_ids:
+            return
+        
+        with open(FALSE_POSITIVES_LOG, "ab") as f:
+            f.write(_fp_dumps(entry))
+        entries.append(entry)
+        _fp_seen_ids.add(comment_id)
     
-    save_false_positives(entries)
     logging.info(f"Tracked false positive: {comment_id}")
 
 
@@ -3840,86 +4858,93 @@ def check_and_track_false_positives(reddit: praw.Reddit, webhook: str = None) ->
     stats = {"checked": 0, "removed": 0, "approved": 0, "still_pending": 0, "errors": 0}
     new_false_positives = []
     
+    # Collect pending entries that are old enough, keyed by fullname
+    to_check: Dict[str, List[Dict]] = {}
     for entry in comments:
         if entry.get("outcome") != "pending":
             continue
         
         # Check if comment is old enough (24 hours)
-        reported_at = entry.get("reported_at", "")
-        if reported_at:
-            try:
-                reported_time = time.mktime(time.strptime(reported_at, "%Y-%m-%dT%H:%M:%SZ"))
-                age_hours = (now - reported_time) / 3600
-                if age_hours < 24:
-                    stats["still_pending"] += 1
-                    continue
-            except ValueError:
-                pass
+        try:
+            reported_time = _reported_epoch(entry)
+            if reported_time is not None and (now - reported_time) / 3600 < 24:
+                stats["still_pending"] += 1
+                continue
+        except ValueError:
+            pass
         
         comment_id = entry.get("comment_id", "")
         if not comment_id:
             continue
-            
-        try:
-            clean_id = comment_id.replace("t1_", "")
-            comment = reddit.comment(clean_id)
-            _ = comment.body  # Force fetch
-            
-            if comment.body == "[removed]" or getattr(comment, 'removed', False):
-                entry["outcome"] = "removed"
-                stats["removed"] += 1
-            elif getattr(comment, 'removed_by_category', None):
-                entry["outcome"] = "removed"
-                stats["removed"] += 1
-            else:
-                # Comment still exists = approved/not actioned = false positive
-                entry["outcome"] = "approved"
-                stats["approved"] += 1
-                
-                # Track as false positive
-                track_false_positive(
-                    comment_id=comment_id,
-                    permalink=entry.get("permalink", ""),
-                    text=entry.get("text", ""),
-                    groq_reason=entry.get("groq_reason", ""),
-                    detoxify_score=entry.get("detoxify_score", 0),
-                    reported_at=reported_at,
-                    is_top_level=entry.get("is_top_level", False),
-                    detoxify_scores=entry.get("detoxify_scores", {}),
-                    openai_scores=entry.get("openai_scores", {}),
-                    perspective_scores=entry.get("perspective_scores", {}),
-                    context_info={
-                        "post_title": entry.get("post_title", ""),
-                        "parent_context": entry.get("parent_context", ""),
-                        "parent_author": entry.get("parent_author", ""),
-                        "is_parent_op": entry.get("is_parent_op", False),
-                        "grandparent_context": entry.get("grandparent_context", ""),
-                        "grandparent_author": entry.get("grandparent_author", ""),
-                    }
-                )
-                new_false_positives.append(entry)
-            
-            entry["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-            stats["checked"] += 1
-            
-        except prawcore.exceptions.NotFound:
-            entry["outcome"] = "removed"
-            entry["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-            stats["removed"] += 1
-            stats["checked"] += 1
-        except Exception as e:
-            logging.warning(f"Error checking comment {comment_id}: {e}")
-            stats["errors"] += 1
+        to_check.setdefault(_tracked_fullname(comment_id), []).append(entry)
     
-    save_tracked_comments(comments)
+    # Fetch in batches of up to 100 per request instead of one request per comment
+    for batch, fetched in fetch_info_batches(reddit, list(to_check)):
+        if fetched is None:
+            stats["errors"] += sum(len(to_check[f]) for f in batch)
+            continue
+        
+        checked_at = _iso_now()
+        checked_at_epoch = int(time.time())
+        batch_updates: Dict[str, Dict] = {}
+        for fullname in batch:
+            comment = fetched.get(fullname)
+            for entry in to_check[fullname]:
+                if comment is None:
+                    # Not returned at all = gone (same as NotFound)
+                    entry["outcome"] = "removed"
+                    stats["removed"] += 1
+                elif getattr(comment, 'body', '') == "[removed]" or getattr(comment, 'removed', False):
+                    entry["outcome"] = "removed"
+                    stats["removed"] += 1
+                elif getattr(comment, 'removed_by_category', None):
+                    entry["outcome"] = "removed"
+                    stats["removed"] += 1
+                else:
+                    # Comment still exists = approved/not actioned = false positive
+                    entry["outcome"] = "approved"
+                    stats["approved"] += 1
+                    
+                    # Track as false positive
+                    track_false_positive(
+                        comment_id=entry["comment_id"],
+                        permalink=entry.get("permalink", ""),
+                        text=entry.get("text", ""),
+                        groq_reason=entry.get("groq_reason", ""),
+                        detoxify_score=entry.get("detoxify_score", 0),
+                        reported_at=entry.get("reported_at", ""),
+                        is_top_level=entry.get("is_top_level", False),
+                        detoxify_scores=entry.get("detoxify_scores", {}),
+                        openai_scores=entry.get("openai_scores", {}),
+                        perspective_scores=entry.get("perspective_scores", {}),
+                        context_info={
+                            "post_title": entry.get("post_title", ""),
+                            "parent_context": entry.get("parent_context", ""),
+                            "parent_author": entry.get("parent_author", ""),
+                            "is_parent_op": entry.get("is_parent_op", False),
+                            "grandparent_context": entry.get("grandparent_context", ""),
+                            "grandparent_author": entry.get("grandparent_author", ""),
+                        }
+                    )
+                    if len(new_false_positives) < 5:  # Only the first 5 are notified
+                        new_false_positives.append(entry)
+                
+                entry["checked_at"] = checked_at
+                entry["checked_at_epoch"] = checked_at_epoch
+                stats["checked"] += 1
+                batch_updates[entry["comment_id"]] = {"outcome": entry["outcome"], "checked_at": checked_at,
+                                                      "checked_at_epoch": checked_at_epoch}
+        
+        # Save progress after every batch so an error mid-sweep doesn't lose it
+        update_tracked_comments(batch_updates)
     
     # Notify Discord about new false positives
     if webhook and new_false_positives:
-        for fp in new_false_positives[:5]:  # Limit to 5 notifications
-            post_discord_embed(
+        for fp in new_false_positives:
+            queue_discord_embed(
                 webhook=webhook,
                 title="⚠️ False Positive Detected",
-                description=f"```{fp.get('text', '')[:500]}```",
+                description=_code_block(fp.get("text", ""), 500),
                 color=0xFFAA00,  # Orange
                 fields=[
                     {"name": "Reason", "value": fp.get("groq_reason", "Unknown"), "inline": True},
@@ -3949,55 +4974,66 @@ def get_parent_context(thing) -> Dict[str, Any]:
         "grandparent_author": "",
     }
     
+    if not isinstance(thing, Comment):
+        return result
+    
     try:
-        op_author = ""
-        
-        # Get the submission (post) this comment is on
-        if hasattr(thing, 'submission'):
-            submission = thing.submission
-            result["post_title"] = getattr(submission, 'title', '') or ''
+        # Get the submission (post) this comment is on. praw fetches it lazily
+        # and caches it on the comment, so it's requested at most once here.
+        submission = thing.submission
+        
+        # Comments from subreddit listings already carry the post title and OP
+        # (link_title/link_author); read them via vars() so a missing field
+        # doesn't trigger a lazy fetch of the comment itself
+        listing = vars(thing)
+        if "link_title" in listing:
+            result["post_title"] = listing["link_title"] or ''
+            op_author = listing.get("link_author") or ""
+        else:
+            result["post_title"] = submission.title or ''
             # Get OP's username for comparison
-            if hasattr(submission, 'author') and submission.author:
-                op_author = submission.author.name
+            op_author = submission.author.name if submission.author else ""
         
         # Get immediate parent context
-        if hasattr(thing, 'parent'):
-            parent = thing.parent()
+        parent = thing.parent()
+        
+        if isinstance(parent, Comment):
+            result["parent_context"] = parent.body[:1000]
             
-            if hasattr(parent, 'body'):
-                # Parent is a comment
-                result["parent_context"] = parent.body[:1000]
+            # Get parent author
+            if parent.author:
+                result["parent_author"] = parent.author.name
+                result["is_parent_op"] = (parent.author.name == op_author)
+            
+            # Get grandparent context (one level up)
+            try:
+                # A parent that is top-level points back at the same post; reuse
+                # it rather than letting parent.parent() fetch a second copy
+                if parent.parent_id.startswith('t3_'):
+                    grandparent = submission
+                else:
+                    grandparent = parent.parent()
+                if isinstance(grandparent, Comment):
+                    result["grandparent_context"] = grandparent.body[:500]
+                    if grandparent.author:
+                        result["grandparent_author"] = grandparent.author.name
+                else:
+                    # Grandparent is the submission
+                    selftext = grandparent.selftext or ""
+                    if selftext:
+                        result["grandparent_context"] = f"[POST] {selftext[:500]}"
+            except Exception:
+                pass
                 
-                # Get parent author
-                if hasattr(parent, 'author') and parent.author:
-                    result["parent_author"] = parent.author.name
-                    result["is_parent_op"] = (parent.author.name == op_author)
+        else:
+            # Parent is the submission itself (top-level comment)
+            selftext = parent.selftext or ""
+            if selftext:
+                result["parent_context"] = selftext[:1000]
+            if parent.author:
+                result["parent_author"] = parent.author.name
+                result["is_parent_op"] = True  # Parent is OP's post
                 
-                # Get grandparent context (one level up)
-                if hasattr(parent, 'parent'):
-                    try:
-                        grandparent = parent.parent()
-                        if hasattr(grandparent, 'body'):
-                            result["grandparent_context"] = grandparent.body[:500]
-                            if hasattr(grandparent, 'author') and grandparent.author:
-                                result["grandparent_author"] = grandparent.author.name
-                        elif hasattr(grandparent, 'selftext'):
-                            # Grandparent is the submission
-                            selftext = getattr(grandparent, 'selftext', '') or ""
-                            if selftext:
-                                result["grandparent_context"] = f"[POST] {selftext[:500]}"
-                    except Exception:
-                        pass
-                        
-            elif hasattr(parent, 'title'):
-                # Parent is the submission itself (top-level comment)
-                selftext = getattr(parent, 'selftext', '') or ""
-                if selftext:
-                    result["parent_context"] = selftext[:1000]
-                if hasattr(parent, 'author') and parent.author:
-                    result["parent_author"] = parent.author.name
-                    result["is_parent_op"] = True  # Parent is OP's post
-                    
     except Exception:
         pass
     
@@ -4007,14 +5043,14 @@ def get_parent_context(thing) -> Dict[str, Any]:
 def get_text_from_thing(thing) -> Optional[str]:
     """Extract text content from a comment or submission"""
     # Comment
-    if hasattr(thing, 'body'):
+    if isinstance(thing, Comment):
         body = thing.body
         if body and body != '[deleted]' and body != '[removed]':
             return body
     # Submission
-    elif hasattr(thing, 'title'):
-        title = getattr(thing, 'title', '') or ''
-        selftext = getattr(thing, 'selftext', '') or ''
+    elif isinstance(thing, Submission):
+        title = thing.title or ''
+        selftext = thing.selftext or ''
         text = f"{title.strip()}  {selftext.strip()}".strip()
         if text:
             return text
@@ -4049,41 +5085,31 @@ def check_auto_remove_consensus(scores: Dict[str, float], cfg: Config, is_patter
     if not required_models or len(required_models) == 0:
         return True, "llm_decision"
     
+    # Max score per model in one pass (Detoxify scores are the non-prefixed ones)
+    max_detox = max_openai = max_persp = 0.0
+    for k, v in scores.items():
+        if not isinstance(v, (int, float)):
+            continue
+        if k.startswith('openai_'):
+            if v > max_openai:
+                max_openai = v
+        elif k.startswith('perspective_'):
+            if v > max_persp:
+                max_persp = v
+        elif not k.startswith('_') and v > max_detox:
+            max_detox = v
+    
+    model_max = {"detoxify": max_detox, "openai": max_openai, "perspective": max_persp}
     models_passed = []
     models_failed = []
     
-    for model in required_models:
-        model = model.lower()
-        
-        if model == "detoxify":
-            # Get max Detoxify score (non-prefixed scores)
-            detox_scores = {k: v for k, v in scores.items() 
-                          if not k.startswith(('openai_', 'perspective_', '_')) and isinstance(v, (int, float))}
-            max_detox = max(detox_scores.values()) if detox_scores else 0.0
-            if max_detox >= cfg.auto_remove_detoxify_min:
-                models_passed.append(f"detoxify={max_detox:.2f}")
-            else:
-                models_failed.append(f"detoxify={max_detox:.2f}<{cfg.auto_remove_detoxify_min}")
-                
-        elif model == "openai":
-            # Get max OpenAI score
-            openai_scores = {k: v for k, v in scores.items() 
-                           if k.startswith('openai_') and isinstance(v, (int, float))}
-            max_openai = max(openai_scores.values()) if openai_scores else 0.0
-            if max_openai >= cfg.auto_remove_openai_min:
-                models_passed.append(f"openai={max_openai:.2f}")
-            else:
-                models_failed.append(f"openai={max_openai:.2f}<{cfg.auto_remove_openai_min}")
-                
-        elif model == "perspective":
-            # Get max Perspective score
-            persp_scores = {k: v for k, v in scores.items() 
-                          if k.startswith('perspective_') and isinstance(v, (int, float))}
-            max_persp = max(persp_scores.values()) if persp_scores else 0.0
-            if max_persp >= cfg.auto_remove_perspective_min:
-                models_passed.append(f"perspective={max_persp:.2f}")
-            else:
-                models_failed.append(f"perspective={max_persp:.2f}<{cfg.auto_remove_perspective_min}")
+    # (model, min score) pairs are resolved once when the config is loaded
+    for model, min_score in cfg.auto_remove_rules:
+        score = model_max[model]
+        if score >= min_score:
+            models_passed.append(f"{model}={score:.2f}")
+        else:
+            models_failed.append(f"{model}={score:.2f}<{min_score}")
     
     # Check if enough models passed
     if len(models_passed) >= cfg.auto_remove_min_consensus:
@@ -4129,6 +5155,9 @@ def auto_remove_comment(comment, cfg: Config) -> bool:
         return False
 
 
+# Everything before the last space that sits past index 30 (greedy, so the last one wins)
+_TRUNC_RE = re.compile(r'(.{31,}) ', re.S)
+
 def build_report_reason(result: AnalysisResult, include_filter_tag: bool = False) -> str:
     """Build a report reason string from the analysis result.
     
@@ -4144,9 +5173,9 @@ def build_report_reason(result: AnalysisResult, include_filter_tag: bool = False
     # Truncate cleanly without cutting mid-word
     # Leave room for "..."
     truncated = reason[:max_reason_len - 3]
-    last_space = truncated.rfind(' ')
-    if last_space > 30:  # Only use space if it's not too far back
-        truncated = truncated[:last_space]
+    m = _TRUNC_RE.match(truncated)  # Last space, only if it's not too far back
+    if m:
+        truncated = m.group(1)
     
     return truncated + "..."
 
@@ -4155,36 +5184,225 @@ def build_report_reason(result: AnalysisResult, include_filter_tag: bool = False
 # Main loop
 # -------------------------------
 
-def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cfg: Config, subreddit_name: str) -> None:
-    """Process a single comment or submission"""
+class SeenIdSet:
+    """
+    Bounded set of recently processed comment IDs, oldest evicted first.
+    Stream reconnects can replay comments; checking here skips them before
+    any ML or LLM call. An ID is claimed while its comment is being processed
+    and only recorded once processing finishes, so a comment lost to a crash
+    or shutdown is not remembered as done. Recorded IDs are appended to
+    SEEN_IDS_LOG and folded into SEEN_IDS_FILE every SEEN_IDS_COMPACT_EVERY
+    appends, so restarts keep the history.
+    """
     
-    text = get_text_from_thing(thing)
-    if not text:
-        return
+    def __init__(self, path: str = SEEN_IDS_FILE, log_path: str = SEEN_IDS_LOG,
+                 max_entries: int = SEEN_IDS_MAX):
+        self.path = path
+        self.log_path = log_path
+        self.max_entries = max_entries
+        self.duplicates = 0
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+        self._claimed: set = set()  # IDs being processed (buffered or queued for the LLM)
+        self._appends = 0
+        self._lock = threading.Lock()  # add() is called from the stream and the LLM worker
+        try:
+            with open(self.path, "rb") as f:
+                self._ids = OrderedDict.fromkeys(json_loads(f.read()))
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            logging.warning(f"Could not parse {self.path}, starting fresh")
+        try:
+            with open(self.log_path, "rb") as f:
+                for line in f:
+                    try:
+                        self._ids[json_loads(line)["id"]] = None
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue  # Torn last line from a crash mid-write
+                    self._appends += 1
+        except FileNotFoundError:
+            pass
+        while len(self._ids) > max_entries:
+            self._ids.popitem(last=False)
+    
+    def claim(self, thing_id: str) -> bool:
+        """Start processing an ID; returns False if it was already processed or is in progress"""
+        with self._lock:
+            if thing_id in self._ids or thing_id in self._claimed:
+                self.duplicates += 1
+                return False
+            self._claimed.add(thing_id)
+            return True
     
-    thing_id = thing.fullname
-    permalink = f"https://reddit.com{getattr(thing, 'permalink', '')}"
+    def release(self, thing_id: str) -> None:
+        """Give up a claim without recording the ID (processing failed, so a replay may retry it)"""
+        with self._lock:
+            self._claimed.discard(thing_id)
+    
+    def add(self, thing_id: str) -> None:
+        """Record an ID as processed (appended to the log, compacted every SEEN_IDS_COMPACT_EVERY)"""
+        with self._lock:
+            self._claimed.discard(thing_id)
+            if thing_id in self._ids:
+                return
+            self._ids[thing_id] = None
+            if len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+            try:
+                append_jsonl(self.log_path, [{"id": thing_id}])
+            except OSError as e:
+                logging.warning(f"Failed to append to {self.log_path}: {e}")
+            self._appends += 1
+            compact = self._appends >= SEEN_IDS_COMPACT_EVERY
+        if compact:
+            self.save()
+    
+    def save(self) -> None:
+        """Rewrite SEEN_IDS_FILE from memory and drop the append log (compaction)"""
+        with self._lock:
+            self._appends = 0
+            try:
+                write_json_file(self.path, list(self._ids), indent=False)
+                os.remove(self.log_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Failed to save {self.path}: {e}")
+
+
+LLM_BACKLOG_MAX = 100  # Escalated comments queued for the LLM before the stream waits
+
+# Escalated comments are reviewed on one background worker so the stream keeps
+# pre-filtering while an LLM call (and its rate-limit wait) is in flight. A
+# single worker keeps the analyzer, reporting and benign tracking serial; when
+# a backlog builds up it reviews up to LLM_BATCH_SIZE comments per LLM call.
+# praw isn't thread-safe, so the worker has its own praw.Reddit client and
+# re-fetches each batch with it before any parent lookups, reports or removals.
+# Items are (thing, text, is_top_level, detox_score, detox_scores, subreddit_name)
+_llm_queue: "queue.Queue[Tuple]" = queue.Queue(maxsize=LLM_BACKLOG_MAX)
+_llm_worker_lock = threading.Lock()
+_llm_worker_started = False
+
+
+def _rebind_to_client(reddit: praw.Reddit, batch: List[Tuple]) -> List[Tuple]:
+    """
+    Swap each queued thing for a copy fetched with this thread's client (one
+    reddit.info() request per batch). Things Reddit no longer returns are left out.
+    """
+    fetched = {}
+    for _, things in fetch_info_batches(reddit, [item[0].fullname for item in batch]):
+        if things is None:
+            raise RuntimeError("could not re-fetch comments for the LLM worker")
+        fetched.update(things)
+    rebound = []
+    for item in batch:
+        thing = fetched.get(item[0].fullname)
+        if thing is None:
+            logging.info(f"Skipping {item[0].fullname}: no longer returned by Reddit")
+            continue
+        # Listing-only fields get_parent_context uses to avoid fetching the submission
+        listing = vars(item[0])
+        for key in ("link_title", "link_author"):
+            if key in listing:
+                vars(thing).setdefault(key, listing[key])
+        rebound.append((thing,) + tuple(item[1:]))
+    return rebound
+
+
+def _llm_worker(analyzer: LLMAnalyzer, cfg: Config, seen_ids: Optional[SeenIdSet]) -> None:
+    """
+    Take whatever escalations have queued up (up to cfg.llm_batch_size) and
+    review them together; each reviewed comment is then recorded in seen_ids
+    """
+    reddit = None  # This thread's own client; the stream's isn't safe to share
+    while True:
+        batch = [_llm_queue.get()]
+        while len(batch) < cfg.llm_batch_size:
+            try:
+                batch.append(_llm_queue.get_nowait())
+            except queue.Empty:
+                break
+        reviewed = set()
+        try:
+            if reddit is None:
+                reddit = praw_client(cfg)
+            reviewed = review_escalated_batch(_rebind_to_client(reddit, batch), analyzer, cfg)
+        except Exception as e:
+            logging.error(f"Error processing LLM batch of {len(batch)}: {e}")
+        finally:
+            for item in batch:
+                if seen_ids is not None:
+                    if item[0].fullname in reviewed:
+                        seen_ids.add(item[0].fullname)
+                    else:
+                        seen_ids.release(item[0].fullname)
+                _llm_queue.task_done()
+
+
+def _enqueue_llm_review(item: Tuple, analyzer: LLMAnalyzer, cfg: Config,
+                        seen_ids: Optional[SeenIdSet] = None) -> None:
+    """Queue an escalated comment for the LLM worker (starting it on first use); blocks only if the backlog is full"""
+    global _llm_worker_started
+    if not _llm_worker_started:
+        with _llm_worker_lock:
+            if not _llm_worker_started:
+                threading.Thread(target=_llm_worker, args=(analyzer, cfg, seen_ids),
+                                 name="llm-review", daemon=True).start()
+                _llm_worker_started = True
+    _llm_queue.put(item)
+
+
+def stop_llm_worker(timeout: float = 600.0) -> None:
+    """
+    Let the worker review everything still queued (up to timeout seconds).
+    Escalations left after that are dropped unreviewed - they were never
+    recorded in seen_ids, so they aren't remembered as processed.
+    """
+    if _llm_queue.unfinished_tasks:
+        logging.info(f"Reviewing {_llm_queue.unfinished_tasks} queued escalation(s) before exit")
+    deadline = time.time() + timeout
+    while _llm_queue.unfinished_tasks and time.time() < deadline:
+        time.sleep(0.1)
+    dropped = 0
+    while True:
+        try:
+            _llm_queue.get_nowait()
+        except queue.Empty:
+            break
+        _llm_queue.task_done()
+        dropped += 1
+    if dropped:
+        logging.warning(f"Shutdown timeout: {dropped} queued escalation(s) left unreviewed")
+
+
+def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cfg: Config, subreddit_name: str,
+                  precomputed_scores: Optional[Dict[str, float]] = None,
+                  seen_ids: Optional[SeenIdSet] = None) -> bool:
+    """
+    Pre-filter a single comment or submission; escalated ones are queued for
+    the LLM worker (precomputed_scores: Detoxify scores from a stream batch).
+    Returns True if it was queued - the worker records it in seen_ids once reviewed.
+    """
     
-    # Get parent context and post title
-    context_info = {}
-    if hasattr(thing, 'body'):  # It's a comment
-        context_info = get_parent_context(thing)
+    text = get_text_from_thing(thing)
+    if not text:
+        return False
     
     # Check if this is a top-level comment (parent is the submission, not another comment)
-    is_top_level = False
-    if hasattr(thing, 'parent_id'):
-        # parent_id starts with t3_ for submissions, t1_ for comments
-        is_top_level = thing.parent_id.startswith('t3_')
+    # parent_id starts with t3_ for submissions, t1_ for comments; submissions are never top-level
+    is_top_level = isinstance(thing, Comment) and thing.parent_id.startswith('t3_')
     
     # Pre-filter with Detoxify
-    should_analyze, detox_score, detox_scores = detox_filter.should_analyze(text, is_top_level=is_top_level)
+    should_analyze, detox_score, detox_scores = detox_filter.should_analyze(text, is_top_level=is_top_level,
+                                                                            detox_scores=precomputed_scores)
     
     if not should_analyze:
         # Below threshold - skip LLM analysis
         # Log at INFO level if score was borderline so we can review skips
         if detox_score > cfg.threshold_borderline:
+            permalink = f"https://reddit.com{thing.permalink}"
             logging.info(f"SKIP (borderline) | score={detox_score:.2f} | {permalink}")
-            logging.info(f"  Text: {text[:200].replace(chr(10), ' ')}{'...' if len(text) > 200 else ''}")
+            logging.info("  Text: %s%s", text[:200].translate(_NL_TRANS), '...' if len(text) > 200 else '')
             # Discord notification for borderline skips
             if cfg.discord_webhook:
                 notify_discord_borderline_skip(
@@ -4194,14 +5412,59 @@ def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cf
                     detoxify_score=detox_score,
                     subreddit=subreddit_name
                 )
-        else:
-            logging.debug(f"SKIP | detox={detox_score:.3f} | '{text[:80].replace(chr(10), ' ')}...'")
-        return
+        elif logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("SKIP | detox=%.3f | '%s...'", detox_score, text[:80].translate(_NL_TRANS))
+        return False
+    
+    # Hand off to the LLM worker
+    _enqueue_llm_review((thing, text, is_top_level, detox_score, detox_scores, subreddit_name), analyzer, cfg, seen_ids)
+    return True
+
+
+def review_escalated_batch(batch: List[Tuple], analyzer: LLMAnalyzer, cfg: Config) -> Set[str]:
+    """
+    Run the LLM on queued escalations (one call for the lot), then act on each
+    verdict; returns the fullnames that were reviewed without an error
+    """
+    prepared = []
+    for thing, text, is_top_level, detox_score, detox_scores, subreddit_name in batch:
+        try:
+            context_info = prepare_escalated_thing(thing, text, detox_score, detox_scores, cfg, subreddit_name)
+        except Exception as e:
+            logging.error(f"Error processing {thing.fullname}: {e}")
+            continue
+        prepared.append((thing, text, is_top_level, detox_score, detox_scores, subreddit_name, context_info))
+    
+    results = analyzer.analyze_batch([
+        {"text": text, "subreddit": subreddit_name, "context_info": context_info,
+         "detoxify_score": detox_score, "is_top_level": is_top_level, "scores": detox_scores}
+        for _, text, is_top_level, detox_score, detox_scores, subreddit_name, context_info in prepared
+    ])
+    
+    reviewed = set()
+    for (thing, text, is_top_level, detox_score, detox_scores, subreddit_name, context_info), result in zip(prepared, results):
+        try:
+            act_on_verdict(thing, text, is_top_level, detox_score, detox_scores, context_info, result, cfg)
+        except Exception as e:
+            logging.error(f"Error processing {thing.fullname}: {e}")
+            continue
+        reviewed.add(thing.fullname)
+    return reviewed
+
+
+def prepare_escalated_thing(thing, text: str, detox_score: float, detox_scores: Dict[str, float],
+                            cfg: Config, subreddit_name: str) -> Dict[str, str]:
+    """Fetch parent context for an escalated comment and announce it (log + Discord); returns the context"""
+    permalink = f"https://reddit.com{thing.permalink}"
+    
+    # Get parent context and post title (only needed for the LLM, and costs
+    # Reddit requests, so skipped comments never fetch it)
+    context_info = get_parent_context(thing) if isinstance(thing, Comment) else {}
     
     # Above threshold - send to Groq
-    log_text_short = text[:100].replace('\n', ' ')
-    logging.info(f"")
-    logging.info(f"={'='*60}")
+    log_text_short = text[:100].translate(_NL_TRANS)
+    logging.info("")
+    logging.info(_LOG_RULE)
     logging.info(f"SENDING TO GROQ (detox score: {detox_score:.3f})")
     logging.info(f"Comment: \"{log_text_short}{'...' if len(text) > 100 else ''}\"")
     logging.info(f"Link: {permalink}")
@@ -4218,15 +5481,21 @@ def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cf
             subreddit=subreddit_name,
             trigger_reasons=trigger_reasons
         )
-    
-    result = analyzer.analyze(text, subreddit_name, context_info, detox_score, is_top_level, detox_scores)
+    return context_info
+
+
+def act_on_verdict(thing, text: str, is_top_level: bool, detox_score: float, detox_scores: Dict[str, float],
+                   context_info: Dict[str, str], result: AnalysisResult, cfg: Config) -> None:
+    """Log the LLM verdict, then report/remove and notify, or track the comment as benign"""
+    thing_id = thing.fullname
+    permalink = f"https://reddit.com{thing.permalink}"
     
     # Show Groq's verdict and reasoning
-    logging.info(f"")
+    logging.info("")
     logging.info(f"GROQ VERDICT: {result.verdict.value}")
     logging.info(f"GROQ REASONING: {result.reason}")
     if result.raw_response:
-        logging.debug(f"GROQ RAW RESPONSE: {result.raw_response}")
+        logging.debug("GROQ RAW RESPONSE: %s", result.raw_response)
     
     # Update Discord with verdict
     if cfg.discord_webhook:
@@ -4252,11 +5521,13 @@ def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cf
         
         # Fallback: find highest Detoxify score if no trigger reasons
         if not prefilter_trigger and detox_scores:
-            numeric_scores = {k: v for k, v in detox_scores.items() 
-                           if isinstance(v, (int, float)) and not k.startswith(('openai_', 'perspective_'))}
-            if numeric_scores:
-                top_label = max(numeric_scores, key=numeric_scores.get)
-                prefilter_trigger = f"detoxify:{top_label}={numeric_scores[top_label]:.2f}"
+            top_label, top_score = None, None
+            for k, v in detox_scores.items():
+                if isinstance(v, (int, float)) and not k.startswith(('openai_', 'perspective_')):
+                    if top_score is None or v > top_score:
+                        top_label, top_score = k, v
+            if top_label is not None:
+                prefilter_trigger = f"detoxify:{top_label}={top_score:.2f}"
         
         track_benign_analyzed(
             comment_id=thing_id,
@@ -4271,7 +5542,7 @@ def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cf
             context_info=context_info
         )
     
-    logging.info(f"={'='*60}")
+    logging.info(_LOG_RULE)
 
     # File report (only if not dry run)
     if cfg.enable_reddit_reports and should_report:
@@ -4286,7 +5557,7 @@ def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cf
         reason = build_report_reason(result, include_filter_tag=False)
         
         if cfg.dry_run:
-            logging.info(f"ACTION: >>> WOULD REPORT <<< (dry run enabled)")
+            # "WOULD REPORT" was already logged with the verdict above
             if should_auto_remove:
                 logging.info(f"ACTION: >>> WOULD AUTO-REMOVE <<< ({auto_remove_reason})")
         else:
@@ -4329,10 +5600,12 @@ def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cf
                     except:
                         pass
                     
-                    # Try Discord Bot first (for editable messages)
+                    # Try Discord Bot first (for editable messages) - posted from the Discord worker
                     if cfg.discord_bot_token and cfg.discord_review_channel_id:
-                        discord_msg_id = discord_bot_post_review(
+                        submit_discord_task(
+                            discord_bot_post_and_track_review,
                             cfg=cfg,
+                            comment_id=thing_id.replace("t1_", "").replace("t3_", ""),
                             comment_text=text,
                             permalink=permalink,
                             reason=result.reason,
@@ -4340,17 +5613,6 @@ def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cf
                             auto_remove_reason=auto_remove_reason,
                             author=author_name
                         )
-                        # Track for status updates if message was posted
-                        if discord_msg_id:
-                            add_pending_review(
-                                comment_id=thing_id.replace("t1_", "").replace("t3_", ""),
-                                discord_message_id=discord_msg_id,
-                                permalink=permalink,
-                                comment_text=text,
-                                reason=result.reason,
-                                scores=detox_scores,
-                                auto_remove_reason=auto_remove_reason
-                            )
                     else:
                         # Fallback to webhook (not editable)
                         notify_discord_auto_remove(
@@ -4377,40 +5639,91 @@ def process_thing(thing, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cf
                 logging.error(f"Report failed for {thing_id}: {e}")
 
 
-def stream_subreddit(reddit: praw.Reddit, subreddit_name: str, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cfg: Config) -> None:
+DETOX_BATCH_SIZE = 32  # Max comments scored per Detoxify forward pass
+STREAM_MAX_IDLE_SLEEP = 16  # Seconds between polls once a subreddit goes quiet
+
+
+def stream_subreddit(reddit: praw.Reddit, subreddit_name: str, detox_filter: DetoxifyFilter, analyzer: LLMAnalyzer, cfg: Config,
+                     seen_ids: Optional[SeenIdSet] = None) -> None:
     """Stream comments and submissions from a subreddit"""
     
     sr = reddit.subreddit(subreddit_name)
     logging.info(f"Starting stream for r/{subreddit_name}")
     
-    # Stream comments (this blocks and yields comments as they arrive)
-    for comment in sr.stream.comments(skip_existing=True):
-        try:
-            process_thing(comment, detox_filter, analyzer, cfg, subreddit_name)
-        except Exception as e:
-            logging.error(f"Error processing {comment.fullname}: {e}")
-            continue
+    def flush(batch: List) -> None:
+        # One Detoxify forward pass for everything fetched together
+        texts = [get_text_from_thing(c) or "" for c in batch]
+        scored = detox_filter.predict_batch([t for t in texts if t])
+        batch_scores = iter(scored)
+        for comment, text in zip(batch, texts):
+            scores = next(batch_scores) if text else None
+            try:
+                queued = process_thing(comment, detox_filter, analyzer, cfg, subreddit_name,
+                                       precomputed_scores=scores, seen_ids=seen_ids)
+            except Exception as e:
+                logging.error(f"Error processing {comment.fullname}: {e}")
+                if seen_ids is not None:
+                    seen_ids.release(comment.fullname)
+                continue
+            # Escalated comments are recorded by the LLM worker once reviewed
+            if seen_ids is not None and not queued:
+                seen_ids.add(comment.fullname)
+        batch.clear()
+    
+    # Stream comments (this blocks and yields comments as they arrive).
+    # pause_after=0 yields None once a poll comes back empty, i.e. right after
+    # each burst of new comments, which is when the buffered burst is scored.
+    # The stream doesn't sleep between polls in this mode, so back off here
+    # the same way praw would (1s doubling up to 16s while idle).
+    # If the stream raises (network error, Ctrl-C) whatever is buffered is
+    # still processed before the exception propagates.
+    buffered = []
+    idle_sleep = 1
+    try:
+        for comment in sr.stream.comments(skip_existing=True, pause_after=0):
+            if comment is None:
+                if buffered:
+                    flush(buffered)
+                time.sleep(idle_sleep)
+                idle_sleep = min(idle_sleep * 2, STREAM_MAX_IDLE_SLEEP)
+                continue
+            idle_sleep = 1
+            # Skip comments already processed (replayed after a reconnect/restart)
+            if seen_ids is not None and not seen_ids.claim(comment.fullname):
+                logging.debug(f"Skipping already processed {comment.fullname}")
+                continue
+            buffered.append(comment)
+            if len(buffered) >= DETOX_BATCH_SIZE:
+                flush(buffered)
+    finally:
+        if buffered:
+            flush(buffered)
 
 
 # -------------------------------
 # Main
 # -------------------------------
 
-import threading
+# Set on shutdown so background loops stop waiting and exit
+_shutdown_event = threading.Event()
+
 
 def accuracy_check_loop(reddit: praw.Reddit, discord_webhook: str = None, 
                         check_interval_hours: int = 12):
     """Background thread that periodically checks reported comment outcomes"""
     check_interval_sec = check_interval_hours * 3600
     
-    while True:
-        time.sleep(check_interval_sec)
+    while not _shutdown_event.wait(check_interval_sec):
         try:
             logging.info("Running accuracy check on reported comments...")
             
             # Check outcomes and track false positives
             stats = check_and_track_false_positives(reddit, webhook=discord_webhook)
             
+            # Fold the append-only false positive log back into the main file
+            if os.path.exists(FALSE_POSITIVES_LOG):
+                save_false_positives()
+            
             if stats["checked"] > 0:
                 logging.info(
                     f"Accuracy check complete: {stats['checked']} comments checked - "
@@ -4455,7 +5768,8 @@ def main() -> None:
         guidelines=cfg.moderation_guidelines,
         fallback_chain=cfg.llm_fallback_chain,
         daily_limit=cfg.llm_daily_limit,
-        requests_per_minute=cfg.llm_requests_per_minute
+        requests_per_minute=cfg.llm_requests_per_minute,
+        burst=cfg.llm_burst
     )
     logging.info(f"Using LLM model: {cfg.llm_model} (max {cfg.llm_requests_per_minute} requests/min)")
     if cfg.xai_api_key:
@@ -4504,10 +5818,11 @@ def main() -> None:
             # All-time stats - reload from disk to pick up all updates
             accuracy_alltime = get_accuracy_stats()
             
+            counts = detox_filter.stats_snapshot()
             startup_stats = {
-                "total_processed": detox_filter.total,
-                "sent_to_llm": detox_filter.must_escalate + detox_filter.ml_sent,
-                "benign": detox_filter.benign_skipped + detox_filter.pattern_skipped,
+                "total_processed": counts["total"],
+                "sent_to_llm": counts["must_escalate"] + counts["ml_sent"],
+                "benign": counts["benign_skipped"] + counts["pattern_skipped"],
                 "accuracy_daily": accuracy_daily,
                 "accuracy_weekly": accuracy_weekly,
                 "accuracy_alltime": accuracy_alltime,
@@ -4542,7 +5857,8 @@ def main() -> None:
                     check_pending_reviews(reddit_client, config)
                 except Exception as e:
                     logging.error(f"Pending reviews check failed: {e}")
-                time.sleep(config.discord_review_check_interval)
+                if _shutdown_event.wait(config.discord_review_check_interval):
+                    return
         
         reviews_thread = threading.Thread(
             target=pending_reviews_loop,
@@ -4564,13 +5880,12 @@ def main() -> None:
         
         # Wait until next day at 00:00 UTC, then post daily
         while True:
-            # Calculate seconds until midnight UTC
-            now = time.gmtime()
-            seconds_until_midnight = (24 - now.tm_hour) * 3600 - now.tm_min * 60 - now.tm_sec
-            if seconds_until_midnight <= 0:
-                seconds_until_midnight += 86400
-            
-            time.sleep(seconds_until_midnight + 60)  # Wait until just after midnight
+            # Absolute deadline just after the next midnight UTC; re-checked after
+            # every wake so clock adjustments can't make the post early or late
+            deadline = (int(time.time()) // 86400 + 1) * 86400 + 60
+            while time.time() < deadline:
+                if _shutdown_event.wait(deadline - time.time()):
+                    return
             
             try:
                 # Gather stats - daily (24h), weekly (7d), and all-time
@@ -4578,10 +5893,11 @@ def main() -> None:
                 accuracy_weekly = get_accuracy_stats(hours=168)  # 7 days
                 accuracy_alltime = get_accuracy_stats()
                 
+                counts = detox_filter.stats_snapshot()
                 stats = {
-                    "total_processed": detox_filter.total,
-                    "sent_to_llm": detox_filter.must_escalate + detox_filter.ml_sent,
-                    "benign": detox_filter.benign_skipped + detox_filter.pattern_skipped,
+                    "total_processed": counts["total"],
+                    "sent_to_llm": counts["must_escalate"] + counts["ml_sent"],
+                    "benign": counts["benign_skipped"] + counts["pattern_skipped"],
                     "accuracy_daily": accuracy_daily,
                     "accuracy_weekly": accuracy_weekly,
                     "accuracy_alltime": accuracy_alltime,
@@ -4610,10 +5926,12 @@ def main() -> None:
     
     subreddit_name = cfg.subreddits[0]
     logging.info(f"Monitoring r/{subreddit_name} via comment stream")
+    
+    seen_ids = SeenIdSet()
 
     while True:
         try:
-            stream_subreddit(reddit, subreddit_name, detox_filter, analyzer, cfg)
+            stream_subreddit(reddit, subreddit_name, detox_filter, analyzer, cfg, seen_ids)
             
         except prawcore.exceptions.ResponseException as e:
             logging.error("ResponseException: %s", e)
@@ -4628,7 +5946,12 @@ def main() -> None:
             time.sleep(10)
         except KeyboardInterrupt:
             logging.info("Shutting down by user request.")
+            _shutdown_event.set()
+            stop_llm_worker()  # Review what's still queued before saving seen IDs
+            compact_benign_analyzed()
+            flush_discord_queue()
             detox_filter.save_stats()  # Persist final stats
+            seen_ids.save()
             logging.info(f"Final stats - {detox_filter.get_stats()} | {analyzer.get_stats()}")
             # Print final accuracy stats
             overall = get_accuracy_stats()
@@ -4641,6 +5964,7 @@ def main() -> None:
         except Exception as e:
             logging.error("Stream error: %s\n%s", e, traceback.format_exc())
             detox_filter.save_stats()  # Persist stats on error too
+            seen_ids.save()
             logging.info(f"Stats - {detox_filter.get_stats()} | {analyzer.get_stats()}")
             time.sleep(5)
             # Reconnect and continue